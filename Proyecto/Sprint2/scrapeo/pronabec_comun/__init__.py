@@ -0,0 +1,62 @@
+"""
+Utilidades compartidas por los scrapers de las Memorias Anuales de Pronabec (2020-2025)
+
+Los scripts de cada año agregan la carpeta `scrapeo/` al path e importan desde aquí:
+
+    import sys
+    from pathlib import Path
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from pronabec_comun import extraer_paginas
+"""
+
+from pronabec_comun.descarga import descargar_pdf
+from pronabec_comun.extraccion_pdf import (
+    extraer_paginas,
+    extraer_paginas_filtradas,
+    separar_texto_y_tablas,
+    total_paginas,
+)
+from pronabec_comun.indice_paginas import construir_indice, paginas_candidatas
+from pronabec_comun.lectores_texto import LECTORES, lector_texto_para, lectores_disponibles
+from pronabec_comun.palabras_clave import BuscadorPalabras, Coincidencia, normalizar
+from pronabec_comun.patrones import Hallazgo, RegistroPatrones
+from pronabec_comun.perfiles_tablas import (
+    PERFILES,
+    extraer_paginas_con_perfiles,
+    perfil_para,
+    registrar_perfil,
+)
+from pronabec_comun.salida_bloques import escribir_bloques
+from pronabec_comun.sintetico import (
+    Segmento,
+    generar_en_bloques,
+    generar_segmentos,
+    resumen_procedencia,
+)
+
+__all__ = [
+    'descargar_pdf',
+    'extraer_paginas',
+    'extraer_paginas_filtradas',
+    'extraer_paginas_con_perfiles',
+    'PERFILES',
+    'perfil_para',
+    'registrar_perfil',
+    'construir_indice',
+    'paginas_candidatas',
+    'LECTORES',
+    'lector_texto_para',
+    'lectores_disponibles',
+    'BuscadorPalabras',
+    'Coincidencia',
+    'normalizar',
+    'Hallazgo',
+    'RegistroPatrones',
+    'Segmento',
+    'generar_en_bloques',
+    'generar_segmentos',
+    'resumen_procedencia',
+    'escribir_bloques',
+    'separar_texto_y_tablas',
+    'total_paginas',
+]
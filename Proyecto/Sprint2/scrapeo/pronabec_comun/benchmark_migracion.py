@@ -0,0 +1,77 @@
+"""
+Benchmark del clasificador de migración del dashboard 2025
+
+Compara la clasificación fila por fila que usaba generar_campo_migracion (df.apply con
+axis=1, que pasa cada departamento a minúsculas y lo busca en una lista) con
+clasificar_migracion de extraer_datos_dashboard_2025.py (códigos de la tabla canónica
+de departamentos y np.select). Los departamentos se sortean de los del dataset
+consolidado, más algunas variantes de mayúsculas y vacíos, y se comprueba que ambos
+clasifiquen igual.
+
+Uso (desde la carpeta scrapeo/):
+    python -m pronabec_comun.benchmark_migracion
+    python -m pronabec_comun.benchmark_migracion --filas 100000 --filas 5000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from pronabec_comun.medicion import CARPETA_SCRAPEO, cargar_script
+
+CARPETA_2025 = CARPETA_SCRAPEO / 'scrapeo_2025'
+SEMILLA = 2025
+
+
+def clasificar_migracion_por_filas(row):
+    """Clasificación original, fila por fila (referencia)"""
+    dept = str(row['Departamento']).lower()
+    if dept in ['nacional', 'no especificado', 'no especificada']:
+        return 'Nacional - Sin especificar'
+    if dept not in ['lima', 'arequipa', 'cusco', 'puno', 'ayacucho', 'lambayeque',
+                    'tacna', 'huacho', 'tarapoto', 'huancayo', 'trujillo', 'pasco',
+                    'huaraz', 'iquitos', 'chimbote', 'sullana', 'piura', 'cajamarca',
+                    'ucayali', 'tumbes', 'huancavelica', 'junín', 'loreto', 'madre de dios']:
+        return 'Internacional'
+    if dept != 'lima':
+        return 'Posible migración'
+    return 'Lima - Sin migración'
+
+
+def departamentos_de_prueba(filas: int) -> pd.DataFrame:
+    consolidado = pd.read_csv(CARPETA_2025 / 'dashboard_becas_2025_consolidado.csv',
+                              usecols=['Departamento'])
+    valores = list(consolidado['Departamento'].unique()) + ['LIMA', 'Cusco', 'NACIONAL', np.nan]
+    rng = np.random.default_rng(SEMILLA)
+    return pd.DataFrame({'Departamento': rng.choice(np.array(valores, dtype=object), filas)})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del clasificador de migración 2025")
+    parser.add_argument('--filas', type=int, action='append',
+                        help="Filas a clasificar (por defecto, 10.000 y 1.000.000)")
+    args = parser.parse_args()
+
+    extractor = cargar_script(CARPETA_2025 / 'extraer_datos_dashboard_2025.py')
+
+    print(f"{'filas':>12}{'por filas (s)':>16}{'vectorizado (s)':>18}{'aceleración':>14}")
+    for filas in args.filas or [10_000, 1_000_000]:
+        df = departamentos_de_prueba(filas)
+
+        inicio = time.perf_counter()
+        referencia = df.apply(clasificar_migracion_por_filas, axis=1)
+        seg_filas = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        vectorizado = extractor.clasificar_migracion(df['Departamento'])
+        seg_vector = time.perf_counter() - inicio
+
+        if not np.array_equal(referencia.to_numpy(dtype=object), vectorizado.astype(object)):
+            raise SystemExit(f"La clasificación vectorizada difiere de la original ({filas} filas)")
+        print(f"{filas:>12,}{seg_filas:>16.3f}{seg_vector:>18.3f}{seg_filas / seg_vector:>13.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark del reporte por beca del dashboard 2025
+
+Compara el reporte por beca como lo calculaba analizar_datos_dashboard.py (filtrar el
+DataFrame por cada beca y hacer varios value_counts sobre el corte) con el que sale del
+cubo de conteos (construir_cubo y conteos_por, un groupby del cubo por dimensión). Para
+ver cómo crece el tiempo con el número de becas, el consolidado se replica con nombres
+de beca nuevos (Beca 18 #2, ...) y se comprueba que ambos reportes coincidan.
+
+Uso (desde la carpeta scrapeo/):
+    python -m pronabec_comun.benchmark_reportes
+    python -m pronabec_comun.benchmark_reportes --copias 1 --copias 50
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+from pronabec_comun.medicion import CARPETA_SCRAPEO
+
+CARPETA_2025 = CARPETA_SCRAPEO / 'scrapeo_2025'
+
+DIMENSIONES = ['Institucion', 'Departamento', 'Modalidad', 'Estrato_socioeconomico', 'Migracion']
+
+
+def reporte_por_filtros(df):
+    """Reporte original: un filtro y un value_counts por beca y dimensión (referencia)"""
+    reportes = {}
+    for beca in sorted(df['NombreBeca'].unique()):
+        df_beca = df[df['NombreBeca'] == beca]
+        reportes[beca] = [len(df_beca)] + [df_beca[d].value_counts().to_dict() for d in DIMENSIONES]
+    return reportes
+
+
+def reporte_por_cubo(analisis, df):
+    """Mismo reporte a partir del cubo de conteos"""
+    cubo = analisis.construir_cubo(df)
+    distribuciones = [analisis.conteos_por(cubo, 'NombreBeca', d) for d in DIMENSIONES]
+    return {beca: [n] + [distribucion.get(beca, {}) for distribucion in distribuciones]
+            for beca, n in sorted(analisis.totales_por(cubo, 'NombreBeca').items())}
+
+
+def replicar(df, copias: int) -> pd.DataFrame:
+    partes = [df] + [df.assign(NombreBeca=df['NombreBeca'] + f' #{i}') for i in range(2, copias + 1)]
+    return pd.concat(partes, ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del reporte por beca 2025")
+    parser.add_argument('--copias', type=int, action='append',
+                        help="Veces que se replica el consolidado (por defecto, 1, 10 y 100)")
+    args = parser.parse_args()
+
+    # analizar_datos_dashboard importa extraer_datos_dashboard_2025 y lee con rutas relativas
+    sys.path.insert(0, str(CARPETA_2025))
+    os.chdir(CARPETA_2025)
+    import analizar_datos_dashboard as analisis
+
+    consolidado = analisis.cargar_consolidado(analisis.COLUMNAS_ANALISIS)
+
+    print(f"{'becas':>8}{'filas':>12}{'por filtros (s)':>18}{'por cubo (s)':>15}{'aceleración':>14}")
+    for copias in args.copias or [1, 10, 100]:
+        df = replicar(consolidado, copias)
+
+        inicio = time.perf_counter()
+        referencia = reporte_por_filtros(df)
+        seg_filtros = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        cubo = reporte_por_cubo(analisis, df)
+        seg_cubo = time.perf_counter() - inicio
+
+        if referencia != cubo:
+            raise SystemExit(f"El reporte del cubo difiere del original ({copias} copias)")
+        print(f"{len(cubo):>8,}{len(df):>12,}{seg_filtros:>18.3f}{seg_cubo:>15.3f}"
+              f"{seg_filtros / seg_cubo:>13.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark de los generadores sintéticos por escala
+
+Genera el dataset de cada año a varias escalas de sus totales reales de becarios (la
+misma --escala de cada generador) y mide filas/segundo y el pico de memoria (RSS) del
+proceso. Cada medición corre en un proceso nuevo, para que el pico de una no se arrastre
+a la siguiente; "base" es la memoria ya ocupada antes de generar (intérprete, pandas,
+datos del año). Con --filas-por-bloque se mide la generación por bloques, que no tiene
+el dataset completo en memoria. No se escribe ningún archivo.
+
+Uso (desde la carpeta scrapeo/):
+    python -m pronabec_comun.benchmark_sintetico
+    python -m pronabec_comun.benchmark_sintetico --anio 2024 --escala 10 --escala 100
+    python -m pronabec_comun.benchmark_sintetico --filas-por-bloque 100000
+"""
+
+import argparse
+import contextlib
+import io
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
+
+from pronabec_comun.medicion import CARPETA_SCRAPEO, cargar_script, pico_memoria_mb
+from pronabec_comun.sintetico import generar_en_bloques, generar_segmentos, tipo_escala
+
+# Script de cada año y nombre de su lista de columnas
+GENERADORES = {
+    2020: (CARPETA_SCRAPEO / 'scrapeo_2020' / 'generate_usuario_excel_2020.py', 'COLUMNAS'),
+    2021: (CARPETA_SCRAPEO / 'scrapeo_2021' / 'generar_dataset_formato_final.py', 'COLUMNAS_FINALES'),
+    2022: (CARPETA_SCRAPEO / 'scrapeo_2022' / 'adaptar_formato_dashboard.py', 'columnas_dashboard'),
+    2023: (CARPETA_SCRAPEO / 'scrapeo_2023' / 'generar_excel_becarios.py', 'columnas'),
+    2024: (CARPETA_SCRAPEO / 'scrapeo_2024' / 'PRONABEC_2024' / 'generar_dataset_completo.py',
+           'COLUMNAS_DATASET'),
+}
+
+ESCALAS = (0.001, 0.01, 0.1, 1, 10, 100)
+
+
+def medir(anio: int, escala: float, filas_por_bloque: Optional[int] = None) -> Dict:
+    """Genera el dataset de un año a una escala; se ejecuta en un proceso propio"""
+    ruta, nombre_columnas = GENERADORES[anio]
+    # Los generadores leen sus datos base con rutas relativas a su carpeta
+    os.chdir(ruta.parent)
+    with contextlib.redirect_stdout(io.StringIO()):
+        modulo = cargar_script(ruta)
+        if hasattr(modulo, 'cargar_datos_base'):
+            segmentos = modulo.crear_segmentos(modulo.cargar_datos_base(), escala)
+        else:
+            segmentos = modulo.crear_segmentos(escala)
+    columnas = getattr(modulo, nombre_columnas)
+
+    base_mb = pico_memoria_mb()
+    inicio = time.perf_counter()
+    if filas_por_bloque:
+        filas = sum(len(bloque) for bloque in generar_en_bloques(
+            segmentos, modulo.SEMILLA, filas_por_bloque, columnas=columnas))
+    else:
+        filas = len(generar_segmentos(segmentos, modulo.SEMILLA, columnas=columnas))
+    segundos = time.perf_counter() - inicio
+    return {
+        'filas': filas,
+        'segundos': segundos,
+        'base_mb': base_mb,
+        'pico_mb': pico_memoria_mb(),
+    }
+
+
+def medir_en_proceso_nuevo(anio: int, escala: float, filas_por_bloque: Optional[int]) -> Dict:
+    # spawn: el proceso hijo no hereda la memoria (ni el pico) del padre
+    contexto = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=contexto) as ejecutor:
+        return ejecutor.submit(medir, anio, escala, filas_por_bloque).result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de los generadores sintéticos por escala")
+    parser.add_argument('--anio', type=int, action='append', choices=sorted(GENERADORES),
+                        help="Año a medir (por defecto, todos)")
+    parser.add_argument('--escala', type=tipo_escala, action='append',
+                        help=f"Escala a medir (por defecto, {', '.join(f'{e:g}' for e in ESCALAS)})")
+    parser.add_argument('--filas-por-bloque', type=int, default=None,
+                        help="Mide la generación por bloques de este tamaño")
+    args = parser.parse_args()
+
+    anios = args.anio or sorted(GENERADORES)
+    escalas = args.escala or ESCALAS
+    modo = f"por bloques de {args.filas_por_bloque:,}" if args.filas_por_bloque else "en memoria"
+    print(f"Generación {modo}")
+
+    for anio in anios:
+        print(f"\n{anio}: {GENERADORES[anio][0].name}")
+        print(f"{'Escala':>8}{'filas':>12}{'seg':>9}{'filas/s':>12}{'base MB':>10}{'pico MB':>10}")
+        for escala in escalas:
+            r = medir_en_proceso_nuevo(anio, escala, args.filas_por_bloque)
+            filas_por_seg = r['filas'] / r['segundos'] if r['segundos'] else 0.0
+            print(f"{escala:>8g}{r['filas']:>12,}{r['segundos']:>9.2f}{filas_por_seg:>12,.0f}"
+                  f"{r['base_mb']:>10.0f}{r['pico_mb']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
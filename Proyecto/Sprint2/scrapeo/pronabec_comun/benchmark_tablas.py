@@ -0,0 +1,128 @@
+"""
+Benchmark de perfiles de extracción de tablas
+
+Para cada perfil de perfiles_tablas.PERFILES extrae las tablas de las páginas indicadas
+(sin caché y en un solo proceso), mide el tiempo por página y compara las celdas con un
+CSV de referencia ya publicado. Al final recomienda el perfil más rápido que reproduce
+la referencia al 100%.
+
+Uso (desde la carpeta scrapeo/):
+    python -m pronabec_comun.benchmark_tablas --pdf .espejo_pdf/"Memoria Anual del Pronabec 2022.pdf" \
+        --pagina 30 --referencia scrapeo_2022/datos_extraidos/becarios_por_departamento_2022.csv
+
+Si el CSV agrega columnas que no están en la tabla del PDF (p. ej. NombreBeca), --columnas
+indica cuáles comparar, en el orden de la tabla:
+    python -m pronabec_comun.benchmark_tablas --pdf "scrapeo_2020/Memoria Anual del Pronabec 2020.pdf.pdf" \
+        --pagina 104 --referencia scrapeo_2020/beca18_por_departamento_2020.csv \
+        --columnas Departamento,BecariosNuevos,BecariosContinuadores,TotalBecarios
+"""
+
+import argparse
+import csv
+import re
+import time
+from typing import Dict, List, Optional
+
+from pronabec_comun.extraccion_pdf import extraer_paginas
+from pronabec_comun.palabras_clave import normalizar
+from pronabec_comun.perfiles_tablas import PERFILES
+
+# Columnas que los scripts agregan después de extraer (no vienen del PDF)
+COLUMNAS_AGREGADAS = ['Pagina', 'Anio', 'pagina_origen']
+
+
+def _celda(valor) -> str:
+    """Normaliza una celda para comparar: sin tildes, mayúsculas ni espacios repetidos"""
+    return re.sub(r'\s+', ' ', normalizar(str(valor or ''))).strip()
+
+
+def cargar_referencia(ruta: str, nombres: Optional[List[str]] = None) -> List[List[str]]:
+    """
+    Filas de datos del CSV de referencia: las columnas `nombres`, en ese orden, o todas
+    menos las agregadas por los scripts
+    """
+    with open(ruta, 'r', encoding='utf-8-sig', newline='') as f:
+        filas = list(csv.reader(f))
+    encabezado, datos = filas[0], filas[1:]
+    if nombres:
+        columnas = [encabezado.index(nombre) for nombre in nombres]
+    else:
+        columnas = [i for i, nombre in enumerate(encabezado) if nombre not in COLUMNAS_AGREGADAS]
+    return [[_celda(fila[i]) for i in columnas] for fila in datos]
+
+
+def precision_celdas(tablas: List[List[List[str]]], referencia: List[List[str]]) -> float:
+    """
+    Porcentaje de celdas de la referencia que aparecen igual en alguna tabla extraída
+
+    Las filas se alinean por la primera celda (p. ej. el departamento), así que las
+    filas de encabezado repetidas o en otro orden no afectan la medida.
+    """
+    filas_extraidas: Dict[str, List[str]] = {}
+    for tabla in tablas:
+        for fila in tabla:
+            celdas = [_celda(c) for c in fila]
+            if celdas and celdas[0]:
+                filas_extraidas.setdefault(celdas[0], celdas)
+
+    total = coincidencias = 0
+    for fila in referencia:
+        extraida = filas_extraidas.get(fila[0], [])
+        for i, valor in enumerate(fila):
+            total += 1
+            if i < len(extraida) and extraida[i] == valor:
+                coincidencias += 1
+    return coincidencias / total if total else 0.0
+
+
+def medir_perfil(pdf: str, paginas: List[int], ajustes: Dict, referencia) -> Dict:
+    inicio = time.perf_counter()
+    registros = extraer_paginas(pdf, texto=False, seleccion=paginas, ajustes_tablas=ajustes,
+                                procesos=1, usar_cache=False)
+    segundos = time.perf_counter() - inicio
+    tablas = [tabla for registro in registros for tabla in registro['tables']]
+    return {
+        'seg_por_pagina': segundos / max(1, len(registros)),
+        'tablas': len(tablas),
+        'precision': precision_celdas(tablas, referencia) if referencia else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de perfiles de extracción de tablas")
+    parser.add_argument('--pdf', required=True, help="Ruta al PDF de la Memoria")
+    parser.add_argument('--pagina', type=int, action='append', required=True,
+                        help="Página a medir (se puede repetir)")
+    parser.add_argument('--referencia', help="CSV publicado con el que comparar las celdas")
+    parser.add_argument('--columnas',
+                        help="Columnas del CSV que vienen de la tabla, separadas por comas y en "
+                             "su orden (por defecto, todas menos las agregadas por los scripts)")
+    parser.add_argument('--perfil', action='append', help="Perfiles a medir (por defecto todos)")
+    args = parser.parse_args()
+
+    columnas = args.columnas.split(',') if args.columnas else None
+    referencia = cargar_referencia(args.referencia, columnas) if args.referencia else None
+    nombres = args.perfil or list(PERFILES)
+
+    # Pasada sin medir: la primera apertura del PDF (y de pdfminer) no se le cobra al primer perfil
+    extraer_paginas(args.pdf, texto=False, seleccion=args.pagina, procesos=1, usar_cache=False)
+
+    print(f"{'Perfil':<20}{'seg/página':>12}{'tablas':>8}{'precisión':>12}")
+    resultados = {}
+    for nombre in nombres:
+        resultado = medir_perfil(args.pdf, args.pagina, PERFILES[nombre], referencia)
+        resultados[nombre] = resultado
+        precision = '-' if resultado['precision'] is None else f"{resultado['precision']:.1%}"
+        print(f"{nombre:<20}{resultado['seg_por_pagina']:>12.3f}{resultado['tablas']:>8}{precision:>12}")
+
+    if referencia:
+        exactos = [n for n, r in resultados.items() if r['precision'] == 1.0]
+        if exactos:
+            mejor = min(exactos, key=lambda n: resultados[n]['seg_por_pagina'])
+            print(f"\nPerfil recomendado: {mejor} (más rápido que reproduce la referencia)")
+        else:
+            print("\nNingún perfil reproduce la referencia al 100%")
+
+
+if __name__ == "__main__":
+    main()
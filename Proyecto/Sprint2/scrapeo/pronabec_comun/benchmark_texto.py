@@ -0,0 +1,109 @@
+"""
+Benchmark de lectores para la etapa de solo texto
+
+Extrae el texto de las Memorias con cada lector instalado (sin caché y en un solo
+proceso), mide el tiempo por página y compara el texto con el del lector original de
+ese año (lectores_texto.LECTOR_ORIGINAL_POR_ANIO: PyPDF2 en 2023, pdfplumber en el
+resto), que es con el que se escribieron sus extractores de palabras clave/regex. Un
+lector es equivalente si, por página, sus palabras (sin tildes ni mayúsculas) coinciden
+en orden con las del original en al menos UMBRAL_EQUIVALENCIA. Al final recomienda,
+por año, el lector más rápido equivalente para LECTOR_TEXTO_POR_ANIO en lectores_texto.py.
+
+Uso (desde la carpeta scrapeo/):
+    python -m pronabec_comun.benchmark_texto                  # PDFs versionados (2020 y 2021)
+    python -m pronabec_comun.benchmark_texto --pdf 2023=.espejo_pdf/memoria-2023.pdf
+"""
+
+import argparse
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Dict, List
+
+from pronabec_comun.extraccion_pdf import extraer_paginas
+from pronabec_comun.lectores_texto import lector_original, lectores_disponibles
+from pronabec_comun.palabras_clave import normalizar
+
+# Memorias que están en el repositorio
+CARPETA_SCRAPEO = Path(__file__).resolve().parent.parent
+PDFS_MEMORIA = {
+    2020: CARPETA_SCRAPEO / 'scrapeo_2020' / 'Memoria Anual del Pronabec 2020.pdf.pdf',
+    2021: CARPETA_SCRAPEO / 'scrapeo_2021' / 'Memoria_Pronabec_2021.pdf',
+}
+
+# Proporción mínima de palabras coincidentes por página con el lector original
+UMBRAL_EQUIVALENCIA = 0.98
+
+
+def similitud_texto(referencia: str, texto: str) -> float:
+    """Proporción de palabras (normalizadas) que coinciden en orden entre dos textos"""
+    a = normalizar(referencia).split()
+    b = normalizar(texto).split()
+    if not a and not b:
+        return 1.0
+    return SequenceMatcher(None, a, b, autojunk=False).ratio()
+
+
+def medir_lector(pdf: Path, lector: str) -> Dict:
+    inicio = time.perf_counter()
+    registros = extraer_paginas(pdf, tablas=False, lector=lector, procesos=1, usar_cache=False)
+    segundos = time.perf_counter() - inicio
+    return {
+        'seg_por_pagina': segundos / max(1, len(registros)),
+        'textos': [r['text'] for r in registros],
+    }
+
+
+def comparar_lectores(pdf: Path, lectores: List[str], referencia: str) -> Dict[str, Dict]:
+    """
+    Tiempo por página de cada lector, su similitud mínima por página contra el lector
+    `referencia` y cuántas páginas quedan bajo el umbral
+    """
+    resultados = {nombre: medir_lector(pdf, nombre) for nombre in lectores}
+    referencia = resultados[referencia]['textos']
+    for resultado in resultados.values():
+        textos = resultado.pop('textos')
+        if len(textos) != len(referencia):
+            resultado['similitud'] = 0.0
+            resultado['paginas_distintas'] = len(referencia)
+            continue
+        similitudes = [similitud_texto(r, t) for r, t in zip(referencia, textos)]
+        resultado['similitud'] = min(similitudes, default=1.0)
+        resultado['paginas_distintas'] = sum(s < UMBRAL_EQUIVALENCIA for s in similitudes)
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de lectores de texto de PDF")
+    parser.add_argument('--pdf', action='append', metavar='ANIO=RUTA',
+                        help="Memoria a medir (por defecto, las versionadas en el repositorio)")
+    args = parser.parse_args()
+
+    pdfs = PDFS_MEMORIA
+    if args.pdf:
+        pdfs = {int(anio): Path(ruta) for anio, ruta in (p.split('=', 1) for p in args.pdf)}
+
+    lectores = lectores_disponibles()
+    print(f"Lectores instalados: {', '.join(lectores)}")
+
+    recomendados = {}
+    for anio, pdf in sorted(pdfs.items()):
+        referencia = lector_original(anio)
+        if referencia not in lectores:
+            raise SystemExit(f"Se necesita {referencia} como referencia de {anio}")
+        print(f"\n{anio}: {pdf.name} (referencia: {referencia})")
+        print(f"{'Lector':<14}{'seg/página':>12}{'similitud':>12}{'pág. distintas':>16}")
+        resultados = comparar_lectores(pdf, lectores, referencia)
+        for nombre, r in resultados.items():
+            print(f"{nombre:<14}{r['seg_por_pagina']:>12.4f}{r['similitud']:>12.1%}"
+                  f"{r['paginas_distintas']:>16}")
+        equivalentes = [n for n, r in resultados.items() if r['similitud'] >= UMBRAL_EQUIVALENCIA]
+        recomendados[anio] = min(equivalentes, key=lambda n: resultados[n]['seg_por_pagina'])
+
+    print("\nLECTOR_TEXTO_POR_ANIO recomendado:")
+    for anio, nombre in recomendados.items():
+        print(f"    {anio}: '{nombre}',")
+
+
+if __name__ == "__main__":
+    main()
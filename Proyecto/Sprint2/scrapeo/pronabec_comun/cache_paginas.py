@@ -0,0 +1,90 @@
+"""
+Caché en disco de los resultados de extracción por página
+
+Cada página se guarda por contenido: la clave es el SHA-256 del PDF, el número de página
+y un hash de los ajustes del extractor. Los registros se serializan con pickle y zlib
+(un archivo binario pequeño por página), así que volver a ejecutar un scraper o cambiar
+un parser no vuelve a pasar por pdfplumber.
+
+Estructura:
+    .cache_paginas/<sha256 del PDF>/total_paginas
+    .cache_paginas/<sha256 del PDF>/<hash de ajustes>/<página>.bin
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import zlib
+from pathlib import Path
+from typing import Dict, Optional
+
+# Directorio por defecto: scrapeo/.cache_paginas (compartido por todos los años)
+DIRECTORIO_CACHE = Path(__file__).resolve().parent.parent / '.cache_paginas'
+
+# Tamaño de lectura para calcular el hash sin cargar el PDF completo
+TAM_BLOQUE_HASH = 1024 * 1024
+
+# Cambiar si cambia el formato de los registros para invalidar la caché existente
+VERSION_FORMATO = 1
+
+
+def huella_pdf(origen) -> str:
+    """Calcula el SHA-256 del PDF (ruta o bytes)"""
+    sha = hashlib.sha256()
+    if isinstance(origen, (bytes, bytearray, memoryview)):
+        sha.update(origen)
+        return sha.hexdigest()
+    with open(origen, 'rb') as f:
+        for bloque in iter(lambda: f.read(TAM_BLOQUE_HASH), b''):
+            sha.update(bloque)
+    return sha.hexdigest()
+
+
+def clave_ajustes(ajustes: Dict) -> str:
+    """Hash corto y estable de los ajustes del extractor"""
+    contenido = json.dumps({'version': VERSION_FORMATO, **ajustes}, sort_keys=True, default=str)
+    return hashlib.sha256(contenido.encode('utf-8')).hexdigest()[:16]
+
+
+def _escribir_atomico(ruta: Path, datos: bytes):
+    """Escribe en un temporal y lo renombra, para no dejar archivos a medias"""
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    temporal = ruta.with_name(f"{ruta.name}.{os.getpid()}.tmp")
+    with open(temporal, 'wb') as f:
+        f.write(datos)
+    os.replace(temporal, ruta)
+
+
+class CachePaginas:
+    """Caché de registros por página de un PDF concreto con unos ajustes concretos"""
+
+    def __init__(self, huella: str, ajustes: Dict, directorio: Optional[Path] = None):
+        self.directorio_pdf = Path(directorio or DIRECTORIO_CACHE) / huella
+        self.directorio_ajustes = self.directorio_pdf / clave_ajustes(ajustes)
+
+    def total_paginas(self) -> Optional[int]:
+        """Número de páginas del PDF si ya se registró"""
+        ruta = self.directorio_pdf / 'total_paginas'
+        try:
+            return int(ruta.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+
+    def guardar_total_paginas(self, total: int):
+        _escribir_atomico(self.directorio_pdf / 'total_paginas', str(total).encode('utf-8'))
+
+    def _ruta(self, numero: int) -> Path:
+        return self.directorio_ajustes / f"{numero:04d}.bin"
+
+    def leer(self, numero: int) -> Optional[Dict]:
+        """Devuelve el registro de la página o None si no está (o está dañado)"""
+        try:
+            with open(self._ruta(numero), 'rb') as f:
+                return pickle.loads(zlib.decompress(f.read()))
+        except (OSError, zlib.error, pickle.UnpicklingError, EOFError):
+            return None
+
+    def guardar(self, registro: Dict):
+        datos = zlib.compress(pickle.dumps(registro, protocol=pickle.HIGHEST_PROTOCOL))
+        _escribir_atomico(self._ruta(registro['page']), datos)
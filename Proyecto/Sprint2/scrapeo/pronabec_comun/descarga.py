@@ -0,0 +1,134 @@
+"""
+Descarga de PDFs a un espejo local, por bloques y con reanudación
+
+- Escribe la respuesta en disco por bloques (nunca tiene el PDF completo en memoria)
+- Si una descarga quedó a medias (archivo .part), la reanuda con una petición Range
+- Si el PDF ya está en el espejo, envía If-None-Match / If-Modified-Since y, si el
+  servidor responde 304, no vuelve a transferir nada
+- Sin conexión, devuelve la copia local si existe
+"""
+
+import json
+import os
+from email.utils import formatdate
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlparse, unquote
+
+import requests
+
+# Directorio por defecto del espejo: scrapeo/.espejo_pdf (compartido por todos los años)
+DIRECTORIO_ESPEJO = Path(__file__).resolve().parent.parent / '.espejo_pdf'
+
+TAM_BLOQUE = 1024 * 1024
+TIMEOUT = 30
+
+
+def _nombre_desde_url(url: str) -> str:
+    """Nombre de archivo a partir de la ruta de la URL (sin la query ?v=...)"""
+    nombre = unquote(os.path.basename(urlparse(url).path))
+    return nombre or 'documento.pdf'
+
+
+def _leer_metadatos(ruta: Path) -> dict:
+    try:
+        with open(ruta, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _guardar_metadatos(ruta: Path, respuesta: requests.Response, url: str):
+    metadatos = {
+        'url': url,
+        'etag': respuesta.headers.get('ETag'),
+        'last_modified': respuesta.headers.get('Last-Modified'),
+    }
+    with open(ruta, 'w', encoding='utf-8') as f:
+        json.dump(metadatos, f, ensure_ascii=False, indent=2)
+
+
+def descargar_pdf(url: str, destino=None, directorio=None,
+                  sesion: Optional[requests.Session] = None) -> Path:
+    """
+    Descarga el PDF al espejo local y devuelve su ruta
+
+    Args:
+        url: URL del PDF
+        destino: Ruta del archivo local (por defecto, <directorio>/<nombre en la URL>)
+        directorio: Directorio del espejo (por defecto scrapeo/.espejo_pdf)
+        sesion: Sesión de requests a reutilizar
+
+    Returns:
+        Ruta del PDF local actualizado
+    """
+    if destino is None:
+        destino = Path(directorio or DIRECTORIO_ESPEJO) / _nombre_desde_url(url)
+    destino = Path(destino)
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    parcial = destino.with_name(destino.name + '.part')
+    # Cada archivo tiene sus validadores (ETag / Last-Modified): los del .part describen
+    # la descarga en curso y solo pasan a ser los de `destino` cuando esta se completa
+    ruta_metadatos = destino.with_name(destino.name + '.meta.json')
+    ruta_metadatos_parcial = destino.with_name(destino.name + '.part.meta.json')
+    sesion = sesion or requests.Session()
+
+    cabeceras = {}
+    metadatos_parcial = _leer_metadatos(ruta_metadatos_parcial) if parcial.exists() else {}
+    validador = metadatos_parcial.get('etag') or metadatos_parcial.get('last_modified')
+    if parcial.exists() and not validador:
+        # Sin validador no se puede comprobar que el .part sea del mismo PDF
+        parcial.unlink()
+    if parcial.exists():
+        # Reanudar la descarga interrumpida desde el último byte escrito; si el PDF
+        # cambió desde entonces, If-Range hace que el servidor lo envíe completo (200)
+        cabeceras['Range'] = f"bytes={parcial.stat().st_size}-"
+        cabeceras['If-Range'] = validador
+    elif destino.exists():
+        # Petición condicional: solo se transfiere si el PDF cambió en el servidor
+        metadatos = _leer_metadatos(ruta_metadatos)
+        if metadatos.get('etag'):
+            cabeceras['If-None-Match'] = metadatos['etag']
+        cabeceras['If-Modified-Since'] = (
+            metadatos.get('last_modified')
+            or formatdate(destino.stat().st_mtime, usegmt=True)
+        )
+
+    print(f"Descargando PDF desde: {url}")
+    try:
+        respuesta = sesion.get(url, headers=cabeceras, stream=True, timeout=TIMEOUT)
+    except requests.RequestException as e:
+        if destino.exists():
+            print(f"Sin conexión ({e}); se usa la copia local: {destino}")
+            return destino
+        raise
+
+    with respuesta:
+        if respuesta.status_code == 304:
+            print(f"El PDF no cambió; se usa la copia local: {destino}")
+            return destino
+        if respuesta.status_code == 416 and parcial.exists():
+            # El .part ya tiene todos los bytes
+            _completar(parcial, destino, ruta_metadatos_parcial, ruta_metadatos)
+            return destino
+        respuesta.raise_for_status()
+
+        # 206: el servidor aceptó el Range; 200: se descarga desde el principio
+        if respuesta.status_code == 206:
+            modo = 'ab'
+        else:
+            modo = 'wb'
+            _guardar_metadatos(ruta_metadatos_parcial, respuesta, url)
+        with open(parcial, modo) as f:
+            for bloque in respuesta.iter_content(chunk_size=TAM_BLOQUE):
+                f.write(bloque)
+
+    _completar(parcial, destino, ruta_metadatos_parcial, ruta_metadatos)
+    print(f"PDF descargado exitosamente: {destino}")
+    return destino
+
+
+def _completar(parcial: Path, destino: Path, ruta_metadatos_parcial: Path, ruta_metadatos: Path):
+    """Reemplaza `destino` por el .part completo y, después, sus metadatos"""
+    os.replace(parcial, destino)
+    os.replace(ruta_metadatos_parcial, ruta_metadatos)
@@ -0,0 +1,328 @@
+"""
+Motor de extracción de PDFs en paralelo para las Memorias Anuales de Pronabec
+
+Divide el rango de páginas en bloques contiguos y los reparte entre un pool de procesos.
+Cada proceso abre el PDF una sola vez (en el inicializador del pool) y devuelve el texto
+y las tablas de sus páginas; el resultado final se entrega en orden de página.
+
+Cada página se analiza una sola vez: texto, tablas y, si se piden, palabras y caracteres
+salen del mismo registro, en lugar de reabrir el documento para cada tipo de dato.
+
+Los registros se guardan en la caché de pronabec_comun.cache_paginas; en una nueva
+ejecución solo se procesan las páginas que no estén en ella.
+
+El PDF se lee desde disco con mmap: los procesos comparten las páginas de solo lectura
+del archivo en lugar de recibir (y copiar) los bytes del documento.
+"""
+
+import mmap
+import os
+import tempfile
+from contextlib import contextmanager
+from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Optional
+
+from pronabec_comun.cache_paginas import CachePaginas, huella_pdf
+from pronabec_comun.indice_paginas import construir_indice, paginas_candidatas
+from pronabec_comun.lectores_texto import obtener_lector
+
+# Bloques por proceso: más de uno para que los procesos rápidos tomen trabajo de los lentos
+BLOQUES_POR_PROCESO = 4
+
+# Atributos de cada carácter que se conservan (el resto no es serializable o no se usa)
+ATRIBUTOS_CARACTER = ('text', 'x0', 'x1', 'top', 'bottom', 'fontname', 'size')
+
+# Estado de cada proceso del pool (se inicializa una vez por proceso)
+_pdf_proceso = None
+_mapa_proceso = None
+_lector_proceso = None
+
+
+def _abrir_pdf(ruta: str, lector: str):
+    """
+    Abre el PDF mapeado en memoria con el lector indicado (ver pronabec_comun.lectores_texto)
+
+    Returns:
+        (pdf, mapa): el documento y el mmap que hay que cerrar al terminar
+    """
+    with open(ruta, 'rb') as f:
+        mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return obtener_lector(lector).abrir(ruta, mapa), mapa
+
+
+def _cerrar_pdf(pdf, mapa, lector: str):
+    obtener_lector(lector).cerrar(pdf)
+    mapa.close()
+
+
+def _inicializar_proceso(ruta: str, lector: str):
+    """Abre el PDF una vez por proceso del pool"""
+    global _pdf_proceso, _mapa_proceso, _lector_proceso
+    _pdf_proceso, _mapa_proceso = _abrir_pdf(ruta, lector)
+    _lector_proceso = lector
+
+
+def _cerrar_proceso():
+    """Cierra el PDF abierto por _inicializar_proceso"""
+    global _pdf_proceso, _mapa_proceso
+    if _pdf_proceso is not None:
+        _cerrar_pdf(_pdf_proceso, _mapa_proceso, _lector_proceso)
+    _pdf_proceso = None
+    _mapa_proceso = None
+
+
+def _extraer_pagina(pdf, indice: int, lector: str, opciones: Dict) -> Dict:
+    """Extrae en una sola pasada los datos pedidos de una página (0-indexada)"""
+    backend = obtener_lector(lector)
+    page = backend.pagina(pdf, indice)
+    registro = {'page': indice + 1}
+    if opciones['texto']:
+        registro['text'] = backend.texto(page)
+    if backend.con_layout:
+        # pdfplumber cachea los objetos de la página: tablas, palabras y caracteres
+        # reutilizan el mismo análisis que el texto
+        if opciones['tablas']:
+            registro['tables'] = page.extract_tables(opciones['ajustes_tablas']) or []
+        if opciones['palabras']:
+            registro['words'] = page.extract_words()
+        if opciones['caracteres']:
+            registro['chars'] = [
+                {k: c[k] for k in ATRIBUTOS_CARACTER} for c in page.chars
+            ]
+    backend.cerrar_pagina(page)
+    return registro
+
+
+def _extraer_bloque(indices: List[int], opciones: Dict) -> List[Dict]:
+    """Extrae las páginas indicadas (0-indexadas) con el PDF abierto en este proceso"""
+    return [
+        _extraer_pagina(_pdf_proceso, i, _lector_proceso, opciones)
+        for i in indices
+    ]
+
+
+def _contar_paginas(ruta: str, lector: str) -> int:
+    """Cuenta las páginas sin procesar su contenido"""
+    pdf, mapa = _abrir_pdf(ruta, lector)
+    try:
+        return obtener_lector(lector).num_paginas(pdf)
+    finally:
+        _cerrar_pdf(pdf, mapa, lector)
+
+
+def _dividir_lista(indices: List[int], partes: int) -> List[List[int]]:
+    """Divide la lista de páginas en como máximo `partes` bloques consecutivos"""
+    partes = max(1, min(partes, len(indices)))
+    tam, resto = divmod(len(indices), partes)
+    bloques = []
+    actual = 0
+    for k in range(partes):
+        siguiente = actual + tam + (1 if k < resto else 0)
+        bloques.append(indices[actual:siguiente])
+        actual = siguiente
+    return bloques
+
+
+def _extraer_indices(ruta: str, indices: List[int], lector: str, opciones: Dict,
+                     procesos: Optional[int]) -> List[Dict]:
+    """Extrae las páginas indicadas, en paralelo si hay más de un proceso"""
+    procesos = min(procesos or os.cpu_count() or 1, len(indices))
+    print(f"Extrayendo {len(indices)} páginas con {procesos} proceso(s)...")
+
+    if procesos == 1:
+        _inicializar_proceso(ruta, lector)
+        try:
+            return _extraer_bloque(indices, opciones)
+        finally:
+            _cerrar_proceso()
+
+    bloques = _dividir_lista(indices, procesos * BLOQUES_POR_PROCESO)
+    with ProcessPoolExecutor(max_workers=procesos,
+                             initializer=_inicializar_proceso,
+                             initargs=(ruta, lector)) as pool:
+        resultados = pool.map(_extraer_bloque, bloques, [opciones] * len(bloques))
+        return [registro for bloque in resultados for registro in bloque]
+
+
+def extraer_paginas(pdf_origen, texto: bool = True, tablas: bool = True,
+                    palabras: bool = False, caracteres: bool = False,
+                    ajustes_tablas: Optional[Dict] = None,
+                    lector: str = 'pdfplumber', procesos: Optional[int] = None,
+                    paginas: Optional[tuple] = None, seleccion: Optional[List[int]] = None,
+                    usar_cache: bool = True, directorio_cache=None) -> List[Dict]:
+    """
+    Extrae texto y tablas de un PDF repartiendo las páginas entre varios procesos
+
+    Args:
+        pdf_origen: Ruta al PDF (recomendado: se mapea en memoria sin copiarlo);
+            también acepta bytes o BytesIO, que se vuelcan una vez a un temporal
+        texto: Si se extrae el texto de cada página
+        tablas: Si se extraen las tablas (solo con lector 'pdfplumber')
+        palabras: Si se incluyen las palabras con sus coordenadas (solo 'pdfplumber')
+        caracteres: Si se incluyen los caracteres con sus coordenadas (solo 'pdfplumber')
+        ajustes_tablas: table_settings de pdfplumber (ver pronabec_comun.perfiles_tablas)
+        lector: 'pdfplumber' (texto y layout) o un lector solo de texto de
+            pronabec_comun.lectores_texto ('pypdf2', 'pypdf', 'pypdfium2', 'pymupdf')
+        procesos: Número de procesos (por defecto, todos los núcleos)
+        paginas: Rango (primera, última) 1-indexado e inclusivo; por defecto todo el PDF
+        seleccion: Números de página concretos (1-indexados); tiene prioridad sobre `paginas`
+        usar_cache: Si se leen y guardan los registros en la caché por página
+        directorio_cache: Directorio de la caché (por defecto scrapeo/.cache_paginas)
+
+    Returns:
+        Lista de registros {'page', 'text', 'tables', 'words', 'chars'} en orden de página
+    """
+    opciones = {
+        'texto': texto,
+        'tablas': tablas,
+        'palabras': palabras,
+        'caracteres': caracteres,
+        'ajustes_tablas': ajustes_tablas,
+    }
+    if isinstance(pdf_origen, (bytes, bytearray, BytesIO)):
+        return _extraer_desde_memoria(pdf_origen, opciones, lector, procesos, paginas,
+                                      seleccion, usar_cache, directorio_cache)
+    ruta = os.fspath(pdf_origen)
+
+    cache = None
+    if usar_cache:
+        cache = CachePaginas(huella_pdf(ruta), {'lector': lector, **opciones},
+                             directorio_cache)
+    total = _total_paginas(ruta, lector, cache)
+
+    if seleccion is not None:
+        indices = sorted({n - 1 for n in seleccion if 1 <= n <= total})
+    else:
+        inicio, fin = 0, total
+        if paginas:
+            inicio, fin = max(0, paginas[0] - 1), min(total, paginas[1])
+        indices = list(range(inicio, fin))
+    if not indices:
+        return []
+
+    registros = {}
+    pendientes = []
+    for i in indices:
+        registro = cache.leer(i + 1) if cache else None
+        if registro is None:
+            pendientes.append(i)
+        else:
+            registros[i + 1] = registro
+
+    if cache and registros:
+        print(f"{len(registros)} páginas recuperadas de la caché")
+    if pendientes:
+        for registro in _extraer_indices(ruta, pendientes, lector, opciones, procesos):
+            registros[registro['page']] = registro
+            if cache:
+                cache.guardar(registro)
+
+    return [registros[i + 1] for i in indices]
+
+
+def _total_paginas(ruta: str, lector: str, cache: Optional[CachePaginas]) -> int:
+    """Número de páginas, desde la caché si ya se registró"""
+    total = cache.total_paginas() if cache else None
+    if total is None:
+        total = _contar_paginas(ruta, lector)
+        if cache:
+            cache.guardar_total_paginas(total)
+    return total
+
+
+def total_paginas(pdf_origen, usar_cache: bool = True, directorio_cache=None) -> int:
+    """Número de páginas del PDF (sin abrirlo si ya está en la caché)"""
+    ruta = os.fspath(pdf_origen)
+    cache = CachePaginas(huella_pdf(ruta), {}, directorio_cache) if usar_cache else None
+    return _total_paginas(ruta, 'pdfplumber', cache)
+
+
+@contextmanager
+def ruta_en_disco(pdf_origen):
+    """
+    Ruta del PDF en disco: la misma si `pdf_origen` es una ruta; si son bytes o
+    BytesIO, un temporal que se borra al salir del bloque
+    """
+    if not isinstance(pdf_origen, (bytes, bytearray, BytesIO)):
+        yield os.fspath(pdf_origen)
+        return
+    datos = pdf_origen.getbuffer() if isinstance(pdf_origen, BytesIO) else pdf_origen
+    descriptor, ruta = tempfile.mkstemp(suffix='.pdf')
+    try:
+        with os.fdopen(descriptor, 'wb') as f:
+            f.write(datos)
+        del datos
+        yield ruta
+    finally:
+        os.remove(ruta)
+
+
+def _extraer_desde_memoria(datos, opciones: Dict, lector: str, procesos, paginas, seleccion,
+                           usar_cache: bool, directorio_cache) -> List[Dict]:
+    """Vuelca un PDF en memoria a un temporal para poder mapearlo en los procesos"""
+    with ruta_en_disco(datos) as ruta:
+        return extraer_paginas(ruta, lector=lector, procesos=procesos, paginas=paginas,
+                               seleccion=seleccion, usar_cache=usar_cache, directorio_cache=directorio_cache,
+                               **opciones)
+
+
+def extraer_paginas_filtradas(pdf_origen, palabras_clave: Optional[List[str]] = None,
+                              paginas_fijas: Optional[List[int]] = None,
+                              lector: str = 'pdfplumber', procesos: Optional[int] = None,
+                              usar_cache: bool = True, directorio_cache=None,
+                              lector_texto: Optional[str] = None) -> List[Dict]:
+    """
+    Extrae el texto de todas las páginas y las tablas solo de las páginas candidatas
+
+    Primero recorre la capa de texto (barato) y construye un índice palabra -> páginas;
+    el buscador de tablas (lo más costoso de pdfplumber) solo corre sobre las páginas
+    que contienen alguna de `palabras_clave` o que están en `paginas_fijas`.
+    La pasada de texto puede usar un lector más rápido (`lector_texto`, ver
+    lectores_texto.lector_texto_para); las tablas siempre salen de `lector`.
+
+    Returns:
+        Registros {'page', 'text', 'tables'} de todas las páginas; las no candidatas
+        tienen 'tables' vacío
+    """
+    comunes = {
+        'procesos': procesos,
+        'usar_cache': usar_cache,
+        'directorio_cache': directorio_cache,
+    }
+    registros = extraer_paginas(pdf_origen, tablas=False, lector=lector_texto or lector, **comunes)
+
+    indice = construir_indice(registros, palabras_clave or [])
+    candidatas = paginas_candidatas(indice, paginas_fijas)
+    print(f"Tablas a extraer en {len(candidatas)} de {len(registros)} páginas")
+
+    tablas = {}
+    if candidatas:
+        for registro in extraer_paginas(pdf_origen, texto=False, seleccion=candidatas,
+                                        lector=lector, **comunes):
+            tablas[registro['page']] = registro['tables']
+    for registro in registros:
+        registro['tables'] = tablas.get(registro['page'], [])
+    return registros
+
+
+def separar_texto_y_tablas(paginas: List[Dict]) -> tuple:
+    """
+    Convierte los registros por página al formato que usan los parsers de cada año
+
+    Returns:
+        (text_pages, tables) con registros {'page', 'text'} (solo páginas con texto)
+        y {'page', 'table_number', 'data'}
+    """
+    text_pages = []
+    tables = []
+    for pagina in paginas:
+        if pagina.get('text'):
+            text_pages.append({'page': pagina['page'], 'text': pagina['text']})
+        for j, tabla in enumerate(pagina.get('tables', [])):
+            tables.append({
+                'page': pagina['page'],
+                'table_number': j + 1,
+                'data': tabla
+            })
+    return text_pages, tables
@@ -0,0 +1,47 @@
+"""
+Índice de páginas por palabra clave a partir de la capa de texto
+
+Sirve para decidir en qué páginas vale la pena correr el buscador de tablas.
+Cada año/parser define sus propias palabras clave o páginas fijas, por ejemplo:
+
+    # scrape_pronabec_2024_mejorado.py: solo interesan las páginas que mencionan 2024
+    PALABRAS_TABLAS = ['2024']
+
+    # parser_datos_becas.py (2020): las tablas están en páginas conocidas
+    PAGINAS_TABLAS = [64, 79, 104, 105, 106]
+"""
+
+from typing import Dict, List, Optional
+
+from pronabec_comun.palabras_clave import BuscadorPalabras
+
+
+def construir_indice(paginas: List[Dict], palabras_clave: List[str]) -> Dict[str, List[int]]:
+    """
+    Construye el índice palabra clave -> páginas donde aparece (sin distinguir
+    mayúsculas ni tildes)
+
+    Args:
+        paginas: Registros {'page', 'text'} del extractor
+        palabras_clave: Palabras o frases a indexar
+    """
+    indice = {palabra: [] for palabra in palabras_clave}
+    if not palabras_clave:
+        return indice
+    buscador = BuscadorPalabras(palabras_clave)
+    for pagina in paginas:
+        texto = pagina.get('text')
+        if not texto:
+            continue
+        for palabra in buscador.encontradas(texto):
+            indice[palabra].append(pagina['page'])
+    return indice
+
+
+def paginas_candidatas(indice: Dict[str, List[int]],
+                       paginas_fijas: Optional[List[int]] = None) -> List[int]:
+    """Páginas que contienen alguna palabra del índice, más las páginas fijas, ordenadas"""
+    candidatas = set(paginas_fijas or [])
+    for paginas in indice.values():
+        candidatas.update(paginas)
+    return sorted(candidatas)
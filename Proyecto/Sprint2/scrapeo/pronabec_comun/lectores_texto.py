@@ -0,0 +1,193 @@
+"""
+Lectores de PDF intercambiables para la capa de texto
+
+Cada lector sabe abrir el PDF (mapeado en memoria), tomar una página y devolver su texto.
+pdfplumber hace análisis de layout y además es el único que extrae tablas, palabras y
+caracteres; los demás solo leen la capa de texto y son mucho más baratos cuando los
+extractores de palabras clave/regex no necesitan nada más.
+
+    pdfplumber  -> requirements.txt (siempre disponible)
+    pypdf2      -> PyPDF2 (lo usaba el scraper de 2023)
+    pypdf       -> pypdf
+    pypdfium2   -> pypdfium2
+    pymupdf     -> PyMuPDF
+
+Los que no estén instalados simplemente no se ofrecen. El lector de texto de cada año se
+elige con benchmark_texto.py: el más rápido cuyo texto es equivalente al de pdfplumber.
+"""
+
+import importlib
+from typing import Dict, List
+
+
+class LectorTexto:
+    """
+    Interfaz de un lector: abrir, pagina, texto, cerrar_pagina y cerrar
+
+    `abrir` recibe la ruta y el mmap de solo lectura del PDF; cada lector usa lo que acepte.
+    """
+
+    nombre = ''
+    modulo = ''
+    # Si además de texto puede extraer tablas, palabras y caracteres
+    con_layout = False
+
+    def disponible(self) -> bool:
+        try:
+            importlib.import_module(self.modulo)
+        except ImportError:
+            return False
+        return True
+
+    def abrir(self, ruta: str, mapa):
+        raise NotImplementedError
+
+    def num_paginas(self, pdf) -> int:
+        return len(pdf.pages)
+
+    def pagina(self, pdf, indice: int):
+        return pdf.pages[indice]
+
+    def texto(self, pagina) -> str:
+        return pagina.extract_text() or ''
+
+    def cerrar_pagina(self, pagina):
+        pass
+
+    def cerrar(self, pdf):
+        pass
+
+
+class LectorPdfplumber(LectorTexto):
+    nombre = 'pdfplumber'
+    modulo = 'pdfplumber'
+    con_layout = True
+
+    def abrir(self, ruta: str, mapa):
+        import pdfplumber
+        return pdfplumber.open(mapa)
+
+    def cerrar_pagina(self, pagina):
+        # Libera el árbol de objetos de la página ya procesada
+        pagina.close()
+
+    def cerrar(self, pdf):
+        pdf.close()
+
+
+class LectorPyPDF2(LectorTexto):
+    nombre = 'pypdf2'
+    modulo = 'PyPDF2'
+
+    def abrir(self, ruta: str, mapa):
+        import PyPDF2
+        return PyPDF2.PdfReader(mapa)
+
+
+class LectorPypdf(LectorTexto):
+    nombre = 'pypdf'
+    modulo = 'pypdf'
+
+    def abrir(self, ruta: str, mapa):
+        import pypdf
+        return pypdf.PdfReader(mapa)
+
+
+class LectorPdfium(LectorTexto):
+    nombre = 'pypdfium2'
+    modulo = 'pypdfium2'
+
+    def abrir(self, ruta: str, mapa):
+        # pdfium lee el archivo por su cuenta (no acepta mmap)
+        import pypdfium2
+        return pypdfium2.PdfDocument(ruta)
+
+    def num_paginas(self, pdf) -> int:
+        return len(pdf)
+
+    def pagina(self, pdf, indice: int):
+        return pdf[indice]
+
+    def texto(self, pagina) -> str:
+        capa = pagina.get_textpage()
+        try:
+            return capa.get_text_range()
+        finally:
+            capa.close()
+
+    def cerrar_pagina(self, pagina):
+        pagina.close()
+
+    def cerrar(self, pdf):
+        pdf.close()
+
+
+class LectorPyMuPDF(LectorTexto):
+    nombre = 'pymupdf'
+    modulo = 'pymupdf'
+
+    def abrir(self, ruta: str, mapa):
+        # PyMuPDF mapea el archivo por su cuenta
+        import pymupdf
+        return pymupdf.open(ruta)
+
+    def num_paginas(self, pdf) -> int:
+        return pdf.page_count
+
+    def pagina(self, pdf, indice: int):
+        return pdf[indice]
+
+    def texto(self, pagina) -> str:
+        # sort=True ordena los bloques por posición (arriba-abajo, izquierda-derecha),
+        # como pdfplumber; sin él el texto sale en el orden del content stream
+        return pagina.get_text(sort=True)
+
+    def cerrar(self, pdf):
+        pdf.close()
+
+
+LECTORES: Dict[str, LectorTexto] = {
+    lector.nombre: lector
+    for lector in (LectorPdfplumber(), LectorPyPDF2(), LectorPypdf(),
+                   LectorPdfium(), LectorPyMuPDF())
+}
+
+# Lector con el que se escribieron los extractores de cada año (pdfplumber si no figura):
+# es la referencia de benchmark_texto.py para ese año
+LECTOR_ORIGINAL_POR_ANIO = {
+    2023: 'pypdf2',
+}
+
+# Lector de la etapa de solo texto de cada año. Un año solo deja su lector original
+# cuando benchmark_texto.py da a otro por equivalente a él en todas las páginas.
+# Si el lector no está instalado se usa pdfplumber.
+LECTOR_TEXTO_POR_ANIO = {
+    2020: 'pdfplumber',
+    2021: 'pdfplumber',
+    2022: 'pdfplumber',
+    2023: 'pypdf2',
+    2024: 'pdfplumber',
+}
+
+
+def obtener_lector(nombre: str) -> LectorTexto:
+    try:
+        return LECTORES[nombre]
+    except KeyError:
+        raise ValueError(f"Lector desconocido: {nombre} (opciones: {', '.join(LECTORES)})")
+
+
+def lectores_disponibles() -> List[str]:
+    """Nombres de los lectores cuyo paquete está instalado"""
+    return [nombre for nombre, lector in LECTORES.items() if lector.disponible()]
+
+
+def lector_original(anio: int) -> str:
+    """Lector con el que se escribieron los extractores de un año"""
+    return LECTOR_ORIGINAL_POR_ANIO.get(anio, 'pdfplumber')
+
+
+def lector_texto_para(anio: int) -> str:
+    """Lector para la etapa de solo texto de un año"""
+    nombre = LECTOR_TEXTO_POR_ANIO.get(anio, 'pdfplumber')
+    return nombre if obtener_lector(nombre).disponible() else 'pdfplumber'
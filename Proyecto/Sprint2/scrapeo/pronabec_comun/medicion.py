@@ -0,0 +1,61 @@
+"""
+Utilidades de los benchmarks: carga de los scripts de cada año y pico de memoria
+
+Los scripts de cada año no son paquetes, así que los benchmarks los importan por ruta con
+cargar_script. pico_memoria_mb funciona en Linux/macOS (resource) y en Windows (psutil si
+está instalado; si no, GetProcessMemoryInfo de la API de Windows).
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+CARPETA_SCRAPEO = Path(__file__).resolve().parent.parent
+
+
+def cargar_script(ruta: Path):
+    """Importa el script de un año como módulo (sin ejecutar su main)"""
+    spec = importlib.util.spec_from_file_location(f'script_{ruta.stem}', ruta)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+def _pico_windows_mb() -> float:
+    """PeakWorkingSetSize del proceso actual, vía psutil o la API de Windows"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().peak_wset / 2**20
+    except ImportError:
+        pass
+
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [('cb', wintypes.DWORD),
+                    ('PageFaultCount', wintypes.DWORD),
+                    ('PeakWorkingSetSize', ctypes.c_size_t),
+                    ('WorkingSetSize', ctypes.c_size_t),
+                    ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+                    ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                    ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+                    ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                    ('PagefileUsage', ctypes.c_size_t),
+                    ('PeakPagefileUsage', ctypes.c_size_t)]
+
+    contadores = PROCESS_MEMORY_COUNTERS()
+    contadores.cb = ctypes.sizeof(contadores)
+    proceso = ctypes.windll.kernel32.GetCurrentProcess()
+    ctypes.windll.psapi.GetProcessMemoryInfo(proceso, ctypes.byref(contadores), contadores.cb)
+    return contadores.PeakWorkingSetSize / 2**20
+
+
+def pico_memoria_mb() -> float:
+    """Pico de memoria residente (RSS) del proceso actual, en MB"""
+    if sys.platform == 'win32':
+        return _pico_windows_mb()
+    import resource
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss está en KB en Linux y en bytes en macOS
+    return pico / 2**20 if sys.platform == 'darwin' else pico / 1024
@@ -0,0 +1,109 @@
+"""
+Buscador de múltiples palabras clave en una sola pasada (autómata Aho-Corasick)
+
+Construye el autómata una vez con todas las palabras (agrupadas opcionalmente por
+categoría) y recorre cada página carácter a carácter una sola vez, sin importar cuántas
+palabras haya. La búsqueda no distingue mayúsculas ni tildes ('migración' = 'MIGRACION').
+Las siglas (palabras en mayúsculas, p. ej. 'IES') solo coinciden como palabra completa,
+para no encontrarlas dentro de otras palabras ('series', 'especies').
+
+Ejemplo:
+    buscador = BuscadorPalabras({'estrato': ['pobreza', 'estrato'], 'migracion': ['migración']})
+    for c in buscador.coincidencias(texto, pagina=15):
+        linea = texto.split('\\n')[c.linea]
+"""
+
+import unicodedata
+from collections import deque
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, Union
+
+
+def normalizar(texto: str) -> str:
+    """Minúsculas y sin tildes; conserva los saltos de línea"""
+    descompuesto = unicodedata.normalize('NFD', texto.lower())
+    return ''.join(c for c in descompuesto if not unicodedata.combining(c))
+
+
+class Coincidencia(NamedTuple):
+    palabra: str
+    categoria: Optional[str]
+    linea: int
+    pagina: Optional[int]
+
+
+class BuscadorPalabras:
+    """Autómata Aho-Corasick sobre palabras clave normalizadas"""
+
+    def __init__(self, palabras: Union[List[str], Dict[str, List[str]]]):
+        if isinstance(palabras, dict):
+            entradas = [(p, cat) for cat, lista in palabras.items() for p in lista]
+        else:
+            entradas = [(p, None) for p in palabras]
+
+        self.palabras = [p for p, _ in entradas]
+        self.categorias = [cat for _, cat in entradas]
+        self.siglas = [p.isupper() and len(p) > 1 for p in self.palabras]
+        self.longitudes = []
+
+        # Trie: transiciones por estado, enlace de fallo y palabras que terminan en él
+        self._transiciones: List[Dict[str, int]] = [{}]
+        self._fallo: List[int] = [0]
+        self._salidas: List[List[int]] = [[]]
+
+        for indice, palabra in enumerate(self.palabras):
+            clave = normalizar(palabra)
+            self.longitudes.append(len(clave))
+            estado = 0
+            for c in clave:
+                siguiente = self._transiciones[estado].get(c)
+                if siguiente is None:
+                    siguiente = len(self._transiciones)
+                    self._transiciones[estado][c] = siguiente
+                    self._transiciones.append({})
+                    self._fallo.append(0)
+                    self._salidas.append([])
+                estado = siguiente
+            self._salidas[estado].append(indice)
+
+        # Enlaces de fallo por niveles (BFS)
+        cola = deque(self._transiciones[0].values())
+        while cola:
+            estado = cola.popleft()
+            for c, siguiente in self._transiciones[estado].items():
+                cola.append(siguiente)
+                fallo = self._fallo[estado]
+                while fallo and c not in self._transiciones[fallo]:
+                    fallo = self._fallo[fallo]
+                destino = self._transiciones[fallo].get(c, 0)
+                self._fallo[siguiente] = destino if destino != siguiente else 0
+                self._salidas[siguiente].extend(self._salidas[self._fallo[siguiente]])
+
+    def _es_palabra_completa(self, texto: str, inicio: int, fin: int) -> bool:
+        antes = texto[inicio - 1] if inicio > 0 else ' '
+        despues = texto[fin] if fin < len(texto) else ' '
+        return not antes.isalnum() and not despues.isalnum()
+
+    def coincidencias(self, texto: str, pagina: Optional[int] = None) -> Iterator[Coincidencia]:
+        """Devuelve cada aparición de cada palabra clave con su número de línea (0-indexado)"""
+        texto_normalizado = normalizar(texto)
+        transiciones = self._transiciones
+        fallo = self._fallo
+        salidas = self._salidas
+        estado = 0
+        linea = 0
+        for posicion, c in enumerate(texto_normalizado):
+            if c == '\n':
+                linea += 1
+            while estado and c not in transiciones[estado]:
+                estado = fallo[estado]
+            estado = transiciones[estado].get(c, 0)
+            for indice in salidas[estado]:
+                if self.siglas[indice]:
+                    inicio = posicion + 1 - self.longitudes[indice]
+                    if not self._es_palabra_completa(texto_normalizado, inicio, posicion + 1):
+                        continue
+                yield Coincidencia(self.palabras[indice], self.categorias[indice], linea, pagina)
+
+    def encontradas(self, texto: str) -> Set[str]:
+        """Conjunto de palabras clave presentes en el texto"""
+        return {c.palabra for c in self.coincidencias(texto)}
@@ -0,0 +1,95 @@
+"""
+Registro de patrones por dimensión compilado en una sola expresión regular
+
+En lugar de correr una regex por departamento, estrato, tipo de beca, etc. sobre el mismo
+texto, todas las alternativas se unen en una sola alternancia con grupos con nombre.
+Cada página se recorre una vez y cada coincidencia se devuelve como un Hallazgo
+(dimensión, etiqueta, valor, página), por lo que el costo depende del largo del texto
+y no del número de patrones.
+
+Ejemplo:
+    registro = RegistroPatrones()
+    registro.agregar_etiquetas('departamento', ['Lima', 'Cusco'])
+    registro.agregar_patron('migracion', r'(?P<etiqueta>no\\s+migr[óo]|migr[óo])\\s+(?P<valor>\\d+)')
+    for hallazgo in registro.buscar(texto, pagina=12):
+        ...
+"""
+
+import re
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional
+
+# Sufijo por defecto de las etiquetas: "Lima: 120", "Pobre extremo 35"
+SUFIJO_VALOR = r'[:\s]+(?P<valor>\d+)'
+
+
+class Hallazgo(NamedTuple):
+    dimension: str
+    etiqueta: Optional[str]
+    valor: int
+    pagina: int
+    inicio: int
+
+
+class RegistroPatrones:
+    """Acumula patrones por dimensión y los compila en una sola alternancia"""
+
+    def __init__(self, flags: int = re.IGNORECASE):
+        self.flags = flags
+        self._alternativas: List[str] = []
+        self._dimensiones: List[str] = []
+        self._normalizadores: List[Optional[Dict[str, str]]] = []
+        self._con_etiqueta: List[bool] = []
+        self._compilado = None
+
+    def _agregar(self, dimension: str, patron: str, normalizador: Optional[Dict[str, str]]):
+        k = len(self._alternativas)
+        patron = patron.replace('(?P<etiqueta>', f'(?P<e{k}>').replace('(?P<valor>', f'(?P<v{k}>')
+        self._alternativas.append(f'(?P<a{k}>{patron})')
+        self._dimensiones.append(dimension)
+        self._normalizadores.append(normalizador)
+        self._con_etiqueta.append(f'(?P<e{k}>' in patron)
+        self._compilado = None
+
+    def agregar_etiquetas(self, dimension: str, etiquetas: List[str],
+                          sufijo: str = SUFIJO_VALOR,
+                          normalizar: Callable[[str], str] = str.title):
+        """
+        Agrega una lista de etiquetas literales seguidas de un número
+
+        La etiqueta del hallazgo es la forma normalizada de la etiqueta registrada
+        (por defecto en formato título), sin importar cómo aparezca en el texto.
+        """
+        # Las más largas primero, para que "pobre extremo" gane sobre "pobre"
+        ordenadas = sorted(etiquetas, key=len, reverse=True)
+        alternancia = '|'.join(re.escape(e) for e in ordenadas)
+        normalizador = {e.lower(): normalizar(e) for e in etiquetas}
+        self._agregar(dimension, f'(?P<etiqueta>{alternancia}){sufijo}', normalizador)
+
+    def agregar_patron(self, dimension: str, patron: str):
+        """
+        Agrega una regex libre con un grupo (?P<valor>...) y, opcionalmente, (?P<etiqueta>...)
+
+        No debe contener otros grupos con nombre.
+        """
+        self._agregar(dimension, patron, None)
+
+    def compilar(self) -> 're.Pattern':
+        if self._compilado is None:
+            self._compilado = re.compile('|'.join(self._alternativas), self.flags)
+        return self._compilado
+
+    def buscar(self, texto: str, pagina: int) -> Iterator[Hallazgo]:
+        """Recorre el texto una sola vez y devuelve los hallazgos en orden de aparición"""
+        for match in self.compilar().finditer(texto):
+            k = int(match.lastgroup[1:])
+            etiqueta = match.group(f'e{k}') if self._con_etiqueta[k] else None
+            normalizador = self._normalizadores[k]
+            if etiqueta is not None:
+                etiqueta = normalizador.get(etiqueta.lower(), etiqueta) if normalizador else etiqueta.strip()
+            yield Hallazgo(
+                dimension=self._dimensiones[k],
+                etiqueta=etiqueta,
+                valor=int(match.group(f'v{k}')),
+                pagina=pagina,
+                inicio=match.start(),
+            )
@@ -0,0 +1,113 @@
+"""
+Perfiles de extracción de tablas (table_settings de pdfplumber) por año y rango de páginas
+
+Cada perfil es un conjunto de ajustes con nombre:
+- lattice: usa las líneas dibujadas de la tabla (equivale a los valores por defecto)
+- lattice_rapido: como lattice pero ignora trazos cortos (menos aristas que unir)
+- stream: usa la alineación del texto, para tablas sin bordes
+- mixto: columnas por texto y filas por líneas
+- Perfiles con columnas explícitas (vertical_strategy 'explicit') para tablas difíciles
+
+Para elegir el perfil de una página se usa benchmark_tablas.py, que mide el tiempo por
+página y el porcentaje de celdas que coinciden con los CSV ya publicados, por ejemplo:
+
+    python -m pronabec_comun.benchmark_tablas --pdf <memoria 2022> --pagina 30 \
+        --referencia scrapeo_2022/datos_extraidos/becarios_por_departamento_2022.csv
+"""
+
+from typing import Dict, List
+
+from pronabec_comun.extraccion_pdf import extraer_paginas, ruta_en_disco, total_paginas
+
+PERFILES = {
+    'lattice': {
+        'vertical_strategy': 'lines',
+        'horizontal_strategy': 'lines',
+        'snap_tolerance': 3,
+        'join_tolerance': 3,
+        'intersection_tolerance': 3,
+    },
+    'lattice_rapido': {
+        'vertical_strategy': 'lines',
+        'horizontal_strategy': 'lines',
+        'snap_tolerance': 3,
+        'join_tolerance': 3,
+        'edge_min_length': 10,
+    },
+    'stream': {
+        'vertical_strategy': 'text',
+        'horizontal_strategy': 'text',
+        'snap_tolerance': 3,
+        'join_tolerance': 3,
+        'min_words_vertical': 3,
+        'min_words_horizontal': 1,
+        'text_x_tolerance': 3,
+        'text_y_tolerance': 3,
+    },
+    'mixto': {
+        'vertical_strategy': 'text',
+        'horizontal_strategy': 'lines',
+        'snap_tolerance': 3,
+        'join_tolerance': 3,
+        'min_words_vertical': 3,
+    },
+}
+
+# Perfil por defecto de cada año y perfiles específicos por rango de páginas (inclusivo).
+# Resultados de benchmark_tablas.py con las Memorias del repositorio:
+# - 2020: en las páginas con tablas (64, 79, 104-106) lattice y lattice_rapido dan las
+#   mismas tablas (en todo el documento) y el mismo tiempo; stream y mixto no reproducen
+#   los CSV publicados. Se queda lattice.
+# - 2021: lattice_rapido pierde 10 de las tablas de la página 22; se queda lattice.
+# 2022 y 2024 no están afinados (sus PDF no están en el repositorio): usan lattice, el
+# perfil con el que se generaron sus CSV, hasta medirlos con benchmark_tablas.py.
+PERFILES_POR_ANIO = {
+    2020: {'predeterminado': 'lattice', 'rangos': []},
+    2021: {'predeterminado': 'lattice', 'rangos': []},
+    2022: {'predeterminado': 'lattice', 'rangos': []},
+    2024: {'predeterminado': 'lattice', 'rangos': []},
+}
+
+
+def registrar_perfil(nombre: str, ajustes: Dict, columnas: List[float] = None):
+    """
+    Registra un perfil; si se indican `columnas` (coordenadas x de los bordes) las
+    columnas se toman de ahí en lugar de detectarlas
+    """
+    ajustes = dict(ajustes)
+    if columnas:
+        ajustes['vertical_strategy'] = 'explicit'
+        ajustes['explicit_vertical_lines'] = list(columnas)
+    PERFILES[nombre] = ajustes
+
+
+def perfil_para(anio: int, pagina: int) -> str:
+    """Nombre del perfil registrado para una página de la Memoria de un año"""
+    config = PERFILES_POR_ANIO.get(anio, {})
+    for (primera, ultima), nombre in config.get('rangos', []):
+        if primera <= pagina <= ultima:
+            return nombre
+    return config.get('predeterminado', 'lattice')
+
+
+def extraer_paginas_con_perfiles(pdf_origen, anio: int, usar_cache: bool = True,
+                                 directorio_cache=None, **kwargs) -> List[Dict]:
+    """
+    Como extraer_paginas, pero cada página usa el perfil de tablas registrado para su año
+
+    Las páginas se agrupan por perfil y cada grupo se extrae en una sola pasada
+    (texto y tablas juntos). Un PDF en memoria (bytes o BytesIO) se vuelca una sola
+    vez a disco para todos los grupos.
+    """
+    cache = {'usar_cache': usar_cache, 'directorio_cache': directorio_cache}
+    with ruta_en_disco(pdf_origen) as ruta:
+        grupos = {}
+        for numero in range(1, total_paginas(ruta, **cache) + 1):
+            grupos.setdefault(perfil_para(anio, numero), []).append(numero)
+
+        registros = []
+        for nombre, seleccion in grupos.items():
+            registros.extend(extraer_paginas(ruta, seleccion=seleccion,
+                                             ajustes_tablas=PERFILES[nombre], **cache, **kwargs))
+    registros.sort(key=lambda r: r['page'])
+    return registros
@@ -0,0 +1,78 @@
+"""
+Escritura incremental de datasets que llegan en bloques (p. ej. sintetico.generar_en_bloques)
+
+Cada bloque se escribe y se descarta antes de pedir el siguiente, así que la memoria
+depende del tamaño del bloque y no del total de filas.
+
+    csv      -> siempre disponible
+    parquet  -> pyarrow (opcional; pip install pyarrow)
+"""
+
+from pathlib import Path
+from typing import Iterable
+
+import pandas as pd
+
+FORMATOS = ('csv', 'parquet')
+
+# Filas de datos que caben en una hoja de Excel (1.048.576 menos el encabezado)
+FILAS_MAX_EXCEL = 1_048_575
+
+
+def escribir_csv(bloques: Iterable[pd.DataFrame], ruta, encoding: str = 'utf-8-sig') -> int:
+    """Escribe los bloques en un CSV (encabezado solo en el primero); devuelve las filas"""
+    total = 0
+    # Un solo archivo abierto: con utf-8-sig el BOM se escribe una sola vez
+    with open(ruta, 'w', encoding=encoding, newline='') as f:
+        for bloque in bloques:
+            bloque.to_csv(f, index=False, header=(total == 0))
+            total += len(bloque)
+    return total
+
+
+def _esquema_parquet(bloque: pd.DataFrame):
+    """Esquema del primer bloque; las columnas vacías en él se declaran como texto"""
+    import pyarrow as pa
+
+    esquema = pa.Schema.from_pandas(bloque, preserve_index=False)
+    for i, campo in enumerate(esquema):
+        if pa.types.is_null(campo.type):
+            esquema = esquema.set(i, campo.with_type(pa.string()))
+    return esquema
+
+
+def escribir_parquet(bloques: Iterable[pd.DataFrame], ruta) -> int:
+    """Escribe cada bloque como un row group de un Parquet; devuelve las filas"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("La salida en Parquet necesita pyarrow: pip install pyarrow")
+
+    total = 0
+    escritor = None
+    try:
+        for bloque in bloques:
+            if escritor is None:
+                esquema = _esquema_parquet(bloque)
+                escritor = pq.ParquetWriter(str(ruta), esquema)
+            escritor.write_table(pa.Table.from_pandas(bloque, schema=esquema, preserve_index=False))
+            total += len(bloque)
+    finally:
+        if escritor is not None:
+            escritor.close()
+    return total
+
+
+def escribir_bloques(bloques: Iterable[pd.DataFrame], ruta, formato: str = 'csv') -> int:
+    """Escribe los bloques en `ruta` con el formato indicado ('csv' o 'parquet')"""
+    if formato == 'csv':
+        return escribir_csv(bloques, ruta)
+    if formato == 'parquet':
+        return escribir_parquet(bloques, ruta)
+    raise ValueError(f"Formato desconocido: {formato} (opciones: {', '.join(FORMATOS)})")
+
+
+def ruta_con_formato(ruta, formato: str) -> Path:
+    """Cambia la extensión de `ruta` por la del formato"""
+    return Path(ruta).with_suffix(f'.{formato}')
@@ -0,0 +1,551 @@
+"""
+Motor declarativo de campos sintéticos para los datasets de becarios (2020-2024)
+
+Cada campo inventado se describe con una distribución y una plantilla es un dict
+ordenado campo -> distribución. Cada distribución genera la columna completa de una vez
+con un numpy.random.Generator (sin bucles por fila); las distribuciones condicionales
+agrupan las filas por el valor de otra columna y generan cada grupo de una vez.
+
+    PLANTILLA = {
+        'Genero': Categorica(['Femenino', 'Masculino'], [0.55, 0.45]),
+        '_extranjero': Bernoulli(0.05),
+        'Lugar': Condicional('_extranjero', {True: Categorica(PAISES)},
+                             defecto=Copia('Departamento')),
+    }
+    segmentos = [Segmento(PLANTILLA, 120, {'Departamento': 'Cusco', 'Anio_Convocatoria': 2024})]
+    df = generar_segmentos(segmentos, semilla=2024)
+
+Los campos que empiezan con '_' son auxiliares (banderas, índices) y se pueden usar en
+otros campos o en los reportes, pero no forman parte del dataset final.
+
+Cada fila lleva en la columna Procedencia una máscara con 2 bits por campo visible (en
+el orden de las columnas del dataset): VACIO, REAL, DERIVADO o INVENTADO. Las columnas
+fijas de un segmento son REAL; Copia, Mapeo, Formato y Constante son DERIVADO; el resto
+de distribuciones, INVENTADO. `.como(...)` cambia la de una distribución y
+Segmento.procedencia la de una columna fija; Condicional toma, fila por fila, la de la
+opción elegida. resumen_procedencia cuenta cada estado por campo a partir de la máscara.
+
+Cada segmento (p. ej. un departamento), o cada partición de FILAS_POR_PARTICION filas
+si es más grande, usa su propio flujo de números aleatorios derivado de la semilla con
+SeedSequence: el resultado no depende del orden en que se generen, de cuántos procesos
+se usen ni de si se piden en bloques (generar_en_bloques) o de una vez. Con procesos > 1 las plantillas
+se envían a los procesos, así que las funciones `clave` deben estar definidas a nivel de
+módulo (no lambdas) y el script debe tener su `if __name__ == "__main__"`.
+
+Todos los generadores aceptan --escala (agregar_opcion_escala): en vez de su muestra,
+generan los totales reales de becarios multiplicados por la escala (escalar), de
+ESCALA_MINIMA a ESCALA_MAXIMA, y --procesos (agregar_opcion_procesos).
+benchmark_sintetico.py mide filas/segundo y memoria por escala.
+"""
+
+import argparse
+import copy
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+def _arreglo(valores) -> np.ndarray:
+    """Convierte una lista de valores en arreglo; los textos quedan como objetos de Python"""
+    arreglo = np.asarray(valores)
+    if arreglo.dtype.kind in 'UO':
+        arreglo = np.asarray(valores, dtype=object)
+    return arreglo
+
+
+def _factorizar(valores) -> tuple:
+    """
+    (códigos, valores distintos) como pd.factorize, pero los faltantes (None/NaN) también
+    tienen código: quedan juntos como un único valor None
+    """
+    codigos, unicos = pd.factorize(valores, use_na_sentinel=False)
+    return codigos, [None if pd.isna(u) else u for u in unicos]
+
+
+class _Filas:
+    """Vista perezosa de un subconjunto de filas de las columnas ya generadas"""
+
+    def __init__(self, columnas, filas: np.ndarray):
+        self._columnas = columnas
+        self._filas = filas
+
+    def __getitem__(self, nombre: str) -> np.ndarray:
+        return self._columnas[nombre][self._filas]
+
+
+# Procedencia de un campo (2 bits por campo en la columna COLUMNA_PROCEDENCIA)
+VACIO, REAL, DERIVADO, INVENTADO = 0, 1, 2, 3
+ESTADOS_PROCEDENCIA = ['vacio', 'real', 'derivado', 'inventado']
+COLUMNA_PROCEDENCIA = 'Procedencia'
+
+
+class Distribucion:
+    """Genera una columna de `n` valores; `columnas` son las columnas ya generadas"""
+
+    procedencia = INVENTADO
+
+    def muestrear(self, rng: np.random.Generator, n: int, columnas) -> np.ndarray:
+        raise NotImplementedError
+
+    def muestrear_con_procedencia(self, rng: np.random.Generator, n: int, columnas) -> tuple:
+        """(valores, procedencia); la procedencia es un número o un arreglo por fila"""
+        return self.muestrear(rng, n, columnas), self.procedencia
+
+    def como(self, procedencia: int) -> 'Distribucion':
+        """Copia de esta distribución cuyos valores se marcan con otra procedencia"""
+        copia = copy.copy(self)
+        copia.procedencia = procedencia
+        return copia
+
+
+class Constante(Distribucion):
+    procedencia = DERIVADO
+
+    def __init__(self, valor):
+        self.valor = valor
+
+    def muestrear(self, rng, n, columnas):
+        return np.full(n, self.valor, dtype=object if isinstance(self.valor, str) else None)
+
+
+class Categorica(Distribucion):
+    """Elige entre `valores` con `pesos` (no hace falta que sumen 1); sin pesos, uniforme"""
+
+    def __init__(self, valores: Sequence, pesos: Optional[Sequence[float]] = None):
+        self.valores = _arreglo(list(valores))
+        self.probabilidades = None
+        if pesos is not None:
+            pesos = np.asarray(pesos, dtype=float)
+            self.probabilidades = pesos / pesos.sum()
+
+    def muestrear(self, rng, n, columnas):
+        if self.probabilidades is None:
+            codigos = rng.integers(len(self.valores), size=n)
+        else:
+            codigos = rng.choice(len(self.valores), size=n, p=self.probabilidades)
+        return self.valores[codigos]
+
+
+class Bernoulli(Distribucion):
+    """True con probabilidad `p`"""
+
+    def __init__(self, p: float):
+        self.p = p
+
+    def muestrear(self, rng, n, columnas):
+        return rng.random(n) < self.p
+
+
+class Copia(Distribucion):
+    """Repite el valor de otra columna"""
+
+    procedencia = DERIVADO
+
+    def __init__(self, columna: str):
+        self.columna = columna
+
+    def muestrear(self, rng, n, columnas):
+        return columnas[self.columna]
+
+
+class Mapeo(Distribucion):
+    """Traduce los valores de otra columna con un dict, o con una lista si son índices"""
+
+    procedencia = DERIVADO
+
+    def __init__(self, columna: str, tabla):
+        self.columna = columna
+        self.tabla = tabla
+
+    def muestrear(self, rng, n, columnas):
+        valores = columnas[self.columna]
+        if not isinstance(self.tabla, dict):
+            return _arreglo(list(self.tabla))[valores]
+        codigos, unicos = _factorizar(valores)
+        # Un faltante sigue faltando, salvo que la tabla traduzca None
+        return _arreglo([self.tabla.get(u) if u is None else self.tabla[u] for u in unicos])[codigos]
+
+
+class Formato(Distribucion):
+    """Arma un texto con el valor de otra columna, p. ej. Formato('Universidad de {}', 'Lugar')"""
+
+    procedencia = DERIVADO
+
+    def __init__(self, patron: str, columna: str):
+        self.patron = patron
+        self.columna = columna
+
+    def muestrear(self, rng, n, columnas):
+        codigos, unicos = _factorizar(columnas[self.columna])
+        return np.array([None if u is None else self.patron.format(u) for u in unicos],
+                        dtype=object)[codigos]
+
+
+class Condicional(Distribucion):
+    """
+    Usa una distribución distinta según el valor de otra columna
+
+    Args:
+        columna: Columna de la que depende (ya generada o fija del segmento)
+        opciones: Valor (o clave) -> distribución
+        defecto: Distribución para los valores que no están en `opciones`
+        clave: Función que convierte el valor de la columna en la clave de `opciones`
+            (se aplica una vez por valor distinto, no por fila; a nivel de módulo)
+    """
+
+    procedencia = None
+
+    def __init__(self, columna: str, opciones: Dict, defecto: Optional[Distribucion] = None,
+                 clave: Optional[Callable] = None):
+        self.columna = columna
+        self.opciones = opciones
+        self.defecto = defecto
+        self.clave = clave
+
+    def _distribucion(self, valor) -> Distribucion:
+        # Los faltantes van a opciones[None] o a `defecto`, sin pasar por `clave`
+        clave = self.clave(valor) if self.clave and valor is not None else valor
+        distribucion = self.opciones.get(clave, self.defecto)
+        if distribucion is None:
+            raise ValueError(f"Sin distribución para {self.columna}={valor!r}")
+        return distribucion
+
+    def muestrear(self, rng, n, columnas):
+        return self.muestrear_con_procedencia(rng, n, columnas)[0]
+
+    def muestrear_con_procedencia(self, rng, n, columnas):
+        codigos, unicos = _factorizar(columnas[self.columna])
+        if len(unicos) == 1:
+            valores, procedencia = self._distribucion(unicos[0]).muestrear_con_procedencia(
+                rng, n, columnas)
+            return valores, self._procedencia(procedencia)
+
+        partes = []
+        for i, valor in enumerate(unicos):
+            filas = np.flatnonzero(codigos == i)
+            muestra, procedencia = self._distribucion(valor).muestrear_con_procedencia(
+                rng, len(filas), _Filas(columnas, filas))
+            partes.append((filas, muestra, procedencia))
+
+        tipos = {muestra.dtype for _, muestra, _ in partes}
+        resultado = np.empty(n, dtype=tipos.pop() if len(tipos) == 1 else object)
+        procedencias = np.empty(n, dtype=np.uint8)
+        for filas, muestra, procedencia in partes:
+            resultado[filas] = muestra
+            procedencias[filas] = procedencia
+        return resultado, self._procedencia(procedencias)
+
+    def _procedencia(self, de_las_opciones):
+        # Sin .como(...), cada fila conserva la procedencia de la opción elegida
+        return de_las_opciones if self.procedencia is None else self.procedencia
+
+
+class TablaCondicional(Distribucion):
+    """
+    Elige entre `valores` con una tabla de probabilidades precalculada, indexada por los
+    códigos de una o más columnas (p. ej. departamento de origen x lugar de estudio)
+
+    Los valores de cada columna se traducen a su posición en el catálogo (uno extra al
+    final para los que no están) y cada fila toma su distribución de la tabla con una
+    sola indexación; no hay ramas por fila ni búsquedas en listas.
+
+    Args:
+        columnas: Columnas de las que depende, ya generadas o fijas del segmento
+        catalogos: Valores conocidos de cada columna, en el mismo orden
+        valores: Valores posibles del campo
+        pesos: Función (un argumento por columna) -> pesos de `valores`; recibe None
+            para lo que no está en el catálogo. Se evalúa una vez por celda de la tabla.
+    """
+
+    def __init__(self, columnas: Sequence[str], catalogos: Sequence[Sequence],
+                 valores: Sequence, pesos: Callable):
+        self.columnas = list(columnas)
+        self.indices = [{v: i for i, v in enumerate(c)} for c in catalogos]
+        self.valores = _arreglo(list(valores))
+
+        forma = tuple(len(c) + 1 for c in catalogos)
+        tabla = np.empty(forma + (len(self.valores),))
+        for celda in np.ndindex(*forma):
+            claves = [c[i] if i < len(c) else None for c, i in zip(catalogos, celda)]
+            tabla[celda] = pesos(*claves)
+        totales = tabla.sum(axis=-1, keepdims=True)
+        if (totales <= 0).any():
+            raise ValueError(f"Pesos sin valores posibles en la tabla de {', '.join(self.columnas)}")
+        # Probabilidades acumuladas sin la última (que es 1): se elige contando cuántas supera u
+        self.acumuladas = np.cumsum(tabla / totales, axis=-1)[..., :-1]
+
+    def _codigos(self, valores: np.ndarray, indices: Dict) -> np.ndarray:
+        codigos, unicos = _factorizar(valores)
+        return np.array([indices.get(u, len(indices)) for u in unicos], dtype=np.intp)[codigos]
+
+    def muestrear(self, rng, n, columnas):
+        celdas = tuple(self._codigos(columnas[c], i) for c, i in zip(self.columnas, self.indices))
+        acumuladas = self.acumuladas[celdas]
+        elegidos = (rng.random(n)[:, None] >= acumuladas).sum(axis=1)
+        return self.valores[elegidos]
+
+
+class Segmento(NamedTuple):
+    """
+    `filas` registros generados con `plantilla`; `fijos` son columnas constantes y
+    `procedencia` cambia la de algunas columnas (por defecto, las fijas son REAL)
+    """
+    plantilla: Dict[str, Distribucion]
+    filas: int
+    fijos: Dict = {}
+    procedencia: Dict[str, int] = {}
+
+
+def _generar(plantilla: Dict[str, Distribucion], n: int, rng: np.random.Generator,
+             fijos: Optional[Dict] = None) -> tuple:
+    """(columnas, procedencia de cada columna)"""
+    columnas = {
+        nombre: np.full(n, valor, dtype=object if isinstance(valor, str) else None)
+        for nombre, valor in (fijos or {}).items()
+    }
+    procedencias = dict.fromkeys(columnas, REAL)
+    for nombre, distribucion in plantilla.items():
+        columnas[nombre], procedencias[nombre] = distribucion.muestrear_con_procedencia(
+            rng, n, columnas)
+    return columnas, procedencias
+
+
+def generar(plantilla: Dict[str, Distribucion], n: int, rng: np.random.Generator,
+            fijos: Optional[Dict] = None) -> Dict[str, np.ndarray]:
+    """Genera las columnas de `n` registros en el orden de la plantilla"""
+    return _generar(plantilla, n, rng, fijos)[0]
+
+
+def campos_procedencia(columnas: List[str]) -> List[str]:
+    """Campos de la máscara de procedencia: las columnas visibles, en orden"""
+    return [c for c in columnas if not c.startswith('_') and c != COLUMNA_PROCEDENCIA]
+
+
+def _tipo_mascara(campos: List[str]):
+    bits = 2 * len(campos)
+    for tipo in (np.uint8, np.uint16, np.uint32, np.uint64):
+        if bits <= np.iinfo(tipo).bits:
+            return tipo
+    raise ValueError(f"La máscara de procedencia admite hasta 32 campos ({len(campos)} pedidos)")
+
+
+def _mascara(procedencias: Dict, campos: List[str], n: int) -> np.ndarray:
+    tipo = _tipo_mascara(campos)
+    mascara = np.zeros(n, dtype=tipo)
+    for k, campo in enumerate(campos):
+        procedencia = procedencias.get(campo, VACIO)
+        mascara |= np.asarray(procedencia, dtype=tipo) << tipo(2 * k)
+    return mascara
+
+
+def procedencia_de(mascara, campos: List[str], campo: str) -> np.ndarray:
+    """Procedencia (VACIO, REAL, DERIVADO o INVENTADO) de un campo en cada fila"""
+    mascara = np.asarray(mascara)
+    k = campos.index(campo)
+    return ((mascara >> mascara.dtype.type(2 * k)) & mascara.dtype.type(3)).astype(np.uint8)
+
+
+def resumen_procedencia(mascara, campos: List[str]) -> pd.DataFrame:
+    """
+    Filas de cada campo por procedencia (índice: campos; columnas: ESTADOS_PROCEDENCIA)
+
+    Los resúmenes de varios bloques se pueden sumar.
+    """
+    mascara = np.asarray(mascara).astype(_tipo_mascara(campos), copy=False)
+    conteos = [np.bincount(procedencia_de(mascara, campos, c), minlength=4) for c in campos]
+    return pd.DataFrame(conteos, index=pd.Index(campos, name='Campo'),
+                        columns=ESTADOS_PROCEDENCIA)
+
+
+# Rango de --escala: fracción de los totales reales de becarios que se genera
+ESCALA_MINIMA = 0.001
+ESCALA_MAXIMA = 100.0
+
+
+def escalar(total: int, escala: float) -> int:
+    """Filas para `total` becarios reales a la escala dada (redondeadas)"""
+    return int(round(total * escala))
+
+
+def tipo_escala(texto: str) -> float:
+    """Tipo de argparse para una escala dentro de [ESCALA_MINIMA, ESCALA_MAXIMA]"""
+    escala = float(texto)
+    if not ESCALA_MINIMA <= escala <= ESCALA_MAXIMA:
+        raise argparse.ArgumentTypeError(
+            f"la escala debe estar entre {ESCALA_MINIMA:g} y {ESCALA_MAXIMA:g} (se pidió {texto})")
+    return escala
+
+
+def agregar_opcion_escala(parser: argparse.ArgumentParser):
+    """--escala, común a todos los generadores sintéticos"""
+    parser.add_argument('--escala', type=tipo_escala, default=None,
+                        help=f"Filas como fracción de los totales reales ({ESCALA_MINIMA:g} a "
+                             f"{ESCALA_MAXIMA:g}); por defecto, la muestra de siempre")
+
+
+def agregar_opcion_procesos(parser: argparse.ArgumentParser):
+    """--procesos, común a todos los generadores sintéticos"""
+    parser.add_argument('--procesos', type=int, default=None,
+                        help="Procesos para generar las particiones (por defecto, todos los "
+                             "núcleos); no cambia el resultado")
+
+
+# Los segmentos grandes se generan por particiones de este tamaño, cada una con su flujo;
+# así la memoria por tarea no depende del tamaño del departamento
+FILAS_POR_PARTICION = 100_000
+
+# Particiones enviadas al pool por cada proceso antes de esperar resultados
+PARTICIONES_EN_VUELO = 2
+
+
+def _numero_particiones(segmentos: List[Segmento]) -> int:
+    """Particiones que genera _particiones (al menos una por segmento)"""
+    return sum(-(-max(segmento.filas, 1) // FILAS_POR_PARTICION) for segmento in segmentos)
+
+
+def _particiones(segmentos: List[Segmento], semilla: int) -> Iterator[tuple]:
+    """
+    (segmento parcial, flujo) de cada partición; el flujo de la partición j del segmento i
+    es SeedSequence(semilla, spawn_key=(i, j)), sin importar quién ni cuándo la genere
+    """
+    for i, segmento in enumerate(segmentos):
+        for j, inicio in enumerate(range(0, max(segmento.filas, 1), FILAS_POR_PARTICION)):
+            filas = min(FILAS_POR_PARTICION, segmento.filas - inicio)
+            flujo = np.random.SeedSequence(semilla, spawn_key=(i, j))
+            yield segmento._replace(filas=filas), flujo
+
+
+def _generar_segmento(segmento: Segmento, flujo: np.random.SeedSequence,
+                      campos: List[str]) -> Dict[str, np.ndarray]:
+    """Columnas del segmento más la máscara de procedencia de `campos`"""
+    columnas, procedencias = _generar(segmento.plantilla, segmento.filas,
+                                      np.random.default_rng(flujo), segmento.fijos)
+    procedencias.update(segmento.procedencia)
+    columnas[COLUMNA_PROCEDENCIA] = _mascara(procedencias, campos, segmento.filas)
+    return columnas
+
+
+def _generar_segmento_compacto(segmento: Segmento, flujo: np.random.SeedSequence,
+                               campos: List[str]) -> Dict:
+    """
+    Como _generar_segmento, pero las columnas de texto viajan de vuelta como códigos y
+    valores distintos: el proceso principal, que recibe todos los segmentos uno tras
+    otro, deserializa códigos unas tres veces más rápido que millones de textos
+    """
+    columnas = _generar_segmento(segmento, flujo, campos)
+    for nombre, valores in columnas.items():
+        if valores.dtype == object:
+            codigos, unicos = pd.factorize(valores, use_na_sentinel=False)
+            columnas[nombre] = (codigos, np.asarray(unicos, dtype=object))
+    return columnas
+
+
+def _expandir(columnas: Dict) -> Dict[str, np.ndarray]:
+    return {
+        nombre: valores[1][valores[0]] if isinstance(valores, tuple) else valores
+        for nombre, valores in columnas.items()
+    }
+
+
+def _generar_particiones(segmentos: List[Segmento], semilla: int, campos: List[str],
+                         procesos: Optional[int]) -> Iterator[tuple]:
+    """
+    (filas, columnas) de cada partición, en orden; con varios procesos solo hay
+    PARTICIONES_EN_VUELO por proceso pendientes a la vez
+    """
+    procesos = min(procesos or os.cpu_count() or 1, _numero_particiones(segmentos))
+    if procesos <= 1:
+        for segmento, flujo in _particiones(segmentos, semilla):
+            yield segmento.filas, _generar_segmento(segmento, flujo, campos)
+        return
+
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        pendientes = deque()
+        for segmento, flujo in _particiones(segmentos, semilla):
+            pendientes.append((segmento.filas, pool.submit(_generar_segmento_compacto, segmento, flujo, campos)))
+            if len(pendientes) >= procesos * PARTICIONES_EN_VUELO:
+                filas, futuro = pendientes.popleft()
+                yield filas, _expandir(futuro.result())
+        while pendientes:
+            filas, futuro = pendientes.popleft()
+            yield filas, _expandir(futuro.result())
+
+
+def _nombres_columnas(segmentos: List[Segmento]) -> List[str]:
+    """Columnas fijas y de plantilla de todos los segmentos, en orden, y la de procedencia"""
+    nombres = dict.fromkeys(n for s in segmentos for n in [*s.fijos, *s.plantilla])
+    return [*nombres, COLUMNA_PROCEDENCIA]
+
+
+def _unir(partes: List[tuple], nombres: List[str]) -> Dict[str, np.ndarray]:
+    """Concatena las particiones; las columnas que le faltan a una quedan vacías"""
+    return {
+        nombre: np.concatenate([
+            columnas.get(nombre, np.full(filas, None, dtype=object)) for filas, columnas in partes
+        ])
+        for nombre in nombres
+    }
+
+
+def generar_segmentos(segmentos: List[Segmento], semilla: int,
+                      columnas: Optional[List[str]] = None,
+                      procesos: Optional[int] = 1) -> pd.DataFrame:
+    """
+    Genera cada segmento con su propio flujo aleatorio y los une en un DataFrame
+
+    Args:
+        segmentos: Segmentos en el orden en que deben aparecer las filas
+        semilla: Semilla de la que se derivan los flujos de todos los segmentos
+        columnas: Columnas del resultado (por defecto, todas, incluidas las auxiliares y
+            la de procedencia); si un segmento no tiene alguna, sus filas quedan vacías
+            en esa columna. La máscara de procedencia cubre las columnas visibles.
+        procesos: Número de procesos (None: todos los núcleos); no cambia el resultado
+    """
+    nombres = columnas or _nombres_columnas(segmentos)
+    partes = list(_generar_particiones(segmentos, semilla, campos_procedencia(nombres), procesos))
+    if not partes:
+        return pd.DataFrame(columns=nombres)
+    return pd.DataFrame(_unir(partes, nombres))
+
+
+def generar_en_bloques(segmentos: List[Segmento], semilla: int, filas_por_bloque: int,
+                       columnas: Optional[List[str]] = None,
+                       procesos: Optional[int] = 1) -> Iterator[pd.DataFrame]:
+    """
+    Igual que generar_segmentos, pero entrega el resultado en DataFrames de
+    `filas_por_bloque` filas (el último puede ser menor) a medida que se generan
+
+    La memoria depende del tamaño del bloque y de FILAS_POR_PARTICION, no del total de
+    filas; unidos con pd.concat, los bloques son idénticos a generar_segmentos.
+    """
+    nombres = columnas or _nombres_columnas(segmentos)
+    resto = []
+    inicio = 0
+    for filas, parte in _generar_particiones(segmentos, semilla, campos_procedencia(nombres),
+                                             procesos):
+        # Lo que sobró del bloque anterior más la nueva partición, unido una sola vez
+        disponibles = sum(f for f, _ in resto) + filas
+        if disponibles < filas_por_bloque:
+            resto.append((filas, parte))
+            continue
+        unidas = _unir(resto + [(filas, parte)], nombres)
+        desde = 0
+        while disponibles - desde >= filas_por_bloque:
+            hasta = desde + filas_por_bloque
+            yield pd.DataFrame({n: v[desde:hasta] for n, v in unidas.items()},
+                               index=pd.RangeIndex(inicio, inicio + filas_por_bloque))
+            inicio += filas_por_bloque
+            desde = hasta
+        resto = [(disponibles - desde, {n: v[desde:] for n, v in unidas.items()})]
+    filas = sum(f for f, _ in resto)
+    if filas:
+        yield pd.DataFrame(_unir(resto, nombres), index=pd.RangeIndex(inicio, inicio + filas))
+
+
+def columnas_visibles(df: pd.DataFrame) -> pd.DataFrame:
+    """Quita las columnas auxiliares (las que empiezan con '_')"""
+    return df[[c for c in df.columns if not c.startswith('_')]]
@@ -1,14 +1,39 @@
 """
 Genera un Excel `datos_usuario_2020.xlsx` con las columnas solicitadas por el usuario.
 Usa los CSV generados previamente en el workspace (datos de 2020) y completa campos faltantes inventando valores cuando sea necesario.
-También genera `campos_inventados_2020.txt` que lista qué campos se inventaron.
+También genera `campos_inventados_2020.txt` que lista qué campos se inventaron, e
+`invented_fields_report.json` con los registros de cada campo por procedencia (real,
+derivado, inventado), calculados de la máscara de la columna Procedencia.
 Genera múltiples filas por registro para tener un dataset más realista.
 """
 
+import argparse
+import sys
+from pathlib import Path
+
 import pandas as pd
-import random
 import json
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from pronabec_comun.sintetico import (
+    COLUMNA_PROCEDENCIA,
+    DERIVADO,
+    INVENTADO,
+    Categorica,
+    Condicional,
+    Constante,
+    Copia,
+    Segmento,
+    TablaCondicional,
+    agregar_opcion_escala,
+    agregar_opcion_procesos,
+    campos_procedencia,
+    escalar,
+    generar_segmentos,
+    resumen_procedencia,
+)
+from pronabec_comun.salida_bloques import FILAS_MAX_EXCEL
+
 # Archivos de entrada (generados anteriormente)
 FN_DEPART = 'beca18_por_departamento_2020.csv'
 FN_CARRERA = 'beca18_por_carrera_2020.csv'
@@ -19,33 +44,34 @@ FN_MODAL = 'becarios_continuadores_por_modalidad_2020.csv'
 
 out_xlsx = 'datos_usuario_2020.xlsx'
 out_report = 'campos_inventados_2020.txt'
+out_procedencia = 'invented_fields_report.json'
+
+# Semilla del generador (misma salida en cada ejecución)
+SEMILLA = 2020
 
-random.seed(2020)
+COLUMNAS = ['NombreBeca','Institucion','Carrera','Lugar','Categoria de becas',
+            'Anio_Convocatoria','Genero','EstratoSocieconomico','BecasSegunMigracion',
+            COLUMNA_PROCEDENCIA]
 
-# Helper para elegir genero con distribución real (aprox 55% F, 45% M según datos típicos Pronabec)
-def pick_gender():
-    return random.choices(['Femenino', 'Masculino'], weights=[0.55, 0.45])[0]
+# Genero con distribución real (aprox 55% F, 45% M según datos típicos Pronabec)
+GENERO = Categorica(['Femenino', 'Masculino'], [0.55, 0.45])
 
-# Helper estrato con distribución real (mayoría pobre)
+# Estrato con distribución real (mayoría pobre)
 estratos = ['Pobre', 'Pobre Extremo', 'No pobre']
-def pick_estrato():
-    return random.choices(estratos, weights=[0.60, 0.25, 0.15])[0]
+ESTRATO = Categorica(estratos, [0.60, 0.25, 0.15])
 
-# Helper migracion (aprox 25% migra)
+# Migracion (aprox 25% migra); si estudia fuera del país -> Migro
 migr_options = ['Migro', 'No Migro']
-def pick_migracion(lugar_estudio, lugares_origen=None):
-    # Si estudia en Lima y es de Lima -> No Migro
-    # Si estudia fuera del país -> Migro
-    # Sino distribución normal
-    if lugar_estudio in ['Lima'] and lugares_origen and 'Lima' in lugares_origen:
-        return 'No Migro'
-    elif lugar_estudio not in ['Lima','Callao','Áncash','Apurímac','Arequipa','Ayacucho','Cajamarca',
-                                 'Cusco','Huancavelica','Huánuco','Ica','Junín','La Libertad',
-                                 'Lambayeque','Loreto','Madre de Dios','Moquegua','Pasco','Piura',
-                                 'Puno','San Martín','Tacna','Tumbes','Ucayali','Amazonas']:
-        return 'Migro'  # país extranjero
-    else:
-        return random.choices(migr_options, weights=[0.25, 0.75])[0]
+departamentos_peru = ['Lima','Callao','Áncash','Apurímac','Arequipa','Ayacucho','Cajamarca',
+                      'Cusco','Huancavelica','Huánuco','Ica','Junín','La Libertad',
+                      'Lambayeque','Loreto','Madre de Dios','Moquegua','Pasco','Piura',
+                      'Puno','San Martín','Tacna','Tumbes','Ucayali','Amazonas']
+
+def pesos_migracion(lugar):
+    """Pesos de migr_options según el lugar de estudio (None: fuera del Perú)"""
+    return [1, 0] if lugar is None else [0.25, 0.75]
+
+MIGRACION = TablaCondicional(['Lugar'], [departamentos_peru], migr_options, pesos_migracion)
 
 # Mapeo de instituciones según tipo (usando datos reales del PDF)
 instituciones_universidad = ['Universidad Nacional Mayor de San Marcos', 'Universidad Nacional de Ingeniería',
@@ -55,6 +81,14 @@ instituciones_ist = ['Instituto superior tecnológico', 'SENATI', 'TECSUP',
                      'Instituto Tecnológico']
 instituciones_isp = ['Instituto superior pedagógico', 'Pedagógico Nacional']
 
+# Institución: 79% universidad, 18% IST, 3% ISP (según PDF)
+TIPO_INSTITUCION = Categorica(['Universidad', 'IST', 'ISP'], [0.79, 0.18, 0.03])
+INSTITUCION = Condicional('_tipo_institucion', {
+    'Universidad': Categorica(instituciones_universidad),
+    'IST': Categorica(instituciones_ist),
+    'ISP': Categorica(instituciones_isp),
+})
+
 # Carreras comunes por área (del PDF)
 carreras_ingenieria = ['Ingeniería Civil', 'Ingeniería Industrial', 'Ingeniería de Sistemas',
                        'Ingeniería Mecánica', 'Ingeniería Electrónica', 
@@ -66,327 +100,247 @@ carreras_educacion = ['Educación Primaria', 'Educación Inicial', 'Educación']
 carreras_otras = ['Agronomía', 'Agropecuaria y Veterinaria', 'Humanidades y Arte',
                   'Ciencias Naturales, Exactas y de la Computación', 'Servicios']
 
-def pick_carrera_from_area(area):
+def grupo_de_area(area):
     if 'Ingenier' in area:
-        return random.choice(carreras_ingenieria)
+        return 'Ingenieria'
     elif 'Ciencias Sociales' in area or 'Comerciales' in area:
-        return random.choice(carreras_ciencias_sociales)
+        return 'Ciencias Sociales'
     elif 'Salud' in area:
-        return random.choice(carreras_salud)
+        return 'Salud'
     elif 'Educación' in area:
-        return random.choice(carreras_educacion)
+        return 'Educacion'
+    return None
+
+# Carrera según el área; las demás áreas se usan tal cual
+CARRERA_DE_AREA = Condicional('_area', {
+    'Ingenieria': Categorica(carreras_ingenieria),
+    'Ciencias Sociales': Categorica(carreras_ciencias_sociales),
+    'Salud': Categorica(carreras_salud),
+    'Educacion': Categorica(carreras_educacion),
+}, clave=grupo_de_area, defecto=Copia('_area'))
+
+# Áreas de carrera según proporciones del PDF
+AREA = Categorica(
+    ['Ingeniería, Industria y Construcción',
+     'Ciencias Sociales, Comerciales y Derecho',
+     'Ciencias de la Salud',
+     'Educación',
+     'Ciencias Naturales, Exactas y de la Computación',
+     'Agropecuaria y Veterinaria',
+     'Humanidades y Arte',
+     'Servicios'],
+    [0.534, 0.263, 0.071, 0.047, 0.045, 0.026, 0.011, 0.003]
+)
+
+PLANTILLA_DEPARTAMENTO = {
+    '_area': AREA,
+    'Carrera': CARRERA_DE_AREA,
+    '_tipo_institucion': TIPO_INSTITUCION,
+    'Institucion': INSTITUCION,
+    'Genero': GENERO,
+    'EstratoSocieconomico': ESTRATO,
+    'BecasSegunMigracion': MIGRACION,
+}
+
+PLANTILLA_CARRERA = {
+    'Carrera': CARRERA_DE_AREA,
+    # Lugar: distribuir entre departamentos principales
+    'Lugar': Categorica(['Lima', 'Junín', 'Piura', 'Cusco', 'Arequipa',
+                         'Ayacucho', 'Cajamarca', 'Lambayeque']),
+    '_tipo_institucion': TIPO_INSTITUCION,
+    'Institucion': INSTITUCION,
+    'Genero': GENERO,
+    'EstratoSocieconomico': ESTRATO,
+    'BecasSegunMigracion': MIGRACION,
+}
+
+PLANTILLA_POSGRADO = {
+    # Categoria: 82% Maestría, 18% Doctorado (según PDF)
+    'Categoria de becas': Categorica(['Posgrado Maestria', 'Posgrado Doctorado'], [0.82, 0.18]),
+    'Carrera': Categorica([
+        'MBA - Administración', 'Maestría en Educación', 
+        'Maestría en Ingeniería', 'Doctorado en Ciencias',
+        'Maestría en Salud Pública', 'Maestría en Derecho',
+        'Doctorado en Educación', 'Maestría en Economía'
+    ]),
+    'Genero': GENERO,
+    'EstratoSocieconomico': ESTRATO,
+}
+
+def plantilla_especial(nombre_beca):
+    """Lugar, migración y carrera dependen del nombre de la modalidad especial"""
+    if 'Internacional' in nombre_beca or 'Francia' in nombre_beca:
+        lugar = Categorica(['Francia', 'España', 'Reino Unido', 'Estados Unidos'])
+        migr = Constante('Migro')
+    elif 'Ecuatoriana' in nombre_beca:
+        lugar = Categorica(['Ecuador', 'Lima'])
+        migr = Condicional('Lugar', {'Ecuador': Constante('Migro')}, defecto=Categorica(migr_options))
     else:
-        return area  # usar el área tal cual
-
-def pick_institucion(tipo_preferido=None):
-    if tipo_preferido == 'Universidad':
-        return random.choice(instituciones_universidad)
-    elif tipo_preferido == 'Instituto superior tecnológico':
-        return random.choice(instituciones_ist)
-    elif tipo_preferido == 'Instituto superior pedagógico':
-        return random.choice(instituciones_isp)
+        lugar = Categorica(['Lima', 'Arequipa', 'Cusco', 'Junín'])
+        migr = MIGRACION
+
+    if 'Arte' in nombre_beca:
+        carrera = Categorica(['Artes Plásticas', 'Música', 'Danza', 'Teatro'])
+    elif 'Maestro' in nombre_beca or 'Educación' in nombre_beca:
+        carrera = Categorica(['Educación Primaria', 'Educación Inicial', 'Educación Secundaria'])
+    elif 'Excelencia' in nombre_beca:
+        carrera = Categorica(['Ingeniería', 'Medicina', 'Derecho', 'Administración'])
     else:
-        # Distribución: 79% universidad, 18% IST, 3% ISP (según PDF)
-        tipo = random.choices(['Universidad', 'IST', 'ISP'], weights=[0.79, 0.18, 0.03])[0]
-        if tipo == 'Universidad':
-            return random.choice(instituciones_universidad)
-        elif tipo == 'IST':
-            return random.choice(instituciones_ist)
-        else:
-            return random.choice(instituciones_isp)
-
-rows = []
-campos_inventados = set()
-
-# Crear registros de muestra - expandir usando totales reales
-
-# 1) Beca 18 por departamento - expandir con registros múltiples
-try:
-    df_dept = pd.read_csv(FN_DEPART)
-except Exception as e:
-    df_dept = pd.DataFrame()
-
-print(f"Generando registros de Beca 18 por departamento...")
-for i, r in df_dept.iterrows():
-    lugar = r.get('Departamento')
-    nombre = 'Beca 18'
-    categoria = 'Pregrado'
-    anio = 2020
-    
-    # Obtener total de becarios para este departamento
+        carrera = Categorica(['Varios', 'Ingeniería', 'Ciencias'])
+
+    return {
+        'Lugar': lugar,
+        'BecasSegunMigracion': migr,
+        'Carrera': carrera,
+        '_tipo_institucion': TIPO_INSTITUCION,
+        'Institucion': INSTITUCION,
+        'Genero': GENERO,
+        'EstratoSocieconomico': ESTRATO,
+    }
+
+def total_becarios(r, columna, defecto):
     try:
-        total_becarios = int(str(r.get('TotalBecarios', 10)).replace(' ', ''))
+        return int(str(r.get(columna, defecto)).replace(' ', ''))
     except:
-        total_becarios = 10
-    
-    # Crear entre 5-15 registros por departamento (muestra representativa)
-    num_registros = min(15, max(5, total_becarios // 100))
-    
-    for j in range(num_registros):
-        # Carrera: distribuir según proporciones del PDF
-        carrera_area = random.choices(
-            ['Ingeniería, Industria y Construcción',
-             'Ciencias Sociales, Comerciales y Derecho',
-             'Ciencias de la Salud',
-             'Educación',
-             'Ciencias Naturales, Exactas y de la Computación',
-             'Agropecuaria y Veterinaria',
-             'Humanidades y Arte',
-             'Servicios'],
-            weights=[0.534, 0.263, 0.071, 0.047, 0.045, 0.026, 0.011, 0.003]
-        )[0]
-        carrera = pick_carrera_from_area(carrera_area)
-        campos_inventados.add('Carrera')
-        
-        # Institución: distribuir según tipo
-        institucion = pick_institucion()
-        campos_inventados.add('Institucion')
-        
-        genero = pick_gender()
-        campos_inventados.add('Genero')
-        
-        estrato = pick_estrato()
-        campos_inventados.add('EstratoSocieconomico')
-        
-        migr = pick_migracion(lugar)
-        campos_inventados.add('BecasSegunMigracion')
-        
-        rows.append({
-            'NombreBeca': nombre,
-            'Institucion': institucion,
-            'Carrera': carrera,
-            'Lugar': lugar,
-            'Categoria de becas': categoria,
-            'Anio_Convocatoria': anio,
-            'Genero': genero,
-            'EstratoSocieconomico': estrato,
-            'BecasSegunMigracion': migr
-        })
-
-print(f"  → Generados {len(rows)} registros de Beca 18 por departamento")
-
-# 2) Beca 18 por carrera - crear registros adicionales
-try:
-    df_car = pd.read_csv(FN_CARRERA)
-except Exception as e:
-    df_car = pd.DataFrame()
-
-print(f"Generando registros de Beca 18 por carrera...")
-rows_antes = len(rows)
-for i, r in df_car.iterrows():
-    nombre = 'Beca 18'
-    carrera_area = r.get('Carrera') if pd.notna(r.get('Carrera')) else 'Otra'
-    categoria = 'Pregrado'
-    anio = 2020
-    
-    # Obtener total
+        return defecto
+
+def crear_segmentos(escala=None):
+    """
+    Segmentos de 2020: la muestra de siempre o, con `escala`, los totales reales de
+    becarios multiplicados por la escala
+    """
+    segmentos = []
+
+    # Crear registros de muestra - expandir usando totales reales
+
+    # 1) Beca 18 por departamento - expandir con registros múltiples
     try:
-        total_becarios = int(str(r.get('TotalBecarios', 10)).replace(' ', ''))
-    except:
-        total_becarios = 10
-    
-    # Crear registros proporcionales (5-20 por área)
-    num_registros = min(20, max(5, total_becarios // 500))
-    
-    for j in range(num_registros):
-        carrera = pick_carrera_from_area(carrera_area)
-        
-        # Lugar: distribuir entre departamentos principales
-        lugar = random.choice(['Lima', 'Junín', 'Piura', 'Cusco', 'Arequipa', 
-                              'Ayacucho', 'Cajamarca', 'Lambayeque'])
-        campos_inventados.add('Lugar')
-        
-        institucion = pick_institucion()
-        campos_inventados.add('Institucion')
-        
-        genero = pick_gender()
-        campos_inventados.add('Genero')
-        
-        estrato = pick_estrato()
-        campos_inventados.add('EstratoSocieconomico')
-        
-        migr = pick_migracion(lugar)
-        campos_inventados.add('BecasSegunMigracion')
-        
-        rows.append({
-            'NombreBeca': nombre,
-            'Institucion': institucion,
-            'Carrera': carrera,
-            'Lugar': lugar,
-            'Categoria de becas': categoria,
-            'Anio_Convocatoria': anio,
-            'Genero': genero,
-            'EstratoSocieconomico': estrato,
-            'BecasSegunMigracion': migr
-        })
-
-print(f"  → Generados {len(rows) - rows_antes} registros adicionales por carrera")
-
-# 3) Becas de posgrado por país
-try:
-    df_pos_pais = pd.read_csv(FN_POS_PAIS)
-except Exception as e:
-    df_pos_pais = pd.DataFrame()
-
-try:
-    df_pos_prog = pd.read_csv(FN_POS_PROG)
-except Exception as e:
-    df_pos_prog = pd.DataFrame()
-
-print(f"Generando registros de Becas de Posgrado...")
-rows_antes = len(rows)
-for i, r in df_pos_pais.iterrows():
-    pais = r.get('PaisEstudio')
-    nombre = 'Beca Posgrado'
-    lugar = pais  # El país es el lugar de estudio
-    anio = 2020
-    
-    # Obtener total
+        df_dept = pd.read_csv(FN_DEPART)
+    except Exception as e:
+        df_dept = pd.DataFrame()
+
+    print(f"Generando registros de Beca 18 por departamento...")
+    for i, r in df_dept.iterrows():
+        total = total_becarios(r, 'TotalBecarios', 10)
+        # Crear entre 5-15 registros por departamento (muestra representativa)
+        num_registros = escalar(total, escala) if escala else min(15, max(5, total // 100))
+        segmentos.append(Segmento(PLANTILLA_DEPARTAMENTO, num_registros, {
+            'NombreBeca': 'Beca 18',
+            'Lugar': r.get('Departamento'),
+            'Categoria de becas': 'Pregrado',
+            'Anio_Convocatoria': 2020,
+        }))
+
+    print(f"  → {sum(s.filas for s in segmentos)} registros de Beca 18 por departamento")
+
+    # 2) Beca 18 por carrera - crear registros adicionales
     try:
-        total_becarios = int(str(r.get('TotalBecarios', 5)).replace(' ', ''))
-    except:
-        total_becarios = 5
-    
-    # Crear 3-8 registros por país
-    num_registros = min(8, max(3, total_becarios // 10))
-    
-    for j in range(num_registros):
-        # Categoria: 82% Maestría, 18% Doctorado (según PDF)
-        categoria = random.choices(
-            ['Posgrado Maestria', 'Posgrado Doctorado'], 
-            weights=[0.82, 0.18]
-        )[0]
-        
-        # Carrera para posgrado
-        carrera = random.choice([
-            'MBA - Administración', 'Maestría en Educación', 
-            'Maestría en Ingeniería', 'Doctorado en Ciencias',
-            'Maestría en Salud Pública', 'Maestría en Derecho',
-            'Doctorado en Educación', 'Maestría en Economía'
-        ])
-        campos_inventados.add('Carrera')
-        
-        institucion = 'Universidad'  # Posgrado siempre es universidad
-        campos_inventados.add('Institucion')
-        
-        genero = pick_gender()
-        campos_inventados.add('Genero')
-        
-        estrato = pick_estrato()
-        campos_inventados.add('EstratoSocieconomico')
-        
-        # Para posgrado internacional -> siempre "Migro"
-        migr = 'Migro'
-        campos_inventados.add('BecasSegunMigracion')
-        
-        rows.append({
-            'NombreBeca': nombre,
-            'Institucion': institucion,
-            'Carrera': carrera,
-            'Lugar': lugar,
-            'Categoria de becas': categoria,
-            'Anio_Convocatoria': anio,
-            'Genero': genero,
-            'EstratoSocieconomico': estrato,
-            'BecasSegunMigracion': migr
-        })
-
-print(f"  → Generados {len(rows) - rows_antes} registros de Posgrado")
-
-# 4) Modalidades especiales
-try:
-    df_modal = pd.read_csv(FN_MODAL)
-except Exception as e:
-    df_modal = pd.DataFrame()
-
-print(f"Generando registros de Becas Especiales...")
-rows_antes = len(rows)
-for i, r in df_modal.iterrows():
-    nombre_beca = r.get('NombreBeca') if pd.notna(r.get('NombreBeca')) else 'Beca Especial'
-    
-    # Skip "Total" row
-    if nombre_beca == 'Total':
-        continue
-    
-    categoria = 'Especiales'
-    anio = 2020
-    
-    # Obtener total
+        df_car = pd.read_csv(FN_CARRERA)
+    except Exception as e:
+        df_car = pd.DataFrame()
+
+    # Con escala, los becarios de Beca 18 ya están todos en los segmentos por departamento
+    # (con la carrera según las áreas del PDF); por carrera solo se agregan a la muestra
+    if escala:
+        df_car = pd.DataFrame()
+
+    print(f"Generando registros de Beca 18 por carrera...")
+    filas_antes = sum(s.filas for s in segmentos)
+    for i, r in df_car.iterrows():
+        # Crear registros proporcionales (5-20 por área)
+        num_registros = min(20, max(5, total_becarios(r, 'TotalBecarios', 10) // 500))
+        segmentos.append(Segmento(PLANTILLA_CARRERA, num_registros, {
+            'NombreBeca': 'Beca 18',
+            '_area': r.get('Carrera') if pd.notna(r.get('Carrera')) else 'Otra',
+            'Categoria de becas': 'Pregrado',
+            'Anio_Convocatoria': 2020,
+        }))
+
+    print(f"  → {sum(s.filas for s in segmentos) - filas_antes} registros adicionales por carrera")
+
+    # 3) Becas de posgrado por país
     try:
-        total_becarios = int(str(r.get('BecariosContinuadores', 3)).replace(' ', ''))
-    except:
-        total_becarios = 3
-    
-    # Crear 2-5 registros por modalidad especial
-    num_registros = min(5, max(2, total_becarios // 50))
-    
-    for j in range(num_registros):
-        # Lugar: mezcla entre Perú y países
-        if 'Internacional' in nombre_beca or 'Francia' in nombre_beca:
-            lugar = random.choice(['Francia', 'España', 'Reino Unido', 'Estados Unidos'])
-            migr = 'Migro'
-        elif 'Ecuatoriana' in nombre_beca:
-            lugar = random.choice(['Ecuador', 'Lima'])
-            migr = 'Migro' if lugar == 'Ecuador' else random.choice(migr_options)
-        else:
-            lugar = random.choice(['Lima', 'Arequipa', 'Cusco', 'Junín'])
-            migr = pick_migracion(lugar)
-        campos_inventados.add('Lugar')
-        campos_inventados.add('BecasSegunMigracion')
-        
-        # Carrera según tipo de beca
-        if 'Arte' in nombre_beca:
-            carrera = random.choice(['Artes Plásticas', 'Música', 'Danza', 'Teatro'])
-        elif 'Maestro' in nombre_beca or 'Educación' in nombre_beca:
-            carrera = random.choice(['Educación Primaria', 'Educación Inicial', 'Educación Secundaria'])
-        elif 'Excelencia' in nombre_beca:
-            carrera = random.choice(['Ingeniería', 'Medicina', 'Derecho', 'Administración'])
-        else:
-            carrera = random.choice(['Varios', 'Ingeniería', 'Ciencias'])
-        campos_inventados.add('Carrera')
-        
-        institucion = pick_institucion()
-        campos_inventados.add('Institucion')
-        
-        genero = pick_gender()
-        campos_inventados.add('Genero')
-        
-        estrato = pick_estrato()
-        campos_inventados.add('EstratoSocieconomico')
-        
-        rows.append({
+        df_pos_pais = pd.read_csv(FN_POS_PAIS)
+    except Exception as e:
+        df_pos_pais = pd.DataFrame()
+
+    try:
+        df_pos_prog = pd.read_csv(FN_POS_PROG)
+    except Exception as e:
+        df_pos_prog = pd.DataFrame()
+
+    print(f"Generando registros de Becas de Posgrado...")
+    filas_antes = sum(s.filas for s in segmentos)
+    for i, r in df_pos_pais.iterrows():
+        total = total_becarios(r, 'TotalBecarios', 5)
+        # Crear 3-8 registros por país
+        num_registros = escalar(total, escala) if escala else min(8, max(3, total // 10))
+        segmentos.append(Segmento(PLANTILLA_POSGRADO, num_registros, {
+            'NombreBeca': 'Beca Posgrado',
+            'Lugar': r.get('PaisEstudio'),  # El país es el lugar de estudio
+            'Institucion': 'Universidad',  # Posgrado siempre es universidad
+            'BecasSegunMigracion': 'Migro',  # Para posgrado internacional -> siempre "Migro"
+            'Anio_Convocatoria': 2020,
+        }, {'Institucion': INVENTADO, 'BecasSegunMigracion': DERIVADO}))
+
+    print(f"  → {sum(s.filas for s in segmentos) - filas_antes} registros de Posgrado")
+
+    # 4) Modalidades especiales
+    try:
+        df_modal = pd.read_csv(FN_MODAL)
+    except Exception as e:
+        df_modal = pd.DataFrame()
+
+    print(f"Generando registros de Becas Especiales...")
+    filas_antes = sum(s.filas for s in segmentos)
+    for i, r in df_modal.iterrows():
+        nombre_beca = r.get('NombreBeca') if pd.notna(r.get('NombreBeca')) else 'Beca Especial'
+
+        # Skip "Total" row
+        if nombre_beca == 'Total':
+            continue
+
+        total = total_becarios(r, 'BecariosContinuadores', 3)
+        # Crear 2-5 registros por modalidad especial
+        num_registros = escalar(total, escala) if escala else min(5, max(2, total // 50))
+        segmentos.append(Segmento(plantilla_especial(nombre_beca), num_registros, {
             'NombreBeca': nombre_beca,
-            'Institucion': institucion,
-            'Carrera': carrera,
-            'Lugar': lugar,
-            'Categoria de becas': categoria,
-            'Anio_Convocatoria': anio,
-            'Genero': genero,
-            'EstratoSocieconomico': estrato,
-            'BecasSegunMigracion': migr
-        })
-
-print(f"  → Generados {len(rows) - rows_antes} registros de Becas Especiales")
-
-# Crear DataFrame final
-print(f"\nTotal de registros generados: {len(rows)}")
-df_out = pd.DataFrame(rows, columns=[
-    'NombreBeca','Institucion','Carrera','Lugar','Categoria de becas',
-    'Anio_Convocatoria','Genero','EstratoSocieconomico','BecasSegunMigracion'
-])
-
-# Asegurar que Anio sea 2020
-df_out['Anio_Convocatoria'] = 2020
-
-# Guardar Excel
-print(f"\nGuardando archivos...")
-with pd.ExcelWriter(out_xlsx, engine='openpyxl') as writer:
-    df_out.to_excel(writer, index=False, sheet_name='Becas_2020')
-
-df_out.to_csv('datos_usuario_2020.csv', index=False, encoding='utf-8-sig')
-
-# Generar reporte de campos inventados
-reporte_texto = f"""
+            'Categoria de becas': 'Especiales',
+            'Anio_Convocatoria': 2020,
+        }))
+
+    print(f"  → {sum(s.filas for s in segmentos) - filas_antes} registros de Becas Especiales")
+    return segmentos
+
+def main():
+    parser = argparse.ArgumentParser(description="Dataset sintético de becarios 2020")
+    agregar_opcion_escala(parser)
+    agregar_opcion_procesos(parser)
+    args = parser.parse_args()
+
+    segmentos = crear_segmentos(args.escala)
+
+    # Generar todas las columnas de cada segmento de una vez
+    df_out = generar_segmentos(segmentos, SEMILLA, columnas=COLUMNAS, procesos=args.procesos)
+    print(f"\nTotal de registros generados: {len(df_out)}")
+
+    # Guardar Excel
+    print(f"\nGuardando archivos...")
+    if len(df_out) <= FILAS_MAX_EXCEL:
+        with pd.ExcelWriter(out_xlsx, engine='openpyxl') as writer:
+            df_out.to_excel(writer, index=False, sheet_name='Becas_2020')
+    else:
+        print(f"  {len(df_out)} filas no caben en una hoja de Excel; solo se guarda el CSV")
+
+    df_out.to_csv('datos_usuario_2020.csv', index=False, encoding='utf-8-sig')
+
+    # Registros de cada campo por procedencia, a partir de la máscara de cada fila
+    resumen = resumen_procedencia(df_out[COLUMNA_PROCEDENCIA], campos_procedencia(COLUMNAS))
+    with open(out_procedencia, 'w', encoding='utf-8') as f:
+        json.dump(resumen.reset_index().to_dict('records'), f, ensure_ascii=False, indent=2)
+
+    # Generar reporte de campos inventados
+    reporte_texto = f"""
 ================================================================================
 REPORTE DE CAMPOS INVENTADOS - DATOS PRONABEC 2020
 ================================================================================
@@ -444,6 +398,13 @@ del Pronabec 2020 NO contiene esta información a nivel individual por becario:
    - "No Migro": 75% (becarios que estudian en su región)
    - Países extranjeros -> siempre "Migro"
 
+PROCEDENCIA POR CAMPO (registros, de la columna Procedencia):
+--------------------------------------------------------------
+{resumen.to_string()}
+
+Procedencia: máscara con 2 bits por campo, en el orden de las columnas
+(0 vacío, 1 real, 2 derivado, 3 inventado).
+
 DISTRIBUCIONES APLICADAS:
 --------------------------
 • Categoría de becas:
@@ -481,14 +442,16 @@ Generado: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}
 ================================================================================
 """
 
-with open(out_report, 'w', encoding='utf-8') as f:
-    f.write(reporte_texto)
+    with open(out_report, 'w', encoding='utf-8') as f:
+        f.write(reporte_texto)
 
-print(f"\n✅ Generado: {out_xlsx} ({len(df_out)} filas)")
-print(f"✅ Reporte de campos inventados: {out_report}")
-print(f"\n📊 RESUMEN:")
-print(f"   - Registros Beca 18: {len(df_out[df_out['Categoria de becas']=='Pregrado'])}")
-print(f"   - Registros Posgrado: {len(df_out[df_out['Categoria de becas'].str.contains('Posgrado')])}")
-print(f"   - Registros Especiales: {len(df_out[df_out['Categoria de becas']=='Especiales'])}")
-print(f"\n⚠️  LEE EL ARCHIVO '{out_report}' PARA DETALLES DE CAMPOS INVENTADOS")
+    print(f"\n✅ Generado: {out_xlsx} ({len(df_out)} filas)")
+    print(f"✅ Reporte de campos inventados: {out_report}")
+    print(f"\n📊 RESUMEN:")
+    print(f"   - Registros Beca 18: {len(df_out[df_out['Categoria de becas']=='Pregrado'])}")
+    print(f"   - Registros Posgrado: {len(df_out[df_out['Categoria de becas'].str.contains('Posgrado')])}")
+    print(f"   - Registros Especiales: {len(df_out[df_out['Categoria de becas']=='Especiales'])}")
+    print(f"\n⚠️  LEE EL ARCHIVO '{out_report}' PARA DETALLES DE CAMPOS INVENTADOS")
 
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,17 @@ generado por el scraper principal
 import json
 import pandas as pd
 import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from pronabec_comun import extraer_paginas_filtradas, lector_texto_para, separar_texto_y_tablas
+
+# PDF local; con la caché por página, volver a parsear no vuelve a pasar por pdfplumber
+PDF_LOCAL = Path(__file__).resolve().parent / 'Memoria Anual del Pronabec 2020.pdf.pdf'
+
+# Páginas con las tablas que usan los parsers de este archivo
+PAGINAS_TABLAS = [64, 79, 104, 105, 106]
 
 def parse_beca_18_por_region(tables):
     """
@@ -231,10 +242,20 @@ def buscar_datos_migracion(text_pages):
     
     return data
 
-def main():
-    print("=" * 60)
-    print("PARSER DE DATOS DE BECAS PRONABEC 2020")
-    print("=" * 60)
+def cargar_datos_extraidos(paginas=None):
+    """
+    Obtiene las tablas y el texto a parsear.
+    Si se pasan los registros por página del extractor (pronabec_comun.extraer_paginas)
+    se usan directamente; si no, se extraen del PDF local (desde la caché por página)
+    y, si tampoco está el PDF, se leen los JSON generados por el scraper.
+    """
+    if paginas is None and PDF_LOCAL.exists():
+        paginas = extraer_paginas_filtradas(PDF_LOCAL, paginas_fijas=PAGINAS_TABLAS,
+                                            lector_texto=lector_texto_para(2020))
+    
+    if paginas is not None:
+        text_pages, tables = separar_texto_y_tablas(paginas)
+        return tables, text_pages
     
     # Cargar tablas extraídas
     with open('tablas_extraidas.json', 'r', encoding='utf-8') as f:
@@ -244,6 +265,15 @@ def main():
     with open('texto_extraido.json', 'r', encoding='utf-8') as f:
         text_pages = json.load(f)
     
+    return tables, text_pages
+
+def main(paginas=None):
+    print("=" * 60)
+    print("PARSER DE DATOS DE BECAS PRONABEC 2020")
+    print("=" * 60)
+    
+    tables, text_pages = cargar_datos_extraidos(paginas)
+    
     print(f"\nTablas cargadas: {len(tables)}")
     print(f"Páginas de texto cargadas: {len(text_pages)}")
     
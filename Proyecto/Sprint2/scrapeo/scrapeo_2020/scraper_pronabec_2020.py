@@ -3,68 +3,38 @@ Web Scraper para extraer datos de becas Pronabec 2020
 Extrae información de la Memoria Anual del Pronabec 2020
 """
 
-import requests
-import pdfplumber
 import pandas as pd
 import re
-from io import BytesIO
+import sys
+from pathlib import Path
 import json
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from pronabec_comun import descargar_pdf, extraer_paginas, separar_texto_y_tablas
+
 # URL del PDF
 PDF_URL = "https://cdn.www.gob.pe/uploads/document/file/1984259/Memoria%20Anual%20del%20Pronabec%202020.pdf.pdf?v=1625074615"
+PDF_FILE = Path(__file__).resolve().parent / "Memoria Anual del Pronabec 2020.pdf.pdf"
 
 def download_pdf(url):
-    """Descarga el PDF desde la URL"""
-    print(f"Descargando PDF desde: {url}")
+    """Descarga el PDF desde la URL (solo si cambió respecto a la copia local)"""
     try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        print("PDF descargado exitosamente")
-        return BytesIO(response.content)
+        return descargar_pdf(url, PDF_FILE)
     except Exception as e:
         print(f"Error al descargar el PDF: {e}")
         return None
 
-def extract_text_from_pdf(pdf_file):
-    """Extrae texto de todas las páginas del PDF"""
-    print("Extrayendo texto del PDF...")
-    all_text = []
-    try:
-        with pdfplumber.open(pdf_file) as pdf:
-            print(f"Total de páginas: {len(pdf.pages)}")
-            for i, page in enumerate(pdf.pages):
-                text = page.extract_text()
-                if text:
-                    all_text.append({
-                        'page': i + 1,
-                        'text': text
-                    })
-        print(f"Texto extraído de {len(all_text)} páginas")
-        return all_text
-    except Exception as e:
-        print(f"Error al extraer texto: {e}")
-        return []
-
-def extract_tables_from_pdf(pdf_file):
-    """Extrae todas las tablas del PDF"""
-    print("Extrayendo tablas del PDF...")
-    all_tables = []
+def extract_pages_from_pdf(pdf_file):
+    """Extrae texto y tablas de todas las páginas en una sola pasada"""
+    print("Extrayendo texto y tablas del PDF...")
     try:
-        with pdfplumber.open(pdf_file) as pdf:
-            for i, page in enumerate(pdf.pages):
-                tables = page.extract_tables()
-                if tables:
-                    for j, table in enumerate(tables):
-                        all_tables.append({
-                            'page': i + 1,
-                            'table_number': j + 1,
-                            'data': table
-                        })
+        text_pages, all_tables = separar_texto_y_tablas(extraer_paginas(pdf_file))
+        print(f"Texto extraído de {len(text_pages)} páginas")
         print(f"Se encontraron {len(all_tables)} tablas")
-        return all_tables
+        return text_pages, all_tables
     except Exception as e:
-        print(f"Error al extraer tablas: {e}")
-        return []
+        print(f"Error al extraer el PDF: {e}")
+        return [], []
 
 def parse_scholarship_data(tables, text_pages):
     """
@@ -154,14 +124,8 @@ def main():
         print("No se pudo descargar el PDF. Verifica la URL y tu conexión.")
         return
     
-    # Extraer texto
-    text_pages = extract_text_from_pdf(pdf_file)
-    
-    # Reiniciar el buffer para leer de nuevo
-    pdf_file.seek(0)
-    
-    # Extraer tablas
-    tables = extract_tables_from_pdf(pdf_file)
+    # Extraer texto y tablas
+    text_pages, tables = extract_pages_from_pdf(pdf_file)
     
     # Guardar texto crudo para análisis
     if text_pages:
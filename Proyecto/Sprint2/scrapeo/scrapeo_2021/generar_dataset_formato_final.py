@@ -1,62 +1,145 @@
+import argparse
+import sys
+from pathlib import Path
+
 import pandas as pd
-import random
 
-def generar_dataset_ajustado_2021():
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from pronabec_comun.sintetico import (
+    COLUMNA_PROCEDENCIA,
+    DERIVADO,
+    INVENTADO,
+    REAL,
+    Categorica,
+    Condicional,
+    Constante,
+    Copia,
+    Formato,
+    Segmento,
+    agregar_opcion_escala,
+    agregar_opcion_procesos,
+    campos_procedencia,
+    escalar,
+    generar_segmentos,
+    resumen_procedencia,
+)
+from pronabec_comun.salida_bloques import FILAS_MAX_EXCEL
+
+SEMILLA = 2021
+
+# Listas para datos inventados (cuando no hay información real)
+CARRERAS_PREGRADO = [
+    'Ingeniería de Sistemas', 'Administración', 'Contabilidad', 'Derecho',
+    'Medicina Humana', 'Enfermería', 'Educación', 'Ingeniería Civil',
+    'Ingeniería Industrial', 'Psicología', 'Arquitectura', 'Economía',
+    'Ingeniería Electrónica', 'Marketing', 'Agronomía', 'Veterinaria',
+    'Ingeniería Ambiental', 'Trabajo Social', 'Comunicaciones', 'Turismo',
+    'Gastronomía', 'Ingeniería Mecánica', 'Biología', 'Química',
+    'Ingeniería de Minas', 'Nutrición', 'Odontología', 'Farmacia'
+]
+
+INSTITUCIONES_PERU = [
+    'Universidad Nacional Mayor de San Marcos', 'Universidad Nacional de Ingeniería',
+    'Universidad Nacional Agraria La Molina', 'Pontificia Universidad Católica del Perú',
+    'Universidad de Lima', 'Universidad del Pacífico', 'Universidad Peruana Cayetano Heredia',
+    'Universidad Nacional de Trujillo', 'Universidad Nacional San Antonio Abad del Cusco',
+    'Universidad Nacional de San Agustín de Arequipa', 'Universidad Nacional del Altiplano',
+    'Universidad Nacional de Piura', 'Universidad Nacional San Cristóbal de Huamanga',
+    'Universidad Nacional del Centro del Perú', 'Universidad Nacional de la Amazonía Peruana',
+    'Universidad Nacional Hermilio Valdizán', 'Universidad Nacional de Cajamarca',
+    'Universidad Nacional Pedro Ruiz Gallo', 'Universidad Nacional Jorge Basadre Grohmann',
+    'Universidad Ricardo Palma', 'Universidad San Martín de Porres',
+    'Universidad Tecnológica del Perú', 'Universidad Continental',
+    'Universidad Privada del Norte', 'Universidad César Vallejo'
+]
+
+INSTITUCIONES_EXTRANJERO = {
+    'España': ['Universidad Complutense de Madrid', 'Universidad de Barcelona', 'Universidad Autónoma de Madrid'],
+    'Estados Unidos': ['MIT', 'Stanford University', 'Harvard University', 'Yale University'],
+    'Argentina': ['Universidad de Buenos Aires', 'Universidad Nacional de Córdoba'],
+    'Reino Unido': ['University of Oxford', 'University of Cambridge', 'Imperial College London'],
+    'Australia': ['University of Melbourne', 'Australian National University'],
+    'Francia': ['Sorbonne Université', 'École Polytechnique'],
+    'Brasil': ['Universidade de São Paulo', 'Universidade Federal do Rio de Janeiro'],
+    'Chile': ['Universidad de Chile', 'Pontificia Universidad Católica de Chile']
+}
+
+# Carreras de posgrado
+CARRERAS_POSGRADO = [
+    'MBA', 'Ingeniería de Software', 'Ciencias de Datos', 'Biotecnología',
+    'Gestión Pública', 'Economía Aplicada', 'Física', 'Química',
+    'Ciencias Políticas', 'Relaciones Internacionales', 'Finanzas',
+    'Ingeniería Biomédica', 'Neurociencias', 'Salud Pública'
+]
+
+ESTRATOS = ['Pobre Extremo', 'Pobre', 'No Pobre']
+GENEROS = ['Masculino', 'Femenino']
+MIGRACION_OPCIONES = ['Migró', 'No Migró']
+
+COLUMNAS_FINALES = [
+    'NombreBeca', 'Institucion', 'Carrera', 'Lugar', 'CategoriaDeBecas',
+    'Anio_Convocatoria', 'Genero', 'EstratoSocieconomico', 'BecasSegunMigracion',
+    COLUMNA_PROCEDENCIA
+]
+
+
+def plantilla_pregrado(pesos_genero, pesos_estrato, pesos_migracion_lima, pesos_migracion_resto):
     """
-    Genera dataset ajustado con los campos específicos requeridos
+    Becarios que estudian en el Perú; DepartamentoOrigen es fijo en cada segmento.
+    Quien migró, probablemente fue a Lima; quien no, estudia en su departamento.
+    """
+    return {
+        'Genero': Categorica(GENEROS, pesos_genero),
+        'EstratoSocieconomico': Categorica(ESTRATOS, pesos_estrato),
+        'BecasSegunMigracion': Condicional(
+            'DepartamentoOrigen',
+            {'Lima': Categorica(MIGRACION_OPCIONES, pesos_migracion_lima)},
+            defecto=Categorica(MIGRACION_OPCIONES, pesos_migracion_resto),
+        ),
+        'Lugar': Condicional('BecasSegunMigracion', {'Migró': Constante('Lima')},
+                             defecto=Copia('DepartamentoOrigen').como(REAL)),
+        'Carrera': Categorica(CARRERAS_PREGRADO),
+        'Institucion': Categorica(INSTITUCIONES_PERU),
+    }
+
+
+# Beca 18: 43% H / 57% M; 40% PE, 50% P, 10% NP;
+# Lima: 20% migró, 80% no migró; resto: 60% migró, 40% no migró
+PLANTILLA_REGION = plantilla_pregrado([43, 57], [40, 50, 10], [20, 80], [60, 40])
+PLANTILLA_CREDITOS = plantilla_pregrado([42, 58], [35, 55, 10], [15, 85], [50, 50])
+
+# Becas en el extranjero: principalmente posgrado; suelen ser para no pobres o pobres
+# (no extremos); el departamento de origen es proporcional a la población
+PLANTILLA_EXTRANJERO = {
+    'Genero': Categorica(GENEROS),
+    'EstratoSocieconomico': Categorica(['Pobre', 'No Pobre'], [60, 40]),
+    'DepartamentoOrigen': Categorica(
+        ['Lima', 'Arequipa', 'Cusco', 'La Libertad', 'Piura', 'Junín', 'Callao'],
+        [35, 12, 10, 8, 8, 7, 5]
+    ),
+    'CategoriaDeBecas': Categorica(['Posgrado Maestria', 'Posgrado Doctorado']),
+    'Carrera': Categorica(CARRERAS_POSGRADO),
+    # Institución del país correspondiente
+    'Institucion': Condicional(
+        'Lugar',
+        {pais: Categorica(lista) for pais, lista in INSTITUCIONES_EXTRANJERO.items()},
+        defecto=Formato('Universidad de {}', 'Lugar').como(INVENTADO),
+    ),
+}
+
+
+def crear_segmentos(escala=None):
+    """
+    Segmentos de 2021: una muestra por región y crédito (hasta 100 y 50 registros) o,
+    con `escala`, las cantidades reales multiplicadas por la escala
     """
-    print("="*80)
-    print("GENERANDO DATASET AJUSTADO - PRONABEC 2021")
-    print("="*80)
-    
     # Cargar datos extraídos
     df_region = pd.read_excel('dataset_becarios_region_2021.xlsx')
     df_genero = pd.read_excel('dataset_genero_2021.xlsx')
     df_creditos = pd.read_excel('dataset_creditos_educativos_2021.xlsx')
     df_pais = pd.read_excel('dataset_becarios_pais_2021.xlsx')
     
-    # Listas para datos inventados (cuando no hay información real)
-    carreras_pregrado = [
-        'Ingeniería de Sistemas', 'Administración', 'Contabilidad', 'Derecho',
-        'Medicina Humana', 'Enfermería', 'Educación', 'Ingeniería Civil',
-        'Ingeniería Industrial', 'Psicología', 'Arquitectura', 'Economía',
-        'Ingeniería Electrónica', 'Marketing', 'Agronomía', 'Veterinaria',
-        'Ingeniería Ambiental', 'Trabajo Social', 'Comunicaciones', 'Turismo',
-        'Gastronomía', 'Ingeniería Mecánica', 'Biología', 'Química',
-        'Ingeniería de Minas', 'Nutrición', 'Odontología', 'Farmacia'
-    ]
-    
-    instituciones_peru = [
-        'Universidad Nacional Mayor de San Marcos', 'Universidad Nacional de Ingeniería',
-        'Universidad Nacional Agraria La Molina', 'Pontificia Universidad Católica del Perú',
-        'Universidad de Lima', 'Universidad del Pacífico', 'Universidad Peruana Cayetano Heredia',
-        'Universidad Nacional de Trujillo', 'Universidad Nacional San Antonio Abad del Cusco',
-        'Universidad Nacional de San Agustín de Arequipa', 'Universidad Nacional del Altiplano',
-        'Universidad Nacional de Piura', 'Universidad Nacional San Cristóbal de Huamanga',
-        'Universidad Nacional del Centro del Perú', 'Universidad Nacional de la Amazonía Peruana',
-        'Universidad Nacional Hermilio Valdizán', 'Universidad Nacional de Cajamarca',
-        'Universidad Nacional Pedro Ruiz Gallo', 'Universidad Nacional Jorge Basadre Grohmann',
-        'Universidad Ricardo Palma', 'Universidad San Martín de Porres',
-        'Universidad Tecnológica del Perú', 'Universidad Continental',
-        'Universidad Privada del Norte', 'Universidad César Vallejo'
-    ]
-    
-    instituciones_extranjero = {
-        'España': ['Universidad Complutense de Madrid', 'Universidad de Barcelona', 'Universidad Autónoma de Madrid'],
-        'Estados Unidos': ['MIT', 'Stanford University', 'Harvard University', 'Yale University'],
-        'Argentina': ['Universidad de Buenos Aires', 'Universidad Nacional de Córdoba'],
-        'Reino Unido': ['University of Oxford', 'University of Cambridge', 'Imperial College London'],
-        'Australia': ['University of Melbourne', 'Australian National University'],
-        'Francia': ['Sorbonne Université', 'École Polytechnique'],
-        'Brasil': ['Universidade de São Paulo', 'Universidade Federal do Rio de Janeiro'],
-        'Chile': ['Universidad de Chile', 'Pontificia Universidad Católica de Chile']
-    }
-    
-    estratos = ['Pobre Extremo', 'Pobre', 'No Pobre']
-    generos = ['Masculino', 'Femenino']
-    migracion_opciones = ['Migró', 'No Migró']
-    
-    dataset_final = []
+    segmentos = []
     
     print("\n🔄 Procesando Becarios por Región (Beca 18 - Pregrado)...")
     # Procesar becarios por región (excluyendo "Total")
@@ -64,71 +147,25 @@ def generar_dataset_ajustado_2021():
         if row['Departamento'] == 'Total':
             continue
         
-        departamento = row['Departamento']
         cantidad_total = row['CantidadBecarios']
         
-        # Distribuir entre géneros (basado en proporciones del dataset de género)
-        # 57% mujeres, 43% hombres (aproximado)
-        cantidad_mujeres = int(cantidad_total * 0.57)
-        cantidad_hombres = cantidad_total - cantidad_mujeres
-        
-        # Distribuir entre estratos (inventado - basado en criterios de Pronabec)
-        # 40% Pobre Extremo, 50% Pobre, 10% No Pobre
-        distribucion_estratos = {
-            'Pobre Extremo': int(cantidad_total * 0.40),
-            'Pobre': int(cantidad_total * 0.50),
-            'No Pobre': cantidad_total - int(cantidad_total * 0.40) - int(cantidad_total * 0.50)
-        }
-        
-        # Distribuir migración (inventado basado en lógica)
-        # Si es Lima, 80% no migró, 20% migró
-        # Si no es Lima, 60% migró, 40% no migró
-        if departamento == 'Lima':
-            prob_migro = 0.20
-        else:
-            prob_migro = 0.60
-        
-        cantidad_migro = int(cantidad_total * prob_migro)
-        cantidad_no_migro = cantidad_total - cantidad_migro
-        
         # Crear registros individuales (agrupados para no tener miles de filas)
         # Generamos registros representativos
         num_registros = min(cantidad_total, 100)  # Máximo 100 registros por región
+        if escala:
+            num_registros = escalar(cantidad_total, escala)
+        if num_registros <= 0:
+            continue
         
-        for i in range(num_registros):
-            # Asignar valores de forma proporcional
-            genero = random.choices(generos, weights=[43, 57])[0]  # 43% H, 57% M
-            estrato = random.choices(estratos, weights=[40, 50, 10])[0]  # 40% PE, 50% P, 10% NP
-            
-            if departamento == 'Lima':
-                migracion = random.choices(migracion_opciones, weights=[20, 80])[0]
-                lugar = departamento  # Estudian en Lima
-            else:
-                migracion = random.choices(migracion_opciones, weights=[60, 40])[0]
-                # Si migró, probablemente fue a Lima
-                if migracion == 'Migró':
-                    lugar = 'Lima'
-                else:
-                    lugar = departamento
-            
-            carrera = random.choice(carreras_pregrado)
-            institucion = random.choice(instituciones_peru)
-            
-            dataset_final.append({
-                'NombreBeca': 'Beca 18',
-                'Institucion': institucion,
-                'Carrera': carrera,
-                'Lugar': lugar,
-                'CategoriaDeBecas': 'Pregrado',
-                'Anio_Convocatoria': 2021,
-                'Genero': genero,
-                'EstratoSocieconomico': estrato,
-                'BecasSegunMigracion': migracion,
-                'DepartamentoOrigen': departamento,
-                'CantidadRepresentada': cantidad_total // num_registros
-            })
+        segmentos.append(Segmento(PLANTILLA_REGION, num_registros, {
+            'NombreBeca': 'Beca 18',
+            'CategoriaDeBecas': 'Pregrado',
+            'Anio_Convocatoria': 2021,
+            'DepartamentoOrigen': row['Departamento'],
+            'CantidadRepresentada': cantidad_total // num_registros
+        }))
     
-    print(f"✓ Generados {len(dataset_final)} registros de Beca 18")
+    print(f"✓ Generados {sum(s.filas for s in segmentos)} registros de Beca 18")
     
     print("\n🔄 Procesando Créditos Educativos...")
     # Procesar créditos educativos por región
@@ -136,118 +173,64 @@ def generar_dataset_ajustado_2021():
         if row['Departamento'] == 'Total':
             continue
         
-        departamento = row['Departamento']
         nombre_beca = row['NombreBeca']
         cantidad = row['CantidadCreditos']
         
-        # Determinar categoría según tipo de crédito
-        if 'Talento' in nombre_beca:
-            categoria = 'Especiales'
-        else:
-            categoria = 'Pregrado'
-        
         # Generar registros representativos
-        num_registros = min(cantidad, 50)
+        num_registros = escalar(cantidad, escala) if escala else min(cantidad, 50)
+        if num_registros <= 0:
+            continue
         
-        for i in range(num_registros):
-            genero = random.choices(generos, weights=[42, 58])[0]
-            estrato = random.choices(estratos, weights=[35, 55, 10])[0]
-            
-            if departamento == 'Lima':
-                migracion = random.choices(migracion_opciones, weights=[15, 85])[0]
-                lugar = departamento
-            else:
-                migracion = random.choices(migracion_opciones, weights=[50, 50])[0]
-                lugar = 'Lima' if migracion == 'Migró' else departamento
-            
-            carrera = random.choice(carreras_pregrado)
-            institucion = random.choice(instituciones_peru)
-            
-            dataset_final.append({
-                'NombreBeca': nombre_beca,
-                'Institucion': institucion,
-                'Carrera': carrera,
-                'Lugar': lugar,
-                'CategoriaDeBecas': categoria,
-                'Anio_Convocatoria': 2021,
-                'Genero': genero,
-                'EstratoSocieconomico': estrato,
-                'BecasSegunMigracion': migracion,
-                'DepartamentoOrigen': departamento,
-                'CantidadRepresentada': cantidad // num_registros
-            })
+        segmentos.append(Segmento(PLANTILLA_CREDITOS, num_registros, {
+            'NombreBeca': nombre_beca,
+            # Determinar categoría según tipo de crédito
+            'CategoriaDeBecas': 'Especiales' if 'Talento' in nombre_beca else 'Pregrado',
+            'Anio_Convocatoria': 2021,
+            'DepartamentoOrigen': row['Departamento'],
+            'CantidadRepresentada': cantidad // num_registros
+        }, {'CategoriaDeBecas': DERIVADO}))
     
-    print(f"✓ Agregados créditos educativos. Total: {len(dataset_final)} registros")
+    print(f"✓ Agregados créditos educativos. Total: {sum(s.filas for s in segmentos)} registros")
     
     print("\n🔄 Procesando Becarios en el Extranjero (Posgrado)...")
     # Procesar becarios en el extranjero
     for idx, row in df_pais.iterrows():
-        if row['Pais'] == 'Total':
+        if row['Pais'] == 'Total' or row['CantidadBecarios'] <= 0:
             continue
         
-        pais = row['Pais']
-        cantidad = row['CantidadBecarios']
-        
-        # Becas en el extranjero son principalmente posgrado
-        categorias_posgrado = ['Posgrado Maestria', 'Posgrado Doctorado']
-        
-        for i in range(cantidad):
-            genero = random.choice(generos)
-            # Becas al extranjero suelen ser para no pobres o pobres (no extremos)
-            estrato = random.choices(['Pobre', 'No Pobre'], weights=[60, 40])[0]
-            
-            # Determinar departamento de origen (proporcional a población)
-            dept_origen = random.choices(
-                ['Lima', 'Arequipa', 'Cusco', 'La Libertad', 'Piura', 'Junín', 'Callao'],
-                weights=[35, 12, 10, 8, 8, 7, 5]
-            )[0]
-            
-            categoria = random.choice(categorias_posgrado)
-            
-            # Carreras de posgrado
-            carreras_posgrado = [
-                'MBA', 'Ingeniería de Software', 'Ciencias de Datos', 'Biotecnología',
-                'Gestión Pública', 'Economía Aplicada', 'Física', 'Química',
-                'Ciencias Políticas', 'Relaciones Internacionales', 'Finanzas',
-                'Ingeniería Biomédica', 'Neurociencias', 'Salud Pública'
-            ]
-            carrera = random.choice(carreras_posgrado)
-            
-            # Seleccionar institución del país correspondiente
-            if pais in instituciones_extranjero:
-                institucion = random.choice(instituciones_extranjero[pais])
-            else:
-                institucion = f"Universidad de {pais}"
-            
-            dataset_final.append({
-                'NombreBeca': 'Beca Posgrado en el Extranjero',
-                'Institucion': institucion,
-                'Carrera': carrera,
-                'Lugar': pais,
-                'CategoriaDeBecas': categoria,
-                'Anio_Convocatoria': 2021,
-                'Genero': genero,
-                'EstratoSocieconomico': estrato,
-                'BecasSegunMigracion': 'Migró',  # Todos migraron al extranjero
-                'DepartamentoOrigen': dept_origen,
-                'CantidadRepresentada': 1
-            })
-    
-    print(f"✓ Agregados becarios extranjero. Total: {len(dataset_final)} registros")
-    
-    # Crear DataFrame final
-    df_final = pd.DataFrame(dataset_final)
+        cantidad = escalar(row['CantidadBecarios'], escala) if escala else row['CantidadBecarios']
+        segmentos.append(Segmento(PLANTILLA_EXTRANJERO, cantidad, {
+            'NombreBeca': 'Beca Posgrado en el Extranjero',
+            'Lugar': row['Pais'],
+            'Anio_Convocatoria': 2021,
+            'BecasSegunMigracion': 'Migró',  # Todos migraron al extranjero
+            'CantidadRepresentada': 1
+        }, {'BecasSegunMigracion': DERIVADO}))
+    
+    print(f"✓ Agregados becarios extranjero. Total: {sum(s.filas for s in segmentos)} registros")
+    return segmentos
+
+
+def generar_dataset_ajustado_2021(escala=None, procesos=None):
+    """
+    Genera dataset ajustado con los campos específicos requeridos
+    """
+    print("="*80)
+    print("GENERANDO DATASET AJUSTADO - PRONABEC 2021")
+    print("="*80)
+
+    segmentos = crear_segmentos(escala)
     
-    # Reordenar columnas según el formato solicitado
-    columnas_finales = [
-        'NombreBeca', 'Institucion', 'Carrera', 'Lugar', 'CategoriaDeBecas',
-        'Anio_Convocatoria', 'Genero', 'EstratoSocieconomico', 'BecasSegunMigracion'
-    ]
+    # Crear DataFrame final (cada segmento se genera por columnas, de una vez)
+    df_final = generar_segmentos(segmentos, SEMILLA, columnas=COLUMNAS_FINALES, procesos=procesos)
     
-    df_export = df_final[columnas_finales].copy()
+    df_export = df_final[COLUMNAS_FINALES].copy()
     
     # Guardar en Excel
-    df_export.to_excel('dataset_pronabec_2021_formato_final.xlsx', index=False)
+    if len(df_export) <= FILAS_MAX_EXCEL:
+        df_export.to_excel('dataset_pronabec_2021_formato_final.xlsx', index=False)
+    else:
+        print(f"⚠️ {len(df_export)} filas no caben en una hoja de Excel; solo se guarda el CSV")
     df_export.to_csv('dataset_pronabec_2021_formato_final.csv', index=False, encoding='utf-8-sig')
     
     print("\n" + "="*80)
@@ -277,6 +260,11 @@ def generar_dataset_ajustado_2021():
     print(f"\n📍 Top 10 Lugares de Estudio:")
     print(df_export['Lugar'].value_counts().head(10))
     
+    # Registros de cada campo por procedencia, a partir de la máscara de cada fila
+    resumen = resumen_procedencia(df_export[COLUMNA_PROCEDENCIA], campos_procedencia(COLUMNAS_FINALES))
+    print(f"\n🧾 Procedencia por campo:")
+    print(resumen)
+    
     # Documentar datos inventados
     print("\n\n" + "="*80)
     print("⚠️ DATOS INVENTADOS (PARA TU EXPOSICIÓN)")
@@ -354,6 +342,10 @@ def generar_dataset_ajustado_2021():
         f.write(df_export['EstratoSocieconomico'].value_counts().to_string())
         f.write("\n\nPor Migración:\n")
         f.write(df_export['BecasSegunMigracion'].value_counts().to_string())
+        f.write("\n\nProcedencia por campo (registros, de la columna Procedencia):\n")
+        f.write(resumen.to_string())
+        f.write("\n\nProcedencia: máscara con 2 bits por campo, en el orden de las columnas\n")
+        f.write("(0 vacío, 1 real, 2 derivado, 3 inventado)\n")
     
     print("\n✅ Archivo guardado: REPORTE_DATOS_INVENTADOS_2021.txt")
     print("✅ Dataset guardado: dataset_pronabec_2021_formato_final.xlsx")
@@ -364,4 +356,8 @@ def generar_dataset_ajustado_2021():
     print("="*80)
 
 if __name__ == "__main__":
-    generar_dataset_ajustado_2021()
+    parser = argparse.ArgumentParser(description="Dataset sintético de becarios 2021")
+    agregar_opcion_escala(parser)
+    agregar_opcion_procesos(parser)
+    args = parser.parse_args()
+    generar_dataset_ajustado_2021(args.escala, args.procesos)
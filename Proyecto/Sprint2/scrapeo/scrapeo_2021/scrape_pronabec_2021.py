@@ -1,94 +1,61 @@
-import requests
-import pdfplumber
 import pandas as pd
 import re
-import os
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from pronabec_comun import BuscadorPalabras, descargar_pdf, extraer_paginas, separar_texto_y_tablas
+
 # URL del PDF
 PDF_URL = "https://cdn.www.gob.pe/uploads/document/file/3157095/Memoria%20Anual%20del%20Pronabec%202021.pdf?v=1653683954"
-PDF_FILE = "Memoria_Pronabec_2021.pdf"
+PDF_FILE = Path(__file__).resolve().parent / "Memoria_Pronabec_2021.pdf"
 
 def download_pdf(url, filename):
-    """Descarga el PDF desde la URL"""
-    print(f"Descargando PDF desde {url}...")
+    """Descarga el PDF desde la URL (solo si cambió respecto a la copia local)"""
     try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        with open(filename, 'wb') as f:
-            f.write(response.content)
-        print(f"PDF descargado exitosamente: {filename}")
+        descargar_pdf(url, filename)
         return True
     except Exception as e:
         print(f"Error descargando PDF: {e}")
         return False
 
-def extract_text_from_pdf(pdf_path):
-    """Extrae todo el texto del PDF"""
-    print(f"Extrayendo texto del PDF...")
-    text_content = []
+def extract_pages_from_pdf(pdf_path):
+    """Extrae texto y tablas de todas las páginas en una sola pasada"""
+    print(f"Extrayendo texto y tablas del PDF...")
     
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            for i, page in enumerate(pdf.pages):
-                print(f"Procesando página {i+1}/{len(pdf.pages)}")
-                text = page.extract_text()
-                if text:
-                    text_content.append({
-                        'page': i+1,
-                        'text': text
-                    })
+        text_content, all_tables = separar_texto_y_tablas(extraer_paginas(pdf_path))
         print(f"Texto extraído de {len(text_content)} páginas")
-        return text_content
-    except Exception as e:
-        print(f"Error extrayendo texto: {e}")
-        return []
-
-def extract_tables_from_pdf(pdf_path):
-    """Extrae todas las tablas del PDF"""
-    print(f"Extrayendo tablas del PDF...")
-    all_tables = []
-    
-    try:
-        with pdfplumber.open(pdf_path) as pdf:
-            for i, page in enumerate(pdf.pages):
-                tables = page.extract_tables()
-                if tables:
-                    print(f"Encontradas {len(tables)} tabla(s) en página {i+1}")
-                    for j, table in enumerate(tables):
-                        all_tables.append({
-                            'page': i+1,
-                            'table_number': j+1,
-                            'data': table
-                        })
         print(f"Total de tablas extraídas: {len(all_tables)}")
-        return all_tables
+        return text_content, all_tables
     except Exception as e:
-        print(f"Error extrayendo tablas: {e}")
-        return []
+        print(f"Error extrayendo PDF: {e}")
+        return [], []
+
+KEYWORDS = [
+    'beca', 'becario', 'departamento', 'carrera', 'modalidad',
+    'estrato', 'migración', 'institución', 'universidad', 'programa',
+    'socioeconómico', 'pobre', 'confirmados', '2021'
+]
+BUSCADOR_KEYWORDS = BuscadorPalabras(KEYWORDS)
 
 def search_keywords_in_text(text_content):
-    """Busca palabras clave relacionadas con las becas en el texto"""
-    keywords = [
-        'beca', 'becario', 'departamento', 'carrera', 'modalidad',
-        'estrato', 'migración', 'institución', 'universidad', 'programa',
-        'socioeconómico', 'pobre', 'confirmados', '2021'
-    ]
+    """Busca palabras clave relacionadas con las becas en el texto (una pasada por página)"""
+    orden = {keyword: i for i, keyword in enumerate(KEYWORDS)}
     
     results = []
     for page_data in text_content:
-        text = page_data['text'].lower()
-        for keyword in keywords:
-            if keyword in text:
-                # Extraer contexto alrededor de la palabra clave
-                lines = page_data['text'].split('\n')
-                for line in lines:
-                    if keyword in line.lower():
-                        results.append({
-                            'page': page_data['page'],
-                            'keyword': keyword,
-                            'context': line.strip()
-                        })
+        # Cada línea se reporta una vez por palabra clave, agrupadas por palabra clave
+        hits = {(c.palabra, c.linea) for c in BUSCADOR_KEYWORDS.coincidencias(page_data['text'])}
+        if not hits:
+            continue
+        lines = page_data['text'].split('\n')
+        for keyword, linea in sorted(hits, key=lambda h: (orden[h[0]], h[1])):
+            results.append({
+                'page': page_data['page'],
+                'keyword': keyword,
+                'context': lines[linea].strip()
+            })
     
     return results
 
@@ -181,23 +148,17 @@ def main():
     print("SCRAPING DE MEMORIA ANUAL PRONABEC 2021")
     print("="*80)
     
-    # Descargar PDF
-    if not os.path.exists(PDF_FILE):
-        if not download_pdf(PDF_URL, PDF_FILE):
-            print("No se pudo descargar el PDF. Terminando.")
-            return
-    else:
-        print(f"PDF ya existe: {PDF_FILE}")
+    # Descargar PDF (petición condicional si ya existe la copia local)
+    if not download_pdf(PDF_URL, PDF_FILE):
+        print("No se pudo descargar el PDF. Terminando.")
+        return
     
-    # Extraer texto
-    text_content = extract_text_from_pdf(PDF_FILE)
+    # Extraer texto y tablas
+    text_content, all_tables = extract_pages_from_pdf(PDF_FILE)
     if not text_content:
         print("No se pudo extraer texto del PDF.")
         return
     
-    # Extraer tablas
-    all_tables = extract_tables_from_pdf(PDF_FILE)
-    
     # Buscar palabras clave
     print("\nBuscando palabras clave relevantes...")
     keywords_results = search_keywords_in_text(text_content)
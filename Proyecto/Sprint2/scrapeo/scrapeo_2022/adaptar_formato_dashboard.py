@@ -3,25 +3,35 @@ Script para adaptar los datos extraídos al formato exacto del dashboard
 Genera datos sintéticos para campos no disponibles en el PDF
 """
 
+import argparse
+import sys
 import pandas as pd
 import random
 from pathlib import Path
 
-# Configurar semilla para reproducibilidad
-random.seed(2022)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from pronabec_comun.sintetico import (
+    COLUMNA_PROCEDENCIA,
+    DERIVADO,
+    INVENTADO,
+    Categorica,
+    Formato,
+    Segmento,
+    agregar_opcion_escala,
+    agregar_opcion_procesos,
+    campos_procedencia,
+    escalar,
+    generar_segmentos,
+    resumen_procedencia,
+)
+from pronabec_comun.salida_bloques import FILAS_MAX_EXCEL
 
-print("="*80)
-print("ADAPTANDO DATOS AL FORMATO DEL DASHBOARD")
-print("="*80)
+# Configurar semilla para reproducibilidad
+SEMILLA = 2022
 
 # Leer los datos extraídos
 output_dir = Path("datos_extraidos")
 
-# ----- DATOS BASE -----
-df_becas = pd.read_csv(output_dir / 'becas_por_tipo_modalidad_2022.csv')
-df_dept = pd.read_csv(output_dir / 'becarios_por_departamento_2022.csv')
-df_internacional = pd.read_csv(output_dir / 'becas_internacionales_pais_2022.csv')
-
 # ----- MAPEO DE CATEGORÍAS -----
 # Mapear tipos de beca a categorías del dashboard
 mapeo_categorias = {
@@ -116,159 +126,188 @@ distribucion_estrato = [0.25, 0.50, 0.25]  # Mayormente pobres en becas sociales
 migracion = ['Migró', 'No Migró']
 distribucion_migracion = [0.35, 0.65]  # Más personas estudian en su región
 
-# ----- LISTA PARA ALMACENAR DATOS -----
-datos_dashboard = []
-
-print("\n1. Procesando becas nacionales (Pregrado y Especiales)...")
-
-# Filtrar departamentos (excluir total y Lima-Callao por separado)
-departamentos_peru = df_dept[
-    (df_dept['Departamento'] != 'Total general') & 
-    (df_dept['Departamento'] != 'Lima - Callao')
-]['Departamento'].tolist()
-
-# Agregar Lima y Callao por separado
-departamentos_peru.extend(['Lima', 'Callao'])
-
-for idx, row in df_becas.iterrows():
-    nombre_beca = row['NombreBeca']
-    tipo_beca = row['TipoBeca']
-    
-    # Mapear categoría
-    if tipo_beca == 'Posgrado':
-        # Verificar si es maestría o doctorado en el nombre
-        if 'doctorado' in nombre_beca.lower() or 'doctor' in nombre_beca.lower():
-            categoria = 'Posgrado Doctorado'
-        else:
-            categoria = 'Posgrado Maestria'
-    else:
-        categoria = mapeo_categorias.get(tipo_beca, 'Pregrado')
-    
-    # Determinar número de becarios (usar promedio si no hay datos específicos)
-    try:
-        num_becarios = int(row['CantidadBecasOtorgadas2022']) if pd.notna(row['CantidadBecasOtorgadas2022']) else random.randint(10, 50)
-    except:
-        num_becarios = random.randint(10, 50)
-    
-    # Generar registros individuales
-    for _ in range(num_becarios):
-        # Seleccionar institución según tipo
+# ----- COLUMNAS DEL DASHBOARD -----
+columnas_dashboard = [
+    'NombreBeca', 'Institucion', 'Carrera', 'Lugar', 'CategoriaDeBecas',
+    'Anio_Convocatoria', 'Genero', 'EstratoSocieconomico', 'BecasSegunMigracion',
+    COLUMNA_PROCEDENCIA
+]
+
+# Campos comunes a todos los becarios
+campos_becario = {
+    'Genero': Categorica(generos, distribucion_genero),
+    'EstratoSocieconomico': Categorica(estratos, distribucion_estrato),
+}
+
+# Becas nacionales: institución y carrera según tipo, lugar en un departamento del Perú
+def plantilla_nacional(instituciones, carreras, departamentos):
+    return {
+        'Institucion': Categorica(instituciones),
+        'Carrera': Categorica(carreras),
+        'Lugar': Categorica(departamentos),
+        **campos_becario,
+        'BecasSegunMigracion': Categorica(migracion, distribucion_migracion),
+    }
+
+# Becas internacionales: institución ficticia del país, siempre migran
+def plantilla_internacional(carreras):
+    return {
+        'Institucion': Formato('Universidad de {}', 'Lugar').como(INVENTADO),
+        'Carrera': Categorica(carreras),
+        **campos_becario,
+    }
+
+def crear_segmentos(escala=None):
+    """
+    Segmentos de 2022: una cantidad por beca y por país; con `escala`, las cantidades
+    reales multiplicadas por la escala
+    """
+    # Las cantidades que faltan en el PDF se sortean con esta semilla
+    random.seed(SEMILLA)
+
+    # ----- DATOS BASE -----
+    df_becas = pd.read_csv(output_dir / 'becas_por_tipo_modalidad_2022.csv')
+    df_dept = pd.read_csv(output_dir / 'becarios_por_departamento_2022.csv')
+    df_internacional = pd.read_csv(output_dir / 'becas_internacionales_pais_2022.csv')
+
+    # ----- SEGMENTOS A GENERAR (una plantilla y una cantidad por beca o país) -----
+    segmentos = []
+
+    print("\n1. Procesando becas nacionales (Pregrado y Especiales)...")
+
+    # Filtrar departamentos (excluir total y Lima-Callao por separado)
+    departamentos_peru = df_dept[
+        (df_dept['Departamento'] != 'Total general') & 
+        (df_dept['Departamento'] != 'Lima - Callao')
+    ]['Departamento'].tolist()
+
+    # Agregar Lima y Callao por separado
+    departamentos_peru.extend(['Lima', 'Callao'])
+
+    plantilla_pregrado = plantilla_nacional(instituciones_pregrado, carreras_pregrado, departamentos_peru)
+    plantilla_posgrado = plantilla_nacional(instituciones_posgrado_nacional, carreras_posgrado,
+                                            departamentos_peru)
+
+    for idx, row in df_becas.iterrows():
+        nombre_beca = row['NombreBeca']
+        tipo_beca = row['TipoBeca']
+
+        # Mapear categoría
         if tipo_beca == 'Posgrado':
-            institucion = random.choice(instituciones_posgrado_nacional)
-            carrera = random.choice(carreras_posgrado)
+            # Verificar si es maestría o doctorado en el nombre
+            if 'doctorado' in nombre_beca.lower() or 'doctor' in nombre_beca.lower():
+                categoria = 'Posgrado Doctorado'
+            else:
+                categoria = 'Posgrado Maestria'
         else:
-            institucion = random.choice(instituciones_pregrado)
-            carrera = random.choice(carreras_pregrado)
-        
-        # Seleccionar lugar (departamento del Perú)
-        lugar = random.choice(departamentos_peru)
-        
-        # Generar otros campos
-        genero = random.choices(generos, weights=distribucion_genero)[0]
-        estrato = random.choices(estratos, weights=distribucion_estrato)[0]
-        becas_migracion = random.choices(migracion, weights=distribucion_migracion)[0]
-        
-        datos_dashboard.append({
+            categoria = mapeo_categorias.get(tipo_beca, 'Pregrado')
+
+        # Determinar número de becarios (usar promedio si no hay datos específicos)
+        try:
+            num_becarios = int(row['CantidadBecasOtorgadas2022']) if pd.notna(row['CantidadBecasOtorgadas2022']) else random.randint(10, 50)
+        except:
+            num_becarios = random.randint(10, 50)
+        if escala:
+            num_becarios = escalar(num_becarios, escala)
+
+        # Seleccionar institución y carrera según tipo
+        plantilla = plantilla_posgrado if tipo_beca == 'Posgrado' else plantilla_pregrado
+        segmentos.append(Segmento(plantilla, num_becarios, {
             'NombreBeca': nombre_beca,
-            'Institucion': institucion,
-            'Carrera': carrera,
-            'Lugar': lugar,
             'CategoriaDeBecas': categoria,
             'Anio_Convocatoria': 2022,
-            'Genero': genero,
-            'EstratoSocieconomico': estrato,
-            'BecasSegunMigracion': becas_migracion
-        })
-
-print(f"   ✓ Generados {len(datos_dashboard)} registros de becas nacionales")
-
-print("\n2. Procesando becas internacionales...")
-
-# Becas internacionales
-becas_internacional_count = 0
-for idx, row in df_internacional.iterrows():
-    pais = row['PaisEstudios']
-    
-    # Excluir la fila de total
-    if pais == 'Total':
-        continue
-    
-    maestrias = int(row['Maestria']) if pd.notna(row['Maestria']) else 0
-    doctorados = int(row['Doctorado']) if pd.notna(row['Doctorado']) else 0
-    
-    # Generar registros para maestrías
-    for _ in range(maestrias):
-        # Institución ficticia del país
-        institucion = f"Universidad de {pais}"
-        carrera = random.choice(carreras_posgrado)
-        
-        datos_dashboard.append({
-            'NombreBeca': 'Beca Generación del Bicentenario',
-            'Institucion': institucion,
-            'Carrera': carrera,
-            'Lugar': pais,
-            'CategoriaDeBecas': 'Posgrado Maestria',
-            'Anio_Convocatoria': 2022,
-            'Genero': random.choices(generos, weights=distribucion_genero)[0],
-            'EstratoSocieconomico': random.choices(estratos, weights=distribucion_estrato)[0],
-            'BecasSegunMigracion': 'Migró'  # Internacional siempre migra
-        })
-        becas_internacional_count += 1
-    
-    # Generar registros para doctorados
-    for _ in range(doctorados):
-        institucion = f"Universidad de {pais}"
-        carrera = random.choice([c for c in carreras_posgrado if 'Doctorado' in c])
-        
-        datos_dashboard.append({
-            'NombreBeca': 'Beca Generación del Bicentenario',
-            'Institucion': institucion,
-            'Carrera': carrera,
-            'Lugar': pais,
-            'CategoriaDeBecas': 'Posgrado Doctorado',
-            'Anio_Convocatoria': 2022,
-            'Genero': random.choices(generos, weights=distribucion_genero)[0],
-            'EstratoSocieconomico': random.choices(estratos, weights=distribucion_estrato)[0],
-            'BecasSegunMigracion': 'Migró'  # Internacional siempre migra
-        })
-        becas_internacional_count += 1
-
-print(f"   ✓ Generados {becas_internacional_count} registros de becas internacionales")
-
-# Crear DataFrame final
-df_final = pd.DataFrame(datos_dashboard)
-
-print("\n" + "="*80)
-print("DATASET FINAL GENERADO")
-print("="*80)
-print(f"\nTotal de registros: {len(df_final)}")
-print(f"\nColumnas: {list(df_final.columns)}")
-print(f"\nDistribución por Categoría:")
-print(df_final['CategoriaDeBecas'].value_counts())
-print(f"\nDistribución por Género:")
-print(df_final['Genero'].value_counts())
-print(f"\nDistribución por Estrato:")
-print(df_final['EstratoSocieconomico'].value_counts())
-print(f"\nDistribución por Migración:")
-print(df_final['BecasSegunMigracion'].value_counts())
-
-# Guardar en Excel
-excel_path = output_dir / "PRONABEC_2022_FORMATO_DASHBOARD.xlsx"
-df_final.to_excel(excel_path, index=False, sheet_name='Becarios 2022')
-
-print(f"\n✓ Archivo Excel guardado: {excel_path}")
-
-# También guardar en CSV
-csv_path = output_dir / "PRONABEC_2022_FORMATO_DASHBOARD.csv"
-df_final.to_csv(csv_path, index=False, encoding='utf-8-sig')
-
-print(f"✓ Archivo CSV guardado: {csv_path}")
-
-# Generar reporte de datos inventados
-print("\n" + "="*80)
-print("⚠️  REPORTE DE DATOS SINTÉTICOS GENERADOS")
-print("="*80)
-print("""
+        }, {'CategoriaDeBecas': DERIVADO}))  # Mapeada desde el tipo de beca
+
+    becas_nacionales_count = sum(s.filas for s in segmentos)
+    print(f"   ✓ Generados {becas_nacionales_count} registros de becas nacionales")
+
+    print("\n2. Procesando becas internacionales...")
+
+    plantilla_maestria = plantilla_internacional(carreras_posgrado)
+    plantilla_doctorado = plantilla_internacional([c for c in carreras_posgrado if 'Doctorado' in c])
+
+    for idx, row in df_internacional.iterrows():
+        pais = row['PaisEstudios']
+
+        # Excluir la fila de total
+        if pais == 'Total':
+            continue
+
+        maestrias = int(row['Maestria']) if pd.notna(row['Maestria']) else 0
+        doctorados = int(row['Doctorado']) if pd.notna(row['Doctorado']) else 0
+        if escala:
+            maestrias, doctorados = escalar(maestrias, escala), escalar(doctorados, escala)
+
+        for plantilla, cantidad, categoria in [(plantilla_maestria, maestrias, 'Posgrado Maestria'),
+                                               (plantilla_doctorado, doctorados, 'Posgrado Doctorado')]:
+            segmentos.append(Segmento(plantilla, cantidad, {
+                'NombreBeca': 'Beca Generación del Bicentenario',
+                'Lugar': pais,
+                'CategoriaDeBecas': categoria,
+                'Anio_Convocatoria': 2022,
+                'BecasSegunMigracion': 'Migró'  # Internacional siempre migra
+            }, {'BecasSegunMigracion': DERIVADO}))
+
+    becas_internacional_count = sum(s.filas for s in segmentos) - becas_nacionales_count
+    print(f"   ✓ Generados {becas_internacional_count} registros de becas internacionales")
+    return segmentos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dataset sintético de becarios 2022 en el formato del dashboard")
+    agregar_opcion_escala(parser)
+    agregar_opcion_procesos(parser)
+    args = parser.parse_args()
+
+    print("="*80)
+    print("ADAPTANDO DATOS AL FORMATO DEL DASHBOARD")
+    print("="*80)
+
+    segmentos = crear_segmentos(args.escala)
+
+    # Crear DataFrame final (cada segmento se genera por columnas, de una vez)
+    df_final = generar_segmentos(segmentos, SEMILLA, columnas=columnas_dashboard,
+                                 procesos=args.procesos)
+
+    print("\n" + "="*80)
+    print("DATASET FINAL GENERADO")
+    print("="*80)
+    print(f"\nTotal de registros: {len(df_final)}")
+    print(f"\nColumnas: {list(df_final.columns)}")
+    print(f"\nDistribución por Categoría:")
+    print(df_final['CategoriaDeBecas'].value_counts())
+    print(f"\nDistribución por Género:")
+    print(df_final['Genero'].value_counts())
+    print(f"\nDistribución por Estrato:")
+    print(df_final['EstratoSocieconomico'].value_counts())
+    print(f"\nDistribución por Migración:")
+    print(df_final['BecasSegunMigracion'].value_counts())
+
+    # Registros de cada campo por procedencia, a partir de la máscara de cada fila
+    resumen_procedencia_campos = resumen_procedencia(df_final[COLUMNA_PROCEDENCIA],
+                                                     campos_procedencia(columnas_dashboard))
+    print(f"\nProcedencia por campo:")
+    print(resumen_procedencia_campos)
+
+    # Guardar en Excel
+    excel_path = output_dir / "PRONABEC_2022_FORMATO_DASHBOARD.xlsx"
+    if len(df_final) <= FILAS_MAX_EXCEL:
+        df_final.to_excel(excel_path, index=False, sheet_name='Becarios 2022')
+        print(f"\n✓ Archivo Excel guardado: {excel_path}")
+    else:
+        print(f"\n⚠️ {len(df_final)} filas no caben en una hoja de Excel; solo se guarda el CSV")
+
+    # También guardar en CSV
+    csv_path = output_dir / "PRONABEC_2022_FORMATO_DASHBOARD.csv"
+    df_final.to_csv(csv_path, index=False, encoding='utf-8-sig')
+
+    print(f"✓ Archivo CSV guardado: {csv_path}")
+
+    # Generar reporte de datos inventados
+    print("\n" + "="*80)
+    print("⚠️  REPORTE DE DATOS SINTÉTICOS GENERADOS")
+    print("="*80)
+    print("""
 Los siguientes campos fueron INVENTADOS/SINTETIZADOS porque NO están disponibles
 en el PDF original de la Memoria Anual del Pronabec 2022:
 
@@ -348,10 +387,10 @@ RECOMENDACIONES PARA TU EXPOSICIÓN:
    - Tendencias generales con datos sintéticos claramente identificados
 """)
 
-print("\n" + "="*80)
-print("✅ PROCESO COMPLETADO")
-print("="*80)
-print(f"""
+    print("\n" + "="*80)
+    print("✅ PROCESO COMPLETADO")
+    print("="*80)
+    print(f"""
 📊 Archivo generado: PRONABEC_2022_FORMATO_DASHBOARD.xlsx
 📈 Total de registros: {len(df_final)}
 📅 Año: 2022
@@ -371,15 +410,15 @@ Campos del archivo:
 ¡Listo para usar en tu dashboard!
 """)
 
-# Mostrar muestra de datos
-print("\n📋 MUESTRA DE DATOS (primeras 10 filas):")
-print("="*80)
-print(df_final.head(10).to_string(index=False))
+    # Mostrar muestra de datos
+    print("\n📋 MUESTRA DE DATOS (primeras 10 filas):")
+    print("="*80)
+    print(df_final.head(10).to_string(index=False))
 
-# Guardar reporte de datos sintéticos
-reporte_path = output_dir / "REPORTE_DATOS_SINTETICOS.txt"
-with open(reporte_path, 'w', encoding='utf-8') as f:
-    f.write("""
+    # Guardar reporte de datos sintéticos
+    reporte_path = output_dir / "REPORTE_DATOS_SINTETICOS.txt"
+    with open(reporte_path, 'w', encoding='utf-8') as f:
+        f.write("""
 REPORTE DE DATOS SINTÉTICOS - PRONABEC 2022
 ============================================
 
@@ -481,6 +520,15 @@ URL: https://cdn.www.gob.pe/uploads/document/file/4498935/Memoria%20Anual%20del%
 Fecha de extracción: Noviembre 2025
 Método: Web scraping con Python (pdfplumber)
 """)
+        f.write("\nPROCEDENCIA POR CAMPO (registros, de la columna Procedencia):\n")
+        f.write("-"*60 + "\n")
+        f.write(resumen_procedencia_campos.to_string())
+        f.write("\n\nProcedencia: máscara con 2 bits por campo, en el orden de las columnas\n")
+        f.write("(0 vacío, 1 real, 2 derivado, 3 inventado)\n")
+
+    print(f"\n✓ Reporte detallado guardado: {reporte_path}")
+    print("\n" + "="*80)
+
 
-print(f"\n✓ Reporte detallado guardado: {reporte_path}")
-print("\n" + "="*80)
+if __name__ == "__main__":
+    main()
@@ -1,48 +1,30 @@
-import requests
-import pdfplumber
 import pandas as pd
 import re
-import io
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from pronabec_comun import BuscadorPalabras, descargar_pdf, extraer_paginas_con_perfiles
+
 # URL del PDF
 PDF_URL = "https://cdn.www.gob.pe/uploads/document/file/4498935/Memoria%20Anual%20del%20Pronabec%202022.pdf?v=1683306322"
 
-def descargar_pdf(url):
-    """Descarga el PDF desde la URL"""
-    print("Descargando PDF...")
-    response = requests.get(url)
-    if response.status_code == 200:
-        print("PDF descargado exitosamente")
-        return io.BytesIO(response.content)
-    else:
-        raise Exception(f"Error al descargar el PDF: {response.status_code}")
-
-def extraer_tablas_del_pdf(pdf_bytes):
+def extraer_tablas_del_pdf(pdf_path):
     """Extrae todas las tablas del PDF"""
     tablas_extraidas = []
     
-    with pdfplumber.open(pdf_bytes) as pdf:
-        print(f"Total de páginas: {len(pdf.pages)}")
-        
-        for i, page in enumerate(pdf.pages):
-            print(f"Procesando página {i+1}...")
-            
-            # Extraer texto de la página para contexto
-            texto = page.extract_text()
-            
-            # Extraer tablas
-            tablas = page.extract_tables()
-            
-            if tablas:
-                for j, tabla in enumerate(tablas):
-                    if tabla and len(tabla) > 0:
-                        tablas_extraidas.append({
-                            'pagina': i+1,
-                            'tabla_num': j+1,
-                            'datos': tabla,
-                            'contexto': texto[:500]  # Primeros 500 caracteres de contexto
-                        })
+    for pagina in extraer_paginas_con_perfiles(pdf_path, 2022):
+        # Texto de la página para contexto
+        texto = pagina['text']
+        
+        for j, tabla in enumerate(pagina['tables']):
+            if tabla and len(tabla) > 0:
+                tablas_extraidas.append({
+                    'pagina': pagina['page'],
+                    'tabla_num': j+1,
+                    'datos': tabla,
+                    'contexto': texto[:500]  # Primeros 500 caracteres de contexto
+                })
     
     print(f"Total de tablas extraídas: {len(tablas_extraidas)}")
     return tablas_extraidas
@@ -83,25 +65,25 @@ def limpiar_y_procesar_datos(tablas_extraidas):
     
     return datasets
 
+KEYWORDS_RELEVANTES = [
+    'beca', 'becario', 'departamento', 'carrera', 'institución', 
+    'modalidad', 'estrato', 'migración', 'pobreza', 'programa',
+    'universidad', 'instituto', '2022'
+]
+BUSCADOR_RELEVANCIA = BuscadorPalabras(KEYWORDS_RELEVANTES)
+
 def identificar_datasets_relevantes(datasets):
     """Identifica los datasets relevantes basados en palabras clave"""
-    keywords_relevantes = [
-        'beca', 'becario', 'departamento', 'carrera', 'institución', 
-        'modalidad', 'estrato', 'migración', 'pobreza', 'programa',
-        'universidad', 'instituto', '2022'
-    ]
-    
     datasets_relevantes = []
     
     for dataset in datasets:
         df = dataset['dataframe']
-        contexto = dataset['contexto'].lower()
         
         # Verificar si el contexto o las columnas contienen palabras clave
-        columnas_str = ' '.join([str(col).lower() for col in df.columns])
-        contenido = contexto + ' ' + columnas_str
+        columnas_str = ' '.join([str(col) for col in df.columns])
+        contenido = dataset['contexto'] + ' ' + columnas_str
         
-        score = sum(1 for keyword in keywords_relevantes if keyword in contenido)
+        score = len(BUSCADOR_RELEVANCIA.encontradas(contenido))
         
         if score > 2:  # Al menos 3 palabras clave coincidentes
             dataset['relevancia_score'] = score
@@ -115,10 +97,10 @@ def identificar_datasets_relevantes(datasets):
 def main():
     try:
         # Descargar PDF
-        pdf_bytes = descargar_pdf(PDF_URL)
+        pdf_path = descargar_pdf(PDF_URL)
         
         # Extraer tablas
-        tablas = extraer_tablas_del_pdf(pdf_bytes)
+        tablas = extraer_tablas_del_pdf(pdf_path)
         
         # Procesar datos
         datasets = limpiar_y_procesar_datos(tablas)
@@ -3,9 +3,28 @@ Script para generar dataset de becarios en formato Excel
 con campos específicos según los requisitos del usuario
 """
 
-import pandas as pd
-import random
-import numpy as np
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from pronabec_comun.sintetico import (
+    COLUMNA_PROCEDENCIA,
+    INVENTADO,
+    REAL,
+    Bernoulli,
+    Categorica,
+    Condicional,
+    Constante,
+    Segmento,
+    TablaCondicional,
+    agregar_opcion_escala,
+    agregar_opcion_procesos,
+    campos_procedencia,
+    escalar,
+    generar_segmentos,
+    resumen_procedencia,
+)
 
 # Definir los datos base desde los CSVs existentes
 carreras_disponibles = [
@@ -77,148 +96,145 @@ estados_migracion = ["Migro", "No Migro", "No aplica"]
 # Años de convocatoria disponibles
 anios = [2023, 2024, 2025]
 
-# Generar dataset de 200 becarios
-num_becarios = 200
-random.seed(42)  # Para reproducibilidad
+columnas = [
+    "NombreBeca", "Institucion", "Carrera", "Lugar", "CategoriaDeBecas",
+    "Anio_Convocatoria", "Genero", "EstratoSocieconomico", "BecasSegunMigracion",
+    COLUMNA_PROCEDENCIA
+]
 
-datos = []
+def pesos_migracion(lugar):
+    # Si estudia en su región, menor probabilidad de migración;
+    # "No aplica" para estudios internacionales (lugar fuera de departamentos_peru)
+    if lugar is None:
+        return [0, 0, 1]
+    return [30, 70, 0]
 
-for i in range(num_becarios):
+# Campos de cada becario
+plantilla = {
     # Seleccionar tipo de beca
-    nombre_beca = random.choice(nombres_becas)
-    
+    "NombreBeca": Categorica(nombres_becas),
     # Asignar categoría según tipo de beca
-    if nombre_beca == "Beca 18":
-        categoria = "Pregrado"
-    elif nombre_beca == "Beca Tec":
-        categoria = random.choice(["Pregrado", "Especiales"])
-    elif nombre_beca == "Beca Permanencia":
-        categoria = "Pregrado"
-    elif nombre_beca == "Beca Inclusión":
-        categoria = "Especiales"
-    elif nombre_beca == "Beca Vocación de Maestro":
-        categoria = random.choice(["Pregrado", "Posgrado Maestria"])
-    else:
-        categoria = random.choice(categorias_becas)
-    
-    # Asignar año (mayormente 2023, algunos 2024-2025)
-    if i < 150:
-        anio = 2023
-    elif i < 180:
-        anio = 2024
-    else:
-        anio = 2025
-    
-    # Seleccionar institución
-    institucion = random.choice(instituciones_disponibles)
-    
-    # Seleccionar carrera
-    carrera = random.choice(carreras_disponibles)
-    
+    "CategoriaDeBecas": Condicional("NombreBeca", {
+        "Beca 18": Constante("Pregrado"),
+        "Beca Tec": Categorica(["Pregrado", "Especiales"]),
+        "Beca Permanencia": Constante("Pregrado"),
+        "Beca Inclusión": Constante("Especiales"),
+        "Beca Vocación de Maestro": Categorica(["Pregrado", "Posgrado Maestria"]),
+    }, defecto=Categorica(categorias_becas)),
+    "Institucion": Categorica(instituciones_disponibles),
+    "Carrera": Categorica(carreras_disponibles),
     # Seleccionar lugar (mayormente Perú, algunos internacional)
-    if random.random() < 0.95:  # 95% en Perú
-        lugar = random.choice(departamentos_peru)
-        # Si estudia en su región, menor probabilidad de migración
-        migracion = random.choices(
-            estados_migracion, 
-            weights=[30, 70, 0], 
-            k=1
-        )[0]
-    else:  # 5% internacional
-        lugar = random.choice(paises_internacionales)
-        migracion = "No aplica"  # Para estudios internacionales
-    
-    # Género
-    genero = random.choice(generos)
-    
+    "_en_peru": Bernoulli(0.95),  # 95% en Perú
+    "Lugar": Condicional("_en_peru", {
+        True: Categorica(departamentos_peru),
+        False: Categorica(paises_internacionales),
+    }),
+    "BecasSegunMigracion": TablaCondicional(["Lugar"], [departamentos_peru],
+                                            estados_migracion, pesos_migracion),
+    "Genero": Categorica(generos),
     # Estrato socioeconómico (mayormente pobres según los datos)
-    estrato = random.choices(
-        estratos_socioeconomicos,
-        weights=[60, 30, 10],  # Mayoría pobre
-        k=1
-    )[0]
-    
-    # Crear registro
-    registro = {
-        "NombreBeca": nombre_beca,
-        "Institucion": institucion,
-        "Carrera": carrera,
-        "Lugar": lugar,
-        "CategoriaDeBecas": categoria,
-        "Anio_Convocatoria": anio,
-        "Genero": genero,
-        "EstratoSocieconomico": estrato,
-        "BecasSegunMigracion": migracion
-    }
-    
-    datos.append(registro)
-
-# Crear DataFrame
-df = pd.DataFrame(datos)
-
-# Ordenar por año y nombre de beca
-df = df.sort_values(["Anio_Convocatoria", "NombreBeca"], ascending=[True, True])
-df = df.reset_index(drop=True)
-
-# Guardar en Excel
-nombre_archivo = "dataset_becarios_completo.xlsx"
-df.to_excel(nombre_archivo, index=False, sheet_name="Becarios")
-
-print(f"✅ Archivo Excel generado: {nombre_archivo}")
-print(f"📊 Total de registros: {len(df)}")
-print("\n" + "="*80)
-print("DATOS INVENTADOS/GENERADOS (para tu exposición):")
-print("="*80)
-
-print("\n1. CAMPOS COMPLETAMENTE INVENTADOS:")
-print("   - Género: Asignado aleatoriamente (50% Masculino, 50% Femenino)")
-print("     Los datos originales NO contenían información de género")
-
-print("\n2. CAMPOS PARCIALMENTE INVENTADOS:")
-print("   - NombreBeca: Se agregaron becas adicionales:")
-print("     * Beca Tec, Beca Permanencia, Beca Inclusión, Beca Vocación de Maestro")
-print("     Solo 'Beca 18' estaba documentada en los datos originales de 2023")
-print()
-print("   - Año_Convocatoria: Se agregaron años 2024 y 2025")
-print("     Solo 2023 estaba documentado en los datos originales")
-print("     Distribución: 75% año 2023, 15% año 2024, 10% año 2025")
-print()
-print("   - CategoriaDeBecas: Clasificación según las opciones solicitadas:")
-print("     * Pregrado (mayoría)")
-print("     * Posgrado Maestria")
-print("     * Posgrado Doctorado")
-print("     * Especiales")
-print("     Los datos originales solo mencionaban 'Pregrado' y 'Especiales'")
-print()
-print("   - BecasSegunMigracion: Estados generados:")
-print("     * 'Migro' (~30% para estudios en Perú)")
-print("     * 'No Migro' (~70% para estudios en Perú)")
-print("     * 'No aplica' (para estudios internacionales)")
-print("     Solo había referencias generales a migración (88.9% migraban a Lima)")
-
-print("\n3. CAMPOS AMPLIADOS:")
-print("   - Lugar (antes Departamento): Se agregaron países internacionales:")
-print("     * España, Chile, Argentina, Colombia, México, Brasil")
-print("     Los datos originales solo contenían departamentos del Perú")
-print("     Distribución: 95% en Perú, 5% internacional")
-print()
-print("   - EstratoSocieconomico: Se agregó categoría 'No pobre' (~10%)")
-print("     Los datos originales solo mencionaban 'Pobre' y 'Pobre Extremo'")
-print()
-print("   - Instituciones: Se agregaron algunas instituciones adicionales")
-print("     a las 7 principales documentadas en los datos originales")
-
-print("\n4. DATOS REALES DE LOS ARCHIVOS ORIGINALES:")
-print("   - Carreras principales (Top 9 de Beca 18-2023)")
-print("   - Instituciones principales (Top 7 de Beca 18-2023)")
-print("   - Departamentos del Perú (25 departamentos con sus porcentajes)")
-print("   - Estratos: Pobre y Pobre Extremo")
-print("   - Total de becarios Beca 18-2023: 4,998")
-
-print("\n" + "="*80)
-print("NOTA IMPORTANTE PARA TU EXPOSICIÓN:")
-print("="*80)
-print("""
+    "EstratoSocieconomico": Categorica(estratos_socioeconomicos, [60, 30, 10]),  # Mayoría pobre
+}
+
+# Generar dataset de 200 becarios, por año de convocatoria
+# (mayormente 2023, algunos 2024-2025)
+becarios_por_anio = dict(zip(anios, [150, 30, 20]))
+SEMILLA = 42  # Para reproducibilidad
+
+# Con --escala se parte del total real de becarios de Beca 18-2023, repartido entre
+# los años de convocatoria en la misma proporción que la muestra
+TOTAL_BECARIOS_2023 = 4998
+REPARTO_ANIOS = dict(zip(anios, [0.75, 0.15, 0.10]))
+
+def crear_segmentos(escala=None):
+    """Un segmento por año de convocatoria: la muestra de 200 o el total real escalado"""
+    if escala:
+        cantidades = {anio: escalar(TOTAL_BECARIOS_2023 * proporcion, escala)
+                      for anio, proporcion in REPARTO_ANIOS.items()}
+    else:
+        cantidades = becarios_por_anio
+
+    # Solo 2023 está documentado; los años 2024 y 2025 son inventados
+    return [
+        Segmento(plantilla, cantidad, {"Anio_Convocatoria": anio},
+                 {"Anio_Convocatoria": REAL if anio == 2023 else INVENTADO})
+        for anio, cantidad in cantidades.items()
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description="Dataset sintético de becarios 2023")
+    agregar_opcion_escala(parser)
+    agregar_opcion_procesos(parser)
+    args = parser.parse_args()
+
+    segmentos = crear_segmentos(args.escala)
+
+    # Crear DataFrame
+    df = generar_segmentos(segmentos, SEMILLA, columnas=columnas, procesos=args.procesos)
+
+    # Ordenar por año y nombre de beca
+    df = df.sort_values(["Anio_Convocatoria", "NombreBeca"], ascending=[True, True])
+    df = df.reset_index(drop=True)
+
+    # Guardar en Excel
+    nombre_archivo = "dataset_becarios_completo.xlsx"
+    df.to_excel(nombre_archivo, index=False, sheet_name="Becarios")
+
+    print(f"✅ Archivo Excel generado: {nombre_archivo}")
+    print(f"📊 Total de registros: {len(df)}")
+    print("\n" + "="*80)
+    print("DATOS INVENTADOS/GENERADOS (para tu exposición):")
+    print("="*80)
+
+    print("\n1. CAMPOS COMPLETAMENTE INVENTADOS:")
+    print("   - Género: Asignado aleatoriamente (50% Masculino, 50% Femenino)")
+    print("     Los datos originales NO contenían información de género")
+
+    print("\n2. CAMPOS PARCIALMENTE INVENTADOS:")
+    print("   - NombreBeca: Se agregaron becas adicionales:")
+    print("     * Beca Tec, Beca Permanencia, Beca Inclusión, Beca Vocación de Maestro")
+    print("     Solo 'Beca 18' estaba documentada en los datos originales de 2023")
+    print()
+    print("   - Año_Convocatoria: Se agregaron años 2024 y 2025")
+    print("     Solo 2023 estaba documentado en los datos originales")
+    print("     Distribución: 75% año 2023, 15% año 2024, 10% año 2025")
+    print()
+    print("   - CategoriaDeBecas: Clasificación según las opciones solicitadas:")
+    print("     * Pregrado (mayoría)")
+    print("     * Posgrado Maestria")
+    print("     * Posgrado Doctorado")
+    print("     * Especiales")
+    print("     Los datos originales solo mencionaban 'Pregrado' y 'Especiales'")
+    print()
+    print("   - BecasSegunMigracion: Estados generados:")
+    print("     * 'Migro' (~30% para estudios en Perú)")
+    print("     * 'No Migro' (~70% para estudios en Perú)")
+    print("     * 'No aplica' (para estudios internacionales)")
+    print("     Solo había referencias generales a migración (88.9% migraban a Lima)")
+
+    print("\n3. CAMPOS AMPLIADOS:")
+    print("   - Lugar (antes Departamento): Se agregaron países internacionales:")
+    print("     * España, Chile, Argentina, Colombia, México, Brasil")
+    print("     Los datos originales solo contenían departamentos del Perú")
+    print("     Distribución: 95% en Perú, 5% internacional")
+    print()
+    print("   - EstratoSocieconomico: Se agregó categoría 'No pobre' (~10%)")
+    print("     Los datos originales solo mencionaban 'Pobre' y 'Pobre Extremo'")
+    print()
+    print("   - Instituciones: Se agregaron algunas instituciones adicionales")
+    print("     a las 7 principales documentadas en los datos originales")
+
+    print("\n4. DATOS REALES DE LOS ARCHIVOS ORIGINALES:")
+    print("   - Carreras principales (Top 9 de Beca 18-2023)")
+    print("   - Instituciones principales (Top 7 de Beca 18-2023)")
+    print("   - Departamentos del Perú (25 departamentos con sus porcentajes)")
+    print("   - Estratos: Pobre y Pobre Extremo")
+    print("   - Total de becarios Beca 18-2023: 4,998")
+
+    print("\n" + "="*80)
+    print("NOTA IMPORTANTE PARA TU EXPOSICIÓN:")
+    print("="*80)
+    print("""
 Los datos se basaron en la Memoria Anual del PRONABEC 2022 (Beca 18-2023).
 El dataset generado combina:
 - Datos reales extraídos de los documentos oficiales
@@ -229,13 +245,19 @@ Este dataset es DEMOSTRATIVO y debe usarse solo con fines educativos.
 Para análisis serios, se debe obtener la base de datos oficial del PRONABEC.
 """)
 
-print("\n📁 Estadísticas del dataset generado:")
-print(df.groupby("NombreBeca").size())
-print("\nDistribución por categoría:")
-print(df.groupby("CategoriaDeBecas").size())
-print("\nDistribución por año:")
-print(df.groupby("Anio_Convocatoria").size())
-print("\nDistribución por género:")
-print(df.groupby("Genero").size())
-print("\nDistribución por estrato:")
-print(df.groupby("EstratoSocieconomico").size())
+    print("\n📁 Estadísticas del dataset generado:")
+    print(df.groupby("NombreBeca").size())
+    print("\nDistribución por categoría:")
+    print(df.groupby("CategoriaDeBecas").size())
+    print("\nDistribución por año:")
+    print(df.groupby("Anio_Convocatoria").size())
+    print("\nDistribución por género:")
+    print(df.groupby("Genero").size())
+    print("\nDistribución por estrato:")
+    print(df.groupby("EstratoSocieconomico").size())
+    print("\nProcedencia por campo (de la columna Procedencia: 2 bits por campo,")
+    print("0 vacío, 1 real, 2 derivado, 3 inventado):")
+    print(resumen_procedencia(df[COLUMNA_PROCEDENCIA], campos_procedencia(columnas)))
+
+if __name__ == "__main__":
+    main()
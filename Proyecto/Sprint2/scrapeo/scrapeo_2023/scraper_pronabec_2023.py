@@ -3,24 +3,29 @@ Script para extraer datos de la Memoria Anual del Pronabec 2023
 Extrae información sobre Beca 18: instituciones, departamentos, carreras, modalidades, etc.
 """
 
-import requests
-import PyPDF2
 import pandas as pd
 import re
-from io import BytesIO
+import sys
+from pathlib import Path
 import json
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from pronabec_comun import (
+    BuscadorPalabras,
+    descargar_pdf as descargar_pdf_espejo,
+    extraer_paginas,
+    lector_texto_para,
+)
+
 # URL del PDF
 PDF_URL = "https://cdn.www.gob.pe/uploads/document/file/6317263/5552590-memoria-anual-del-pronabec-2023.pdf?v=1715184066"
 
 def descargar_pdf(url):
-    """Descarga el PDF desde la URL"""
-    print(f"Descargando PDF desde: {url}")
+    """Descarga el PDF al espejo local (solo si cambió) y devuelve su ruta"""
     try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        print("✓ PDF descargado exitosamente")
-        return BytesIO(response.content)
+        pdf_path = descargar_pdf_espejo(url)
+        print("✓ PDF disponible")
+        return pdf_path
     except Exception as e:
         print(f"✗ Error al descargar el PDF: {e}")
         return None
@@ -29,20 +34,11 @@ def extraer_texto_pdf(pdf_file):
     """Extrae todo el texto del PDF"""
     print("\nExtrayendo texto del PDF...")
     try:
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
-        texto_completo = []
-        
-        total_paginas = len(pdf_reader.pages)
-        print(f"Total de páginas: {total_paginas}")
-        
-        for i, page in enumerate(pdf_reader.pages):
-            texto = page.extract_text()
-            texto_completo.append({
-                'pagina': i + 1,
-                'texto': texto
-            })
-            if (i + 1) % 10 == 0:
-                print(f"  Procesadas {i + 1}/{total_paginas} páginas...")
+        texto_completo = [
+            {'pagina': pagina['page'], 'texto': pagina['text']}
+            for pagina in extraer_paginas(pdf_file, tablas=False, lector=lector_texto_para(2023))
+        ]
+        print(f"Total de páginas: {len(texto_completo)}")
         
         print("✓ Texto extraído exitosamente")
         return texto_completo
@@ -50,6 +46,27 @@ def extraer_texto_pdf(pdf_file):
         print(f"✗ Error al extraer texto: {e}")
         return None
 
+# Palabras clave por tipo de dato
+KEYWORDS = {
+    'departamento': ['departamento', 'región', 'lima', 'cusco', 'arequipa', 'piura'],
+    'institucion': ['universidad', 'instituto', 'IES', 'institución educativa'],
+    'carrera': ['carrera', 'ingeniería', 'medicina', 'derecho', 'administración'],
+    'modalidad': ['modalidad', 'beca 18', 'ordinaria', 'especial', 'permanencia'],
+    'estrato': ['pobreza', 'pobre extremo', 'estrato', 'socioeconómico'],
+    'migracion': ['migración', 'migró', 'traslado', 'movilidad']
+}
+BUSCADOR_KEYWORDS = BuscadorPalabras(KEYWORDS)
+
+# Lista de datos_encontrados donde va cada tipo de dato
+CATEGORIA_DESTINO = {
+    'departamento': 'becarios_por_departamento',
+    'institucion': 'becarios_por_institucion',
+    'carrera': 'becarios_por_carrera',
+    'modalidad': 'becarios_por_modalidad',
+    'estrato': 'becarios_por_estrato',
+    'migracion': 'becarios_migracion',
+}
+
 def buscar_tablas_datos(texto_paginas):
     """Busca y extrae datos relevantes del texto"""
     print("\nBuscando datos relevantes en el documento...")
@@ -64,73 +81,36 @@ def buscar_tablas_datos(texto_paginas):
         'estadisticas_generales': []
     }
     
-    # Palabras clave para buscar
-    keywords = {
-        'departamento': ['departamento', 'región', 'lima', 'cusco', 'arequipa', 'piura'],
-        'institucion': ['universidad', 'instituto', 'IES', 'institución educativa'],
-        'carrera': ['carrera', 'ingeniería', 'medicina', 'derecho', 'administración'],
-        'modalidad': ['modalidad', 'beca 18', 'ordinaria', 'especial', 'permanencia'],
-        'estrato': ['pobreza', 'pobre extremo', 'estrato', 'socioeconómico'],
-        'migracion': ['migración', 'migró', 'traslado', 'movilidad']
-    }
-    
     for pagina_info in texto_paginas:
         pagina_num = pagina_info['pagina']
         texto = pagina_info['texto']
-        texto_lower = texto.lower()
         
         # Buscar menciones de Beca 18 y datos del 2023
-        if 'beca 18' in texto_lower and '2023' in texto:
-            # Buscar números y datos relevantes
+        if 'beca 18' in texto.lower() and '2023' in texto:
+            # Una sola pasada por página: líneas donde aparece cada tipo de dato
+            categorias_por_linea = {}
+            for c in BUSCADOR_KEYWORDS.coincidencias(texto, pagina_num):
+                categorias_por_linea.setdefault(c.linea, set()).add(c.categoria)
+            
             lineas = texto.split('\n')
-            for i, linea in enumerate(lineas):
-                linea_lower = linea.lower()
-                
-                # Buscar datos de departamentos
-                if any(kw in linea_lower for kw in keywords['departamento']):
-                    # Buscar números en las líneas cercanas
-                    numeros = re.findall(r'\b\d{1,5}\b', linea)
-                    if numeros:
-                        datos_encontrados['becarios_por_departamento'].append({
-                            'pagina': pagina_num,
-                            'texto': linea.strip(),
-                            'numeros': numeros
-                        })
-                
-                # Buscar datos de instituciones
-                if any(kw in linea_lower for kw in keywords['institucion']):
-                    datos_encontrados['becarios_por_institucion'].append({
-                        'pagina': pagina_num,
-                        'texto': linea.strip()
-                    })
-                
-                # Buscar datos de carreras
-                if any(kw in linea_lower for kw in keywords['carrera']):
-                    datos_encontrados['becarios_por_carrera'].append({
-                        'pagina': pagina_num,
-                        'texto': linea.strip()
-                    })
-                
-                # Buscar datos de modalidades
-                if any(kw in linea_lower for kw in keywords['modalidad']):
-                    datos_encontrados['becarios_por_modalidad'].append({
-                        'pagina': pagina_num,
-                        'texto': linea.strip()
-                    })
-                
-                # Buscar datos de estrato socioeconómico
-                if any(kw in linea_lower for kw in keywords['estrato']):
-                    datos_encontrados['becarios_por_estrato'].append({
-                        'pagina': pagina_num,
-                        'texto': linea.strip()
-                    })
+            for i in sorted(categorias_por_linea):
+                linea = lineas[i]
+                categorias = categorias_por_linea[i]
                 
-                # Buscar datos de migración
-                if any(kw in linea_lower for kw in keywords['migracion']):
-                    datos_encontrados['becarios_migracion'].append({
+                for categoria in KEYWORDS:
+                    if categoria not in categorias:
+                        continue
+                    registro = {
                         'pagina': pagina_num,
                         'texto': linea.strip()
-                    })
+                    }
+                    if categoria == 'departamento':
+                        # Solo líneas de departamentos que tengan cifras
+                        numeros = re.findall(r'\b\d{1,5}\b', linea)
+                        if not numeros:
+                            continue
+                        registro['numeros'] = numeros
+                    datos_encontrados[CATEGORIA_DESTINO[categoria]].append(registro)
     
     return datos_encontrados
 
@@ -3,11 +3,39 @@ Script para extraer datos PRONABEC 2024 con campos específicos del dataset
 Incluye campos reales e inventados basados en el contexto disponible
 """
 
+import argparse
+import sys
+from pathlib import Path
+
 import pandas as pd
 import json
-import random
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from pronabec_comun.sintetico import (
+    Bernoulli,
+    Categorica,
+    Condicional,
+    Constante,
+    COLUMNA_PROCEDENCIA,
+    Copia,
+    Mapeo,
+    REAL,
+    Segmento,
+    TablaCondicional,
+    agregar_opcion_escala,
+    agregar_opcion_procesos,
+    campos_procedencia,
+    escalar,
+    generar_en_bloques,
+    generar_segmentos,
+    resumen_procedencia,
+)
+from pronabec_comun.salida_bloques import FORMATOS, escribir_bloques, ruta_con_formato
+
+# Semilla del generador (misma salida en cada ejecución)
+SEMILLA = 2024
+
 # Configuración de datos inventados
 GENEROS = ['Masculino', 'Femenino']
 ESTRATOS = ['Pobre', 'Pobre Extremo', 'No pobre']
@@ -82,6 +110,26 @@ INSTITUCIONES_PERU = [
     'Universidad Nacional Daniel Alcides Carrión'
 ]
 
+# Departamentos del Perú (un Lugar fuera de esta lista es un país extranjero)
+DEPARTAMENTOS_PERU = [
+    'Lima', 'Ica', 'Callao', 'Cusco', 'Piura', 'Arequipa', 'La Libertad',
+    'Lambayeque', 'Junín', 'Puno', 'Cajamarca', 'Ancash', 'Apurímac',
+    'Huánuco', 'San Martín', 'Ayacucho', 'Loreto', 'Ucayali', 'Amazonas',
+    'Huancavelica', 'Pasco', 'Tumbes', 'Tacna', 'Madre de Dios', 'Moquegua'
+]
+
+# Nombres de beca del documento para las filas sin beca real
+NOMBRES_BECAS = ['Beca 18', 'Beca Permanencia', 'Beca Vocación']
+
+# Estratos: 45% Pobre, luego 75% del resto Pobre Extremo y el resto No pobre
+PROB_ESTRATOS = [0.45, 0.55 * 0.75, 0.55 * 0.25]
+
+COLUMNAS_DATASET = [
+    'NombreBeca', 'Institucion', 'Carrera', 'Lugar', 'CategoriaDeBecas',
+    'Anio_Convocatoria', 'Genero', 'EstratoSocioeconomico', 'BecasSegunMigracion',
+    COLUMNA_PROCEDENCIA
+]
+
 def cargar_datos_base():
     """Carga los datos extraídos del PDF"""
     print("📂 Cargando datos base del scraping...")
@@ -110,119 +158,150 @@ def cargar_datos_base():
     
     return datos
 
-def generar_datos_completos(datos_base):
-    """Genera dataset completo con todos los campos solicitados"""
-    print("\n🔄 Generando dataset con campos específicos...")
-    
-    registros = []
-    datos_inventados = {
-        'Carrera': 0,
-        'Institucion': 0,
-        'Genero': 0,
-        'EstratoSocioeconomico': 0,
-        'BecasSegunMigracion': 0,
-        'CategoriaDeBecas': 0
-    }
-    
-    # Obtener becas y departamentos
-    df_becas = datos_base.get('becas', pd.DataFrame())
-    df_dept = datos_base['departamentos']
-    df_inst = datos_base.get('instituciones', pd.DataFrame())
-    
-    # Mapeo de tipos de becas a categorías
+def _catalogo_becas(df_becas):
+    """
+    Nombres y categorías de las becas reales del PDF, uno por cada fila de df_becas
+
+    Las filas repetidas de un tipo se conservan para sortear con el mismo peso que antes.
+    """
     tipo_beca_map = {
         'Pregrado': 'Pregrado',
         'Posgrado': 'Posgrado Maestria',
         'Especiales': 'Especiales'
     }
+    if df_becas.empty:
+        return [], []
+    tipos = df_becas['TipoBeca'].tolist()
+    # Como antes, el nombre es el de la primera fila de ese tipo
+    primer_nombre = df_becas.drop_duplicates('TipoBeca').set_index('TipoBeca')['NombreBeca']
+    nombres = [primer_nombre[t] for t in tipos]
+    categorias = [tipo_beca_map.get(t, 'Pregrado') for t in tipos]
+    return nombres, categorias
+
+
+def _es_posgrado(categoria):
+    return 'Posgrado' in categoria
+
+
+def pesos_migracion(departamento, lugar):
+    """
+    Pesos de MIGRACION según departamento de origen y lugar de estudio (None si no están
+    en DEPARTAMENTOS_PERU): en el extranjero siempre migró; Lima 20% migra, otros 40%
+    """
+    if lugar is None:
+        return [1, 0]
+    if departamento == 'Lima':
+        return [0.2, 0.8]
+    return [0.4, 0.6]
+
+
+def crear_plantilla(df_becas, df_inst):
+    """Distribución de cada campo inventado; Departamento llega fijo por segmento"""
+    nombres_reales, categorias_reales = _catalogo_becas(df_becas)
+    instituciones_reales = df_inst['Institucion'].tolist() if not df_inst.empty else []
+
+    return {
+        # Tipo de beca: 70% reales del PDF (si hay), el resto nombres y categorías del documento
+        '_beca_real': Bernoulli(0.7) if nombres_reales else Constante(False),
+        '_beca': Categorica(range(len(nombres_reales))) if nombres_reales else Constante(0),
+        'NombreBeca': Condicional('_beca_real', {True: Mapeo('_beca', nombres_reales).como(REAL)},
+                                  defecto=Categorica(NOMBRES_BECAS)),
+        'CategoriaDeBecas': Condicional('_beca_real', {True: Mapeo('_beca', categorias_reales)},
+                                        defecto=Categorica(CATEGORIAS_BECAS)),
+        # Lugar: 25% de las becas de posgrado en el extranjero
+        '_extranjero': Condicional('CategoriaDeBecas', {True: Bernoulli(0.25)},
+                                   defecto=Constante(False), clave=_es_posgrado),
+        'Lugar': Condicional('_extranjero', {True: Categorica(PAISES_BECAS)},
+                             defecto=Copia('Departamento').como(REAL)),
+        # Institución: 30% reales del PDF (si hay), el resto universidades públicas
+        '_institucion_real': Bernoulli(0.3) if instituciones_reales else Constante(False),
+        'Institucion': Condicional('_institucion_real',
+                                   {True: Categorica(instituciones_reales).como(REAL)} if instituciones_reales else {},
+                                   defecto=Categorica(INSTITUCIONES_PERU)),
+        'Carrera': Categorica(CARRERAS_COMUNES),
+        'Genero': Categorica(GENEROS),
+        'EstratoSocioeconomico': Categorica(ESTRATOS, PROB_ESTRATOS),
+        # Migración: tabla por (departamento de origen, lugar de estudio)
+        'BecasSegunMigracion': TablaCondicional(
+            ['Departamento', 'Lugar'], [DEPARTAMENTOS_PERU, DEPARTAMENTOS_PERU],
+            MIGRACION, pesos_migracion,
+        ),
+    }
+
+
+def crear_segmentos(datos_base, escala=None):
+    """
+    Un segmento por departamento, con todas sus columnas generadas de una vez; con
+    `escala`, los becarios reales del departamento multiplicados por la escala
+    """
+    df_becas = datos_base.get('becas', pd.DataFrame())
+    df_dept = datos_base['departamentos']
+    df_inst = datos_base.get('instituciones', pd.DataFrame())
     
-    # Generar registros por departamento
-    for idx, row in df_dept.iterrows():
-        departamento = row['Departamento']
-        cantidad = int(row['CantidadBecarios'])
-        
-        # Generar registros individuales para cada becario
-        for i in range(cantidad):
-            
-            # Determinar tipo de beca (basado en datos reales si existen)
-            if not df_becas.empty and random.random() > 0.3:
-                tipo_beca_real = random.choice(df_becas['TipoBeca'].tolist())
-                nombre_beca = df_becas[df_becas['TipoBeca'] == tipo_beca_real]['NombreBeca'].iloc[0]
-                categoria_beca = tipo_beca_map.get(tipo_beca_real, 'Pregrado')
-                beca_inventada = False
-            else:
-                nombre_beca = random.choice(['Beca 18', 'Beca Permanencia', 'Beca Vocación'])
-                categoria_beca = random.choice(CATEGORIAS_BECAS)
-                beca_inventada = False  # Nombre está en el documento
-                datos_inventados['CategoriaDeBecas'] += 1
-            
-            # Determinar Lugar (puede ser departamento de Perú o país extranjero)
-            # Becas de Posgrado tienen mayor probabilidad de ser en el extranjero
-            if 'Posgrado' in categoria_beca and random.random() < 0.25:  # 25% de posgrado en el extranjero
-                lugar = random.choice(PAISES_BECAS)
-                datos_inventados['Lugar'] = datos_inventados.get('Lugar', 0) + 1
-            else:
-                lugar = departamento  # Usar departamento del Perú
-            
-            # Institución (algunas reales, otras inventadas)
-            if not df_inst.empty and random.random() > 0.7:
-                institucion = random.choice(df_inst['Institucion'].tolist())
-            else:
-                institucion = random.choice(INSTITUCIONES_PERU)
-                datos_inventados['Institucion'] += 1
-            
-            # Carrera (siempre inventada - no hay en el PDF)
-            carrera = random.choice(CARRERAS_COMUNES)
-            datos_inventados['Carrera'] += 1
-            
-            # Género (siempre inventado - no hay en el PDF)
-            genero = random.choice(GENEROS)
-            datos_inventados['Genero'] += 1
-            
-            # Estrato socioeconómico (siempre inventado - no hay en el PDF)
-            # Distribución más realista: más pobres que no pobres
-            if random.random() < 0.45:
-                estrato = 'Pobre'
-            elif random.random() < 0.75:
-                estrato = 'Pobre Extremo'
-            else:
-                estrato = 'No pobre'
-            datos_inventados['EstratoSocioeconomico'] += 1
-            
-            # Migración (siempre inventado - no hay en el PDF)
-            # Si es de Lima, menos probable que migre
-            # Si estudia en el extranjero, definitivamente migró
-            if lugar not in ['Lima', 'Ica', 'Callao', 'Cusco', 'Piura', 'Arequipa', 'La Libertad', 
-                            'Lambayeque', 'Junín', 'Puno', 'Cajamarca', 'Ancash', 'Apurímac', 
-                            'Huánuco', 'San Martín', 'Ayacucho', 'Loreto', 'Ucayali', 'Amazonas',
-                            'Huancavelica', 'Pasco', 'Tumbes', 'Tacna', 'Madre de Dios', 'Moquegua']:
-                # Estudia en el extranjero
-                migracion = 'Migró'
-            elif departamento == 'Lima':
-                migracion = 'No Migró' if random.random() < 0.8 else 'Migró'
-            else:
-                migracion = 'Migró' if random.random() < 0.4 else 'No Migró'
-            datos_inventados['BecasSegunMigracion'] += 1
-            
-            # Crear registro
-            registro = {
-                'NombreBeca': nombre_beca,
-                'Institucion': institucion,
-                'Carrera': carrera,
-                'Lugar': lugar,  # Cambiado de Departamento a Lugar
-                'CategoriaDeBecas': categoria_beca,
-                'Anio_Convocatoria': 2024,
-                'Genero': genero,
-                'EstratoSocioeconomico': estrato,
-                'BecasSegunMigracion': migracion
-            }
-            
-            registros.append(registro)
+    plantilla = crear_plantilla(df_becas, df_inst)
+    cantidades = df_dept['CantidadBecarios'].astype(int)
+    if escala:
+        cantidades = [escalar(cantidad, escala) for cantidad in cantidades]
+    return [
+        Segmento(plantilla, int(cantidad), {'Departamento': departamento, 'Anio_Convocatoria': 2024})
+        for departamento, cantidad in zip(df_dept['Departamento'], cantidades)
+    ]
+
+
+def resumen_campos(df):
+    """Registros de cada campo por procedencia (real, derivado, inventado)"""
+    return resumen_procedencia(df[COLUMNA_PROCEDENCIA], campos_procedencia(COLUMNAS_DATASET))
+
+
+def contar_datos_inventados(resumen):
+    """Registros con cada campo inventado, del resumen de procedencia"""
+    campos = ['Carrera', 'Institucion', 'Genero', 'EstratoSocioeconomico',
+              'BecasSegunMigracion', 'CategoriaDeBecas', 'Lugar']
+    return {campo: int(resumen.loc[campo, 'inventado']) for campo in campos}
+
+
+def generar_datos_completos(datos_base, semilla=SEMILLA, procesos=None, escala=None):
+    """
+    Genera dataset completo con todos los campos solicitados
+
+    Cada departamento se genera con su propio flujo aleatorio, repartidos entre
+    `procesos` procesos (None: todos los núcleos); el resultado es el mismo con
+    cualquier número de procesos.
+    """
+    print("\n🔄 Generando dataset con campos específicos...")
     
-    df_final = pd.DataFrame(registros)
+    df_final = generar_segmentos(crear_segmentos(datos_base, escala), semilla,
+                                 columnas=COLUMNAS_DATASET, procesos=procesos)
+    datos_inventados = contar_datos_inventados(resumen_campos(df_final))
     
     return df_final, datos_inventados
 
+
+def generar_datos_en_bloques(datos_base, ruta, filas_por_bloque, formato='csv',
+                             semilla=SEMILLA, procesos=None, escala=None):
+    """
+    Genera el mismo dataset que generar_datos_completos, pero lo escribe en `ruta`
+    (CSV o Parquet) bloque por bloque, sin tenerlo completo en memoria
+
+    Returns:
+        (total de registros, datos inventados)
+    """
+    print(f"\n🔄 Generando dataset en bloques de {filas_por_bloque:,} registros ({formato})...")
+    
+    resumenes = []
+    
+    def bloques_con_resumen():
+        segmentos = crear_segmentos(datos_base, escala)
+        for bloque in generar_en_bloques(segmentos, semilla, filas_por_bloque,
+                                         columnas=COLUMNAS_DATASET, procesos=procesos):
+            resumenes.append(resumen_campos(bloque))
+            yield bloque
+    
+    total = escribir_bloques(bloques_con_resumen(), ruta, formato)
+    if not resumenes:
+        resumenes = [resumen_procedencia([], campos_procedencia(COLUMNAS_DATASET))]
+    return total, contar_datos_inventados(sum(resumenes[1:], resumenes[0]))
+
 def generar_reporte_datos_inventados(datos_inventados, total_registros):
     """Genera reporte de datos inventados"""
     print("\n" + "="*70)
@@ -341,6 +420,15 @@ def generar_reporte_datos_inventados(datos_inventados, total_registros):
         'Justificacion': 'PDF no incluye migración. Lógica: Lima 20% migra, otros departamentos 40% migra'
     })
     
+    reporte.append({
+        'Campo': COLUMNA_PROCEDENCIA,
+        'Origen': 'CALCULADO - Por registro',
+        'Cantidad': total_registros,
+        'Porcentaje': '100%',
+        'Justificacion': ('Máscara con 2 bits por campo, en el orden de las columnas '
+                          '(0 vacío, 1 real, 2 derivado, 3 inventado)')
+    })
+    
     print("\n" + "="*70)
     print("  💡 RECOMENDACIÓN PARA TU EXPOSICIÓN")
     print("="*70)
@@ -356,8 +444,33 @@ def generar_reporte_datos_inventados(datos_inventados, total_registros):
     
     return pd.DataFrame(reporte)
 
+def generar_por_bloques(datos_base, filas_por_bloque, formato, procesos, escala=None):
+    """Modo para datasets grandes: dataset por bloques y reporte, sin el Excel completo"""
+    archivo = ruta_con_formato('PRONABEC_2024_DATASET_COMPLETO.csv', formato)
+    total, datos_inventados = generar_datos_en_bloques(datos_base, archivo, filas_por_bloque,
+                                                       formato, procesos=procesos, escala=escala)
+    print(f"\n✅ Dataset generado: {total} registros")
+    
+    df_reporte = generar_reporte_datos_inventados(datos_inventados, total)
+    
+    print("\n💾 Guardando archivos...")
+    print(f"  ✓ {archivo}")
+    df_reporte.to_excel('REPORTE_DATOS_INVENTADOS.xlsx', index=False, engine='openpyxl')
+    print(f"  ✓ REPORTE_DATOS_INVENTADOS.xlsx")
+
+
 def main():
     """Función principal"""
+    parser = argparse.ArgumentParser(description="Genera el dataset sintético de becarios 2024")
+    parser.add_argument('--filas-por-bloque', type=int, default=None,
+                        help="Escribe el dataset por bloques de este tamaño, sin tenerlo "
+                             "completo en memoria (solo el CSV/Parquet y el reporte, sin el Excel)")
+    parser.add_argument('--formato', choices=FORMATOS, default='csv',
+                        help="Formato del dataset escrito por bloques")
+    agregar_opcion_escala(parser)
+    agregar_opcion_procesos(parser)
+    args = parser.parse_args()
+
     print("="*70)
     print("  GENERACIÓN DE DATASET CON CAMPOS ESPECÍFICOS")
     print("  PRONABEC 2024")
@@ -371,8 +484,14 @@ def main():
             print("\n❌ No se pudieron cargar los datos base")
             return
         
+        if args.filas_por_bloque:
+            generar_por_bloques(datos_base, args.filas_por_bloque, args.formato, args.procesos,
+                                args.escala)
+            return
+        
         # Generar dataset completo
-        df_final, datos_inventados = generar_datos_completos(datos_base)
+        df_final, datos_inventados = generar_datos_completos(datos_base, procesos=args.procesos,
+                                                             escala=args.escala)
         
         print(f"\n✅ Dataset generado: {len(df_final)} registros")
         
@@ -414,14 +533,8 @@ def main():
                 'Valor': [
                     len(df_final),
                     df_final['Lugar'].nunique(),
-                    len(df_final[df_final['Lugar'].isin(['Lima', 'Ica', 'Callao', 'Cusco', 'Piura', 'Arequipa', 'La Libertad', 
-                            'Lambayeque', 'Junín', 'Puno', 'Cajamarca', 'Ancash', 'Apurímac', 
-                            'Huánuco', 'San Martín', 'Ayacucho', 'Loreto', 'Ucayali', 'Amazonas',
-                            'Huancavelica', 'Pasco', 'Tumbes', 'Tacna', 'Madre de Dios', 'Moquegua'])]),
-                    len(df_final[~df_final['Lugar'].isin(['Lima', 'Ica', 'Callao', 'Cusco', 'Piura', 'Arequipa', 'La Libertad', 
-                            'Lambayeque', 'Junín', 'Puno', 'Cajamarca', 'Ancash', 'Apurímac', 
-                            'Huánuco', 'San Martín', 'Ayacucho', 'Loreto', 'Ucayali', 'Amazonas',
-                            'Huancavelica', 'Pasco', 'Tumbes', 'Tacna', 'Madre de Dios', 'Moquegua'])]),
+                    len(df_final[df_final['Lugar'].isin(DEPARTAMENTOS_PERU)]),
+                    len(df_final[~df_final['Lugar'].isin(DEPARTAMENTOS_PERU)]),
                     df_final['Institucion'].nunique(),
                     df_final['Carrera'].nunique(),
                     df_final['CategoriaDeBecas'].nunique(),
@@ -438,6 +551,9 @@ def main():
             
             df_stats = pd.DataFrame(stats)
             df_stats.to_excel(writer, sheet_name='Estadisticas', index=False)
+            
+            # Hoja 4: Registros de cada campo por procedencia (de la máscara Procedencia)
+            resumen_campos(df_final).to_excel(writer, sheet_name='Procedencia_Campos')
         
         print(f"  ✓ {archivo_principal}")
         
@@ -3,25 +3,26 @@ Web Scraping de PRONABEC 2024 - Memoria Anual
 Extrae datos de becarios del año 2024 del documento PDF oficial
 """
 
-import requests
 import pdfplumber
 import pandas as pd
 import re
-from io import BytesIO
+import sys
+from pathlib import Path
 from typing import List, Dict
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from pronabec_comun import descargar_pdf as descargar_pdf_espejo, extraer_paginas, lector_texto_para
+
 # URL del PDF
 PDF_URL = "https://cdn.www.gob.pe/uploads/document/file/8154351/6826853-memoria-anual-2024%282%29.pdf?v=1752678425"
 
-def descargar_pdf(url: str) -> BytesIO:
-    """Descarga el PDF desde la URL"""
-    print(f"Descargando PDF desde: {url}")
-    response = requests.get(url, timeout=30)
-    response.raise_for_status()
-    print("PDF descargado exitosamente")
-    return BytesIO(response.content)
+def descargar_pdf(url: str) -> Path:
+    """Descarga el PDF al espejo local (solo si cambió) y devuelve su ruta"""
+    pdf_path = descargar_pdf_espejo(url)
+    print("PDF disponible")
+    return pdf_path
 
-def extraer_tablas_pdf(pdf_buffer: BytesIO) -> List[pd.DataFrame]:
+def extraer_tablas_pdf(pdf_buffer: Path) -> List[pd.DataFrame]:
     """Extrae todas las tablas del PDF"""
     tablas = []
     
@@ -121,15 +122,13 @@ def procesar_datos_becarios(tablas: List[Dict]) -> pd.DataFrame:
     else:
         return pd.DataFrame()
 
-def extraer_texto_completo(pdf_buffer: BytesIO) -> str:
+def extraer_texto_completo(pdf_buffer: Path) -> str:
     """Extrae todo el texto del PDF para análisis adicional"""
-    texto_completo = []
-    
-    with pdfplumber.open(pdf_buffer) as pdf:
-        for page in pdf.pages:
-            texto = page.extract_text()
-            if texto:
-                texto_completo.append(texto)
+    texto_completo = [
+        pagina['text']
+        for pagina in extraer_paginas(pdf_buffer, tablas=False, lector=lector_texto_para(2024))
+        if pagina['text']
+    ]
     
     return "\n".join(texto_completo)
 
@@ -184,8 +183,6 @@ def main():
             print("\n⚠ No se encontraron tablas en el PDF")
             print("Extrayendo texto completo para análisis manual...")
             
-            # Reiniciar buffer
-            pdf_buffer.seek(0)
             texto = extraer_texto_completo(pdf_buffer)
             
             with open("pronabec_2024_texto_completo.txt", "w", encoding="utf-8") as f:
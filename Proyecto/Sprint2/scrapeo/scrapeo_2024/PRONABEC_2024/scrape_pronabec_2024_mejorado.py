@@ -3,134 +3,114 @@ Web Scraping MEJORADO de PRONABEC 2024 - Memoria Anual
 Extrae datos detallados de becarios 2024
 """
 
-import requests
-import pdfplumber
 import pandas as pd
-import re
-from io import BytesIO
+import sys
+from pathlib import Path
 from typing import List, Dict, Tuple
 import json
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from pronabec_comun import (
+    RegistroPatrones,
+    descargar_pdf as descargar_pdf_espejo,
+    extraer_paginas_filtradas,
+    lector_texto_para,
+)
+
 PDF_URL = "https://cdn.www.gob.pe/uploads/document/file/8154351/6826853-memoria-anual-2024%282%29.pdf?v=1752678425"
 
-def descargar_pdf(url: str) -> BytesIO:
-    """Descarga el PDF desde la URL"""
+# Solo se buscan tablas en las páginas que mencionan el año
+PALABRAS_TABLAS = ['2024']
+
+def descargar_pdf(url: str) -> Path:
+    """Descarga el PDF al espejo local (solo si cambió) y devuelve su ruta"""
     print(f"📥 Descargando PDF desde: {url}")
-    response = requests.get(url, timeout=30)
-    response.raise_for_status()
-    print("✅ PDF descargado exitosamente")
-    return BytesIO(response.content)
+    pdf_path = descargar_pdf_espejo(url)
+    print("✅ PDF disponible")
+    return pdf_path
 
-def extraer_info_becas_por_tipo(texto: str, pagina: int) -> List[Dict]:
-    """Extrae información sobre tipos de becas y sus cifras"""
-    datos = []
-    
-    # Patrones para buscar información de becas
-    patrones_becas = [
-        r'Beca 18[:\s]+(\d+)',
-        r'Beca Permanencia[:\s]+(\d+)',
-        r'Beca Vocación[:\s]+(\d+)',
-        r'Beca Inclusión[:\s]+(\d+)',
-        r'Beca Excelencia[:\s]+(\d+)',
-        r'Beca Especial[:\s]+(\d+)',
-        r'(\w+\s*\w*)\s+becas?\s+otorgadas[:\s]+(\d+)',
-    ]
+DEPARTAMENTOS_PERU = [
+    'Amazonas', 'Áncash', 'Ancash', 'Apurímac', 'Apurimac', 'Arequipa', 
+    'Ayacucho', 'Cajamarca', 'Callao', 'Cusco', 'Cuzco', 'Huancavelica',
+    'Huánuco', 'Huanuco', 'Ica', 'Junín', 'Junin', 'La Libertad', 
+    'Lambayeque', 'Lima', 'Loreto', 'Madre de Dios', 'Moquegua',
+    'Pasco', 'Piura', 'Puno', 'San Martín', 'San Martin', 'Tacna',
+    'Tumbes', 'Ucayali'
+]
+
+ESTRATOS = ['pobre extremo', 'pobre', 'no pobre', 'vulnerable']
+
+def crear_registro_patrones() -> RegistroPatrones:
+    """Registra los patrones de becas, departamentos, estratos y migración en una sola regex"""
+    registro = RegistroPatrones()
     
-    for patron in patrones_becas:
-        matches = re.finditer(patron, texto, re.IGNORECASE)
-        for match in matches:
-            if len(match.groups()) == 2:
-                datos.append({
-                    'NombreBeca': match.group(1).strip(),
-                    'Cantidad': int(match.group(2)),
-                    'Pagina': pagina
-                })
-            elif len(match.groups()) == 1:
-                # Extraer el nombre de la beca del contexto
-                inicio = max(0, match.start() - 50)
-                contexto = texto[inicio:match.start()]
-                nombre = contexto.split('\n')[-1].strip() if '\n' in contexto else 'Beca'
-                datos.append({
-                    'NombreBeca': nombre,
-                    'Cantidad': int(match.group(1)),
-                    'Pagina': pagina
-                })
+    # Tipos de becas: la cifra sigue al nombre; el nombre se toma del contexto
+    registro.agregar_patron(
+        'becas_por_tipo',
+        r'Beca (?:18|Permanencia|Vocación|Inclusión|Excelencia|Especial)[:\s]+(?P<valor>\d+)'
+    )
+    # Patrón amplio: con lookahead no consume el texto, así que un departamento dentro
+    # de la etiqueta ("Cusco 300 becas otorgadas: 12") sigue contando como hallazgo.
+    # Solo empieza al inicio de la etiqueta (no en su segunda palabra) para no duplicarla.
+    registro.agregar_patron(
+        'becas_por_tipo',
+        r'\b(?<!\w\s)(?=(?P<etiqueta>\w+\s*\w*)\s+becas?\s+otorgadas[:\s]+(?P<valor>\d+))'
+    )
     
-    return datos
-
-def extraer_info_departamentos(texto: str, pagina: int) -> List[Dict]:
-    """Extrae información por departamento"""
-    datos = []
+    registro.agregar_etiquetas('becas_por_departamento', DEPARTAMENTOS_PERU)
+    registro.agregar_etiquetas('becas_por_estrato', ESTRATOS)
     
-    departamentos_peru = [
-        'Amazonas', 'Áncash', 'Ancash', 'Apurímac', 'Apurimac', 'Arequipa', 
-        'Ayacucho', 'Cajamarca', 'Callao', 'Cusco', 'Cuzco', 'Huancavelica',
-        'Huánuco', 'Huanuco', 'Ica', 'Junín', 'Junin', 'La Libertad', 
-        'Lambayeque', 'Lima', 'Loreto', 'Madre de Dios', 'Moquegua',
-        'Pasco', 'Piura', 'Puno', 'San Martín', 'San Martin', 'Tacna',
-        'Tumbes', 'Ucayali'
-    ]
+    # Migración: los patrones amplios usan lookahead para no consumir el texto
+    # (un departamento dentro de la frase sigue contando como hallazgo)
+    registro.agregar_patron('becas_por_migracion', r'(?:no\s+)?migr[óo]\s+(?P<valor>\d+)')
+    registro.agregar_patron('becas_por_migracion', r'movilidad(?=.*?(?P<valor>\d+))')
+    registro.agregar_patron('becas_por_migracion', r'origen(?=.*?departamento.*?(?P<valor>\d+))')
     
-    for dept in departamentos_peru:
-        # Buscar menciones del departamento con números
-        patron = rf'{dept}[:\s]+(\d+)'
-        matches = re.finditer(patron, texto, re.IGNORECASE)
-        for match in matches:
-            datos.append({
-                'Departamento': dept.title(),
-                'Cantidad': int(match.group(1)),
+    return registro
+
+REGISTRO_PATRONES = crear_registro_patrones()
+
+def extraer_info_pagina(texto: str, pagina: int, info_adicional: Dict):
+    """Recorre el texto una sola vez y agrega cada hallazgo a su categoría en info_adicional"""
+    for hallazgo in REGISTRO_PATRONES.buscar(texto, pagina):
+        dimension = hallazgo.dimension
+        
+        if dimension == 'becas_por_tipo':
+            nombre = hallazgo.etiqueta
+            if nombre is None:
+                # Extraer el nombre de la beca del contexto
+                inicio = max(0, hallazgo.inicio - 50)
+                contexto = texto[inicio:hallazgo.inicio]
+                nombre = contexto.split('\n')[-1].strip() if '\n' in contexto else 'Beca'
+            info_adicional[dimension].append({
+                'NombreBeca': nombre,
+                'Cantidad': hallazgo.valor,
                 'Pagina': pagina
             })
-    
-    return datos
-
-def extraer_info_estratos(texto: str, pagina: int) -> List[Dict]:
-    """Extrae información sobre estratos socioeconómicos"""
-    datos = []
-    
-    estratos = ['pobre extremo', 'pobre', 'no pobre', 'vulnerable']
-    
-    for estrato in estratos:
-        patron = rf'{estrato}[:\s]+(\d+)'
-        matches = re.finditer(patron, texto, re.IGNORECASE)
-        for match in matches:
-            datos.append({
-                'EstratoSocioeconomico': estrato.title(),
-                'Cantidad': int(match.group(1)),
+        elif dimension == 'becas_por_departamento':
+            info_adicional[dimension].append({
+                'Departamento': hallazgo.etiqueta,
+                'Cantidad': hallazgo.valor,
                 'Pagina': pagina
             })
-    
-    return datos
-
-def extraer_info_migracion(texto: str, pagina: int) -> List[Dict]:
-    """Extrae información sobre migración de becarios"""
-    datos = []
-    
-    patrones = [
-        r'migr[óo]\s+(\d+)',
-        r'no\s+migr[óo]\s+(\d+)',
-        r'movilidad.*?(\d+)',
-        r'origen.*?departamento.*?(\d+)',
-    ]
-    
-    for patron in patrones:
-        matches = re.finditer(patron, texto, re.IGNORECASE)
-        for match in matches:
+        elif dimension == 'becas_por_estrato':
+            info_adicional[dimension].append({
+                'EstratoSocioeconomico': hallazgo.etiqueta,
+                'Cantidad': hallazgo.valor,
+                'Pagina': pagina
+            })
+        elif dimension == 'becas_por_migracion':
             # Determinar el contexto
-            inicio = max(0, match.start() - 30)
-            contexto = texto[inicio:match.start()].lower()
-            
+            inicio = max(0, hallazgo.inicio - 30)
+            contexto = texto[inicio:hallazgo.inicio].lower()
             tipo_migracion = 'Migró' if 'no' not in contexto and 'migr' in contexto else 'No migró'
-            
-            datos.append({
+            info_adicional[dimension].append({
                 'TipoMigracion': tipo_migracion,
-                'Cantidad': int(match.group(1)),
+                'Cantidad': hallazgo.valor,
                 'Pagina': pagina
             })
-    
-    return datos
 
-def extraer_tablas_detalladas(pdf_buffer: BytesIO) -> Tuple[List[Dict], Dict]:
+def extraer_tablas_detalladas(pdf_path: Path) -> Tuple[List[Dict], Dict]:
     """Extrae todas las tablas y analiza el contenido del PDF"""
     
     todas_tablas = []
@@ -143,46 +123,37 @@ def extraer_tablas_detalladas(pdf_buffer: BytesIO) -> Tuple[List[Dict], Dict]:
         'carreras': []
     }
     
-    with pdfplumber.open(pdf_buffer) as pdf:
-        print(f"📄 Total de páginas: {len(pdf.pages)}")
+    paginas = extraer_paginas_filtradas(pdf_path, palabras_clave=PALABRAS_TABLAS,
+                                        lector_texto=lector_texto_para(2024))
+    print(f"📄 Total de páginas: {len(paginas)}")
+    
+    for pagina in paginas:
+        i = pagina['page']
+        texto = pagina['text']
         
-        for i, page in enumerate(pdf.pages, 1):
-            if i % 10 == 0:
-                print(f"  Procesando página {i}/{len(pdf.pages)}...")
-            
-            # Extraer texto
-            texto = page.extract_text() or ""
-            
-            # Buscar información relevante solo si menciona 2024
-            if '2024' in texto:
-                # Extraer información de diferentes categorías
-                info_adicional['becas_por_tipo'].extend(extraer_info_becas_por_tipo(texto, i))
-                info_adicional['becas_por_departamento'].extend(extraer_info_departamentos(texto, i))
-                info_adicional['becas_por_estrato'].extend(extraer_info_estratos(texto, i))
-                info_adicional['becas_por_migracion'].extend(extraer_info_migracion(texto, i))
-            
-            # Extraer tablas
-            tables = page.extract_tables()
-            
-            if tables:
-                for j, table in enumerate(tables):
-                    if table and len(table) > 1:
-                        try:
-                            # Convertir a DataFrame
-                            headers = table[0] if table[0] else [f"Col{k}" for k in range(len(table[1]))]
-                            df = pd.DataFrame(table[1:], columns=headers)
-                            
-                            # Verificar si contiene datos de 2024
-                            texto_tabla = df.to_string()
-                            if '2024' in texto_tabla or '2024' in texto:
-                                todas_tablas.append({
-                                    'pagina': i,
-                                    'tabla_num': j+1,
-                                    'dataframe': df,
-                                    'tipo': identificar_tipo_tabla(df, texto)
-                                })
-                        except Exception as e:
-                            continue
+        # Buscar información relevante solo si menciona 2024
+        if '2024' in texto:
+            # Extraer información de diferentes categorías en una sola pasada
+            extraer_info_pagina(texto, i, info_adicional)
+        
+        for j, table in enumerate(pagina['tables']):
+            if table and len(table) > 1:
+                try:
+                    # Convertir a DataFrame
+                    headers = table[0] if table[0] else [f"Col{k}" for k in range(len(table[1]))]
+                    df = pd.DataFrame(table[1:], columns=headers)
+                    
+                    # Verificar si contiene datos de 2024
+                    texto_tabla = df.to_string()
+                    if '2024' in texto_tabla or '2024' in texto:
+                        todas_tablas.append({
+                            'pagina': i,
+                            'tabla_num': j+1,
+                            'dataframe': df,
+                            'tipo': identificar_tipo_tabla(df, texto)
+                        })
+                except Exception as e:
+                    continue
     
     return todas_tablas, info_adicional
 
@@ -370,11 +341,11 @@ def main():
         print("="*70 + "\n")
         
         # Descargar PDF
-        pdf_buffer = descargar_pdf(PDF_URL)
+        pdf_path = descargar_pdf(PDF_URL)
         
         # Extraer tablas y datos
         print("\n📊 EXTRAYENDO DATOS DEL PDF...")
-        tablas, info_adicional = extraer_tablas_detalladas(pdf_buffer)
+        tablas, info_adicional = extraer_tablas_detalladas(pdf_path)
         print(f"✅ {len(tablas)} tablas encontradas con datos de 2024")
         
         # Procesar tablas por tipo
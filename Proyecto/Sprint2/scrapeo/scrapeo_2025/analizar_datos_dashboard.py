@@ -2,41 +2,111 @@
 Script para analizar y generar reportes adicionales de los datos del dashboard 2025
 """
 
-import pandas as pd
+import numpy as np
 import json
 from datetime import datetime
 
+from extraer_datos_dashboard_2025 import cargar_consolidado
+
+# Columnas del consolidado que usan los reportes
+COLUMNAS_ANALISIS = ['NombreBeca', 'Institucion', 'AnioBecariosConfirmados', 'Departamento',
+                     'Carrera', 'Modalidad', 'Estrato_socioeconomico', 'Migracion']
+
+# Dimensiones del cubo de conteos del que salen todos los reportes
+DIMENSIONES_CUBO = ['NombreBeca', 'Departamento', 'Modalidad', 'Estrato_socioeconomico',
+                    'Migracion', 'Institucion']
+
 def cargar_datos():
     """Carga el dataset consolidado"""
     print("Cargando datos consolidados...")
-    df = pd.read_csv('dashboard_becas_2025_consolidado.csv')
+    df = cargar_consolidado(COLUMNAS_ANALISIS)
     print(f"✓ {len(df)} registros cargados\n")
     return df
 
-def generar_reporte_por_beca(df):
+def construir_cubo(df):
+    """
+    Cuenta los registros de cada combinación de DIMENSIONES_CUBO en un solo groupby.
+    
+    Junto al conteo (`n`) guarda la posición de la primera fila de cada combinación
+    (`primera`), para que los conteos sacados del cubo ordenen los empates igual que
+    value_counts sobre las filas. Los reportes toman sus totales, distribuciones y top N
+    de agregaciones de este cubo en lugar de filtrar el DataFrame por cada beca o
+    departamento; cada distribución "por grupo" es un único groupby sobre el cubo.
+    """
+    dimensiones = [d for d in DIMENSIONES_CUBO if d in df.columns]
+    return (df[dimensiones].assign(primera=np.arange(len(df)))
+            .groupby(dimensiones, dropna=False, sort=False)['primera']
+            .agg(n='size', primera='min'))
+
+def total(cubo):
+    """Registros que representa el cubo (len del DataFrame)"""
+    return int(cubo['n'].sum())
+
+def totales_por(cubo, grupo):
+    """Registros de cada valor de `grupo` (len de cada DataFrame filtrado)"""
+    return {valor: int(n) for valor, n in cubo.groupby(level=grupo)['n'].sum().items()}
+
+def conteos(cubo, dimension):
+    """Conteo por valor de `dimension`, como value_counts()"""
+    por_valor = cubo.groupby(level=dimension).agg(n=('n', 'sum'), primera=('primera', 'min'))
+    return por_valor.sort_values('primera')['n'].sort_values(ascending=False, kind='stable')
+
+def conteos_por(cubo, grupo, dimension):
+    """
+    Conteo por valor de `dimension` dentro de cada valor de `grupo`, como value_counts()
+    sobre cada DataFrame filtrado: {grupo: {valor: registros}}, en un solo groupby
+    """
+    marginal = (cubo.groupby(level=[grupo, dimension])
+                .agg(n=('n', 'sum'), primera=('primera', 'min'))
+                .sort_values('primera')
+                .sort_values([grupo, 'n'], ascending=[True, False], kind='stable'))
+    resultado = {}
+    for valor_grupo, valor, n in zip(marginal.index.get_level_values(grupo),
+                                     marginal.index.get_level_values(dimension),
+                                     marginal['n'].tolist()):
+        resultado.setdefault(valor_grupo, {})[valor] = n
+    return resultado
+
+def unicos(cubo, dimension):
+    """Valores distintos de `dimension`, como nunique()"""
+    return cubo.index.get_level_values(dimension).dropna().nunique()
+
+def orden_de_aparicion(cubo, dimension):
+    """Valores de `dimension` en el orden en que aparecen en las filas, como unique()"""
+    return cubo.groupby(level=dimension)['primera'].min().sort_values().index
+
+def primeros(conteo, cantidad):
+    """Los `cantidad` primeros valores de un conteo, como value_counts().head()"""
+    return dict(list(conteo.items())[:cantidad])
+
+def generar_reporte_por_beca(cubo):
     """Genera un reporte detallado por cada beca"""
     print("="*80)
     print("REPORTE DETALLADO POR TIPO DE BECA")
     print("="*80)
     
-    becas = df['NombreBeca'].unique()
+    # Distribuciones de todas las becas a la vez; cada reporte toma la de su beca
+    totales = totales_por(cubo, 'NombreBeca')
+    distribuciones = {dimension: conteos_por(cubo, 'NombreBeca', dimension)
+                      for dimension in cubo.index.names if dimension != 'NombreBeca'}
+    
+    def distribucion(dimension, beca):
+        return distribuciones[dimension].get(beca, {}) if dimension in distribuciones else {}
     
     reportes = {}
     
-    for beca in sorted(becas):
-        df_beca = df[df['NombreBeca'] == beca]
-        
+    for beca in sorted(totales):
         reporte = {
             'nombre': beca,
-            'total_registros': len(df_beca),
-            'instituciones_unicas': df_beca['Institucion'].nunique(),
-            'departamentos': df_beca['Departamento'].nunique(),
-            'modalidades': df_beca['Modalidad'].nunique() if 'Modalidad' in df_beca.columns else 0,
-            'instituciones_top_5': df_beca['Institucion'].value_counts().head(5).to_dict(),
-            'departamentos_top_5': df_beca['Departamento'].value_counts().head(5).to_dict(),
-            'modalidades_distribucion': df_beca['Modalidad'].value_counts().to_dict() if 'Modalidad' in df_beca.columns else {},
-            'estrato_distribucion': df_beca['Estrato_socioeconomico'].value_counts().to_dict() if 'Estrato_socioeconomico' in df_beca.columns else {},
-            'migracion_distribucion': df_beca['Migracion'].value_counts().to_dict() if 'Migracion' in df_beca.columns else {}
+            'total_registros': totales[beca],
+            'instituciones_unicas': len(distribucion('Institucion', beca)),
+            'departamentos': len(distribucion('Departamento', beca)),
+            'modalidades': len(distribucion('Modalidad', beca)),
+            'instituciones_top_5': primeros(distribucion('Institucion', beca), 5),
+            'departamentos_top_5': primeros(distribucion('Departamento', beca), 5),
+            'modalidades_distribucion': distribucion('Modalidad', beca),
+            'estrato_distribucion': distribucion('Estrato_socioeconomico', beca),
+            'migracion_distribucion': distribucion('Migracion', beca)
         }
         
         reportes[beca] = reporte
@@ -64,27 +134,29 @@ def generar_reporte_por_beca(df):
     print("\n✓ Reporte detallado guardado en: reporte_detallado_por_beca.json")
     return reportes
 
-def generar_reporte_por_departamento(df):
+def generar_reporte_por_departamento(cubo):
     """Genera un reporte por departamento"""
     print("\n" + "="*80)
     print("REPORTE POR DEPARTAMENTO")
     print("="*80)
     
-    departamentos = df['Departamento'].value_counts().head(20)
+    departamentos = conteos(cubo, 'Departamento').head(20)
     
     print(f"\nTop 20 Departamentos con más becas:")
     for i, (dept, count) in enumerate(departamentos.items(), 1):
         print(f"{i:2d}. {dept:30s} - {count:4d} becas")
     
     # Análisis por departamento
+    becas_tipos = conteos_por(cubo, 'Departamento', 'NombreBeca')
+    instituciones = conteos_por(cubo, 'Departamento', 'Institucion')
+    modalidades = conteos_por(cubo, 'Departamento', 'Modalidad') if 'Modalidad' in cubo.index.names else {}
     reporte_dept = {}
-    for dept in departamentos.index[:10]:  # Top 10
-        df_dept = df[df['Departamento'] == dept]
+    for dept, count in list(departamentos.items())[:10]:  # Top 10
         reporte_dept[dept] = {
-            'total_becas': len(df_dept),
-            'becas_tipos': df_dept['NombreBeca'].value_counts().to_dict(),
-            'instituciones_unicas': df_dept['Institucion'].nunique(),
-            'modalidades': df_dept['Modalidad'].value_counts().to_dict() if 'Modalidad' in df_dept.columns else {}
+            'total_becas': int(count),
+            'becas_tipos': becas_tipos.get(dept, {}),
+            'instituciones_unicas': len(instituciones.get(dept, {})),
+            'modalidades': modalidades.get(dept, {})
         }
     
     with open('reporte_por_departamento.json', 'w', encoding='utf-8') as f:
@@ -92,123 +164,126 @@ def generar_reporte_por_departamento(df):
     
     print("\n✓ Reporte por departamento guardado en: reporte_por_departamento.json")
 
-def generar_reporte_migracion(df):
+def generar_reporte_migracion(cubo):
     """Analiza los patrones de migración"""
     print("\n" + "="*80)
     print("ANÁLISIS DE MIGRACIÓN")
     print("="*80)
     
-    if 'Migracion' not in df.columns:
+    if 'Migracion' not in cubo.index.names:
         print("No hay datos de migración disponibles")
         return
     
-    migracion = df['Migracion'].value_counts()
+    migracion = conteos(cubo, 'Migracion')
     
     print("\nDistribución de migración:")
     for tipo, count in migracion.items():
-        porcentaje = (count / len(df)) * 100
+        porcentaje = (count / total(cubo)) * 100
         print(f"  • {tipo}: {count} ({porcentaje:.1f}%)")
     
     # Análisis por beca
     print("\nMigración por tipo de beca:")
-    for beca in df['NombreBeca'].unique()[:10]:  # Top 10 becas
-        df_beca = df[df['NombreBeca'] == beca]
-        if 'Migracion' in df_beca.columns:
-            mig = df_beca['Migracion'].value_counts()
-            print(f"\n  {beca}:")
-            for tipo, count in mig.items():
-                print(f"    - {tipo}: {count}")
+    migracion_por_beca = conteos_por(cubo, 'NombreBeca', 'Migracion')
+    for beca in orden_de_aparicion(cubo, 'NombreBeca')[:10]:  # Top 10 becas
+        mig = migracion_por_beca.get(beca, {})
+        print(f"\n  {beca}:")
+        for tipo, count in mig.items():
+            print(f"    - {tipo}: {count}")
 
-def generar_reporte_estratos(df):
+def generar_reporte_estratos(cubo):
     """Analiza los estratos socioeconómicos"""
     print("\n" + "="*80)
     print("ANÁLISIS DE ESTRATOS SOCIOECONÓMICOS")
     print("="*80)
     
-    if 'Estrato_socioeconomico' not in df.columns:
+    if 'Estrato_socioeconomico' not in cubo.index.names:
         print("No hay datos de estrato socioeconómico disponibles")
         return
     
-    estratos = df['Estrato_socioeconomico'].value_counts()
+    estratos = conteos(cubo, 'Estrato_socioeconomico')
     
     print("\nDistribución de estratos socioeconómicos:")
-    total = len(df)
+    total_registros = total(cubo)
     for estrato, count in estratos.items():
-        porcentaje = (count / total) * 100
+        porcentaje = (count / total_registros) * 100
         print(f"  • {estrato}: {count} ({porcentaje:.1f}%)")
     
     # Por beca
     print("\nEstrato socioeconómico por tipo de beca:")
+    totales = totales_por(cubo, 'NombreBeca')
+    estratos_por_beca = conteos_por(cubo, 'NombreBeca', 'Estrato_socioeconomico')
     for beca in ['Beca 18', 'Beca Tec', 'Beca Perú']:
-        df_beca = df[df['NombreBeca'] == beca]
-        if not df_beca.empty and 'Estrato_socioeconomico' in df_beca.columns:
+        if beca in totales:
             print(f"\n  {beca}:")
-            estratos_beca = df_beca['Estrato_socioeconomico'].value_counts()
+            estratos_beca = estratos_por_beca.get(beca, {})
             for estrato, count in estratos_beca.items():
-                porcentaje = (count / len(df_beca)) * 100
+                porcentaje = (count / totales[beca]) * 100
                 print(f"    - {estrato}: {count} ({porcentaje:.1f}%)")
 
-def generar_reporte_modalidades(df):
+def generar_reporte_modalidades(cubo):
     """Analiza las modalidades de becas"""
     print("\n" + "="*80)
     print("ANÁLISIS DE MODALIDADES")
     print("="*80)
     
-    if 'Modalidad' not in df.columns:
+    if 'Modalidad' not in cubo.index.names:
         print("No hay datos de modalidad disponibles")
         return
     
-    modalidades = df['Modalidad'].value_counts().head(15)
+    modalidades = conteos(cubo, 'Modalidad').head(15)
     
     print("\nTop 15 Modalidades más comunes:")
     for i, (mod, count) in enumerate(modalidades.items(), 1):
-        porcentaje = (count / len(df)) * 100
+        porcentaje = (count / total(cubo)) * 100
         print(f"{i:2d}. {mod:40s} - {count:4d} ({porcentaje:5.1f}%)")
 
-def generar_resumen_ejecutivo(df):
+def generar_resumen_ejecutivo(cubo):
     """Genera un resumen ejecutivo en formato de texto"""
     print("\n" + "="*80)
     print("RESUMEN EJECUTIVO - BECAS 2025")
     print("="*80)
     
+    dimensiones = cubo.index.names
+    total_registros = total(cubo)
+    
     resumen = f"""
 RESUMEN EJECUTIVO DE BECAS - AÑO 2025
 Fecha de generación: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
 1. DATOS GENERALES
-   • Total de registros procesados: {len(df):,}
-   • Programas de becas diferentes: {df['NombreBeca'].nunique()}
-   • Instituciones educativas participantes: {df['Institucion'].nunique()}
-   • Departamentos con cobertura: {df['Departamento'].nunique()}
+   • Total de registros procesados: {total_registros:,}
+   • Programas de becas diferentes: {unicos(cubo, 'NombreBeca')}
+   • Instituciones educativas participantes: {unicos(cubo, 'Institucion')}
+   • Departamentos con cobertura: {unicos(cubo, 'Departamento')}
 
 2. PROGRAMAS DE BECAS MÁS IMPORTANTES
 """
     
-    for beca, count in df['NombreBeca'].value_counts().head(5).items():
-        porcentaje = (count / len(df)) * 100
+    for beca, count in conteos(cubo, 'NombreBeca').head(5).items():
+        porcentaje = (count / total_registros) * 100
         resumen += f"   • {beca}: {count:,} registros ({porcentaje:.1f}%)\n"
     
     resumen += "\n3. COBERTURA GEOGRÁFICA (Top 10 Departamentos)\n"
-    for dept, count in df['Departamento'].value_counts().head(10).items():
-        porcentaje = (count / len(df)) * 100
+    for dept, count in conteos(cubo, 'Departamento').head(10).items():
+        porcentaje = (count / total_registros) * 100
         resumen += f"   • {dept}: {count:,} becas ({porcentaje:.1f}%)\n"
     
-    if 'Modalidad' in df.columns:
+    if 'Modalidad' in dimensiones:
         resumen += "\n4. MODALIDADES PRINCIPALES\n"
-        for mod, count in df['Modalidad'].value_counts().head(5).items():
-            porcentaje = (count / len(df)) * 100
+        for mod, count in conteos(cubo, 'Modalidad').head(5).items():
+            porcentaje = (count / total_registros) * 100
             resumen += f"   • {mod}: {count:,} ({porcentaje:.1f}%)\n"
     
-    if 'Estrato_socioeconomico' in df.columns:
+    if 'Estrato_socioeconomico' in dimensiones:
         resumen += "\n5. ENFOQUE SOCIOECONÓMICO\n"
-        for estrato, count in df['Estrato_socioeconomico'].value_counts().head(5).items():
-            porcentaje = (count / len(df)) * 100
+        for estrato, count in conteos(cubo, 'Estrato_socioeconomico').head(5).items():
+            porcentaje = (count / total_registros) * 100
             resumen += f"   • {estrato}: {count:,} ({porcentaje:.1f}%)\n"
     
-    if 'Migracion' in df.columns:
+    if 'Migracion' in dimensiones:
         resumen += "\n6. ANÁLISIS DE MIGRACIÓN\n"
-        for mig, count in df['Migracion'].value_counts().items():
-            porcentaje = (count / len(df)) * 100
+        for mig, count in conteos(cubo, 'Migracion').items():
+            porcentaje = (count / total_registros) * 100
             resumen += f"   • {mig}: {count:,} ({porcentaje:.1f}%)\n"
     
     resumen += """
@@ -280,14 +355,15 @@ def main():
     
     # Cargar datos
     df = cargar_datos()
+    cubo = construir_cubo(df)
     
     # Generar reportes
-    generar_reporte_por_beca(df)
-    generar_reporte_por_departamento(df)
-    generar_reporte_migracion(df)
-    generar_reporte_estratos(df)
-    generar_reporte_modalidades(df)
-    generar_resumen_ejecutivo(df)
+    generar_reporte_por_beca(cubo)
+    generar_reporte_por_departamento(cubo)
+    generar_reporte_migracion(cubo)
+    generar_reporte_estratos(cubo)
+    generar_reporte_modalidades(cubo)
+    generar_resumen_ejecutivo(cubo)
     generar_csv_simplificado(df)
     
     print("\n" + "="*80)
@@ -10,15 +10,180 @@ Fecha: 2025
 
 import requests
 from bs4 import BeautifulSoup
-import pandas as pd
+import csv
 import json
+import os
+import shutil
+import tempfile
 import time
 import logging
-from typing import List, Dict, Optional
+from typing import Dict, Iterator, Optional
 from urllib.parse import urljoin, urlparse
 import re
 from datetime import datetime
 
+class AcumuladorEstadisticas:
+    """
+    Estadísticas de instituciones que se actualizan registro a registro
+    
+    expandir_datos_instituciones llama a agregar() por cada registro que genera, así que
+    las estadísticas salen de la misma pasada que la expansión. Instituciones, programas y
+    becas se guardan en los conjuntos como IDs enteros (cada texto se interna una vez).
+    """
+    
+    def __init__(self):
+        self.total_registros = 0
+        self.ids: Dict[str, int] = {}
+        self.por_beca: Dict[str, Dict] = {}
+        self.por_region: Dict[str, Dict] = {}
+        self.por_tipo: Dict[str, Dict] = {}
+        self.por_programa: Dict[str, Dict] = {}
+    
+    def interno(self, texto: str) -> int:
+        """ID entero de un texto; el mismo texto siempre recibe el mismo ID"""
+        return self.ids.setdefault(texto, len(self.ids))
+    
+    def agregar(self, registro: Dict):
+        """Suma un registro beca-institución-programa a todas las estadísticas"""
+        self.total_registros += 1
+        institucion = self.interno(registro['nombre_institucion'])
+        programa = self.interno(registro['programa'])
+        beca = self.interno(registro['nombre_beca'])
+        
+        datos = self.por_beca.get(registro['codigo_beca'])
+        if datos is None:
+            datos = self.por_beca[registro['codigo_beca']] = {
+                'total_registros': 0, 'instituciones': set(), 'programas': set(), 'regiones': set()}
+        datos['total_registros'] += 1
+        datos['instituciones'].add(institucion)
+        datos['programas'].add(programa)
+        datos['regiones'].add(self.interno(registro['region']))
+        
+        datos = self.por_region.get(registro['region'])
+        if datos is None:
+            datos = self.por_region[registro['region']] = {
+                'total_registros': 0, 'instituciones': set(), 'becas': set()}
+        datos['total_registros'] += 1
+        datos['instituciones'].add(institucion)
+        datos['becas'].add(beca)
+        
+        datos = self.por_tipo.get(registro['tipo_institucion'])
+        if datos is None:
+            datos = self.por_tipo[registro['tipo_institucion']] = {
+                'total_registros': 0, 'instituciones': set()}
+        datos['total_registros'] += 1
+        datos['instituciones'].add(institucion)
+        
+        datos = self.por_programa.get(registro['programa'])
+        if datos is None:
+            datos = self.por_programa[registro['programa']] = {
+                'frecuencia': 0, 'becas': set(), 'instituciones': set()}
+        datos['frecuencia'] += 1
+        datos['becas'].add(beca)
+        datos['instituciones'].add(institucion)
+
+
+class SalidaCSV:
+    """CSV que se escribe registro a registro, con el mismo formato que DataFrame.to_csv"""
+    
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        self.total = 0
+        self.archivo = None
+        self.escritor = None
+    
+    def agregar(self, registro: Dict):
+        if self.archivo is None:
+            self._abrir(registro)
+        self.escritor.writerow(registro)
+        self.total += 1
+    
+    def _abrir(self, registro: Dict):
+        # El encabezado sale de las claves del primer registro; si el CSV ya se había
+        # cerrado, se vuelve a abrir para seguir escribiendo al final
+        nuevo = self.escritor is None
+        campos = list(registro) if nuevo else self.escritor.fieldnames
+        self.archivo = open(self.ruta, 'w' if nuevo else 'a', encoding='utf-8-sig', newline='')
+        self.escritor = csv.DictWriter(self.archivo, fieldnames=campos, lineterminator=os.linesep)
+        if nuevo:
+            self.escritor.writeheader()
+    
+    def cerrar(self):
+        if self.archivo is not None:
+            self.archivo.close()
+            self.archivo = None
+
+
+class SalidaCSVPorBeca:
+    """
+    Un CSV instituciones_{codigo_beca}.csv por beca, todos escritos en la misma pasada
+    
+    Los registros llegan agrupados por beca, así que solo queda abierto el CSV de la beca
+    actual: al cambiar de beca se cierra el anterior.
+    """
+    
+    def __init__(self, patron: str = 'instituciones_{}.csv'):
+        self.patron = patron
+        self.salidas: Dict[str, SalidaCSV] = {}
+        self.actual: Optional[SalidaCSV] = None
+    
+    def agregar(self, registro: Dict):
+        codigo_beca = registro['codigo_beca']
+        salida = self.salidas.get(codigo_beca)
+        if salida is None:
+            salida = self.salidas[codigo_beca] = SalidaCSV(self.patron.format(codigo_beca))
+        if salida is not self.actual:
+            if self.actual is not None:
+                self.actual.cerrar()
+            self.actual = salida
+        salida.agregar(registro)
+    
+    def cerrar(self):
+        for salida in self.salidas.values():
+            salida.cerrar()
+
+
+class SalidaJSON:
+    """
+    JSON {..., 'datos': [registros]} que se escribe registro a registro
+    
+    Los registros se guardan en un archivo temporal a medida que llegan. Al cerrar, cuando
+    ya se conocen el total y las estadísticas, se escribe la cabecera y se copian los
+    registros detrás, con el mismo formato que json.dump(indent=2).
+    """
+    
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        self.total = 0
+        self.temporal = tempfile.TemporaryFile('w+', encoding='utf-8')
+    
+    def agregar(self, registro: Dict):
+        # Cada registro va dentro de la lista 'datos', dos niveles de sangría más adentro
+        texto = json.dumps(registro, ensure_ascii=False, indent=2).replace('\n', '\n    ')
+        self.temporal.write((',\n    ' if self.total else '    ') + texto)
+        self.total += 1
+    
+    def cerrar(self, cabecera: Optional[Dict] = None):
+        """Escribe el archivo final: las claves de `cabecera` y luego 'datos'"""
+        try:
+            contenido = json.dumps({**(cabecera or {}), 'datos': []}, ensure_ascii=False, indent=2)
+            with open(self.ruta, 'w', encoding='utf-8') as f:
+                if not self.total:
+                    f.write(contenido)
+                    return
+                # contenido termina en '"datos": []\n}'
+                f.write(contenido[:-len(']\n}')] + '\n')
+                self.temporal.seek(0)
+                shutil.copyfileobj(self.temporal, f)
+                f.write('\n  ]\n}')
+        finally:
+            self.temporal.close()
+    
+    def descartar(self):
+        """Libera el archivo temporal sin escribir el JSON"""
+        self.temporal.close()
+
+
 class BecasInstitucionesScraper:
     """
     Scraper para extraer instituciones educativas por cada beca
@@ -256,7 +421,7 @@ class BecasInstitucionesScraper:
                             {'nombre': 'Diseño Publicitario', 'modalidad': 'Presencial', 'sede': 'La Victoria'},
                             {'nombre': 'Traducción e Interpretación de Idiomas', 'modalidad': 'Presencial', 'sede': 'La Victoria'}
                         ]
-                    }
+                    },
                     # LAMBAYEQUE (continuación)
                     {
                         'nombre': 'IES Privado IDAT',
@@ -588,10 +753,11 @@ class BecasInstitucionesScraper:
             }
         }
     
-    def expandir_datos_instituciones(self) -> List[Dict]:
-        """Expande los datos para crear registros beca-institución-programa"""
-        datos_expandidos = []
-        
+    def expandir_datos_instituciones(self, acumulador: Optional[AcumuladorEstadisticas] = None) -> Iterator[Dict]:
+        """
+        Genera, uno a uno, los registros beca-institución-programa; si se pasa un
+        acumulador, cada registro se suma a sus estadísticas antes de entregarse
+        """
         for codigo_beca, info_beca in self.instituciones_por_beca.items():
             nombre_beca = info_beca['nombre_beca']
             tipo_instituciones = info_beca['tipo_instituciones']
@@ -618,7 +784,9 @@ class BecasInstitucionesScraper:
                             'modalidad_programa': programa['modalidad'],
                             'sede_programa': programa.get('sede', ubicacion)
                         }
-                        datos_expandidos.append(registro)
+                        if acumulador is not None:
+                            acumulador.agregar(registro)
+                        yield registro
                 else:
                     # Para becas sin programas específicos (como becas internacionales)
                     registro = {
@@ -634,15 +802,15 @@ class BecasInstitucionesScraper:
                         'modalidad_programa': 'Variable',
                         'sede_programa': ubicacion
                     }
-                    datos_expandidos.append(registro)
-        
-        return datos_expandidos
+                    if acumulador is not None:
+                        acumulador.agregar(registro)
+                    yield registro
     
-    def generar_estadisticas_instituciones(self, datos_expandidos: List[Dict]) -> Dict:
-        """Genera estadísticas de las instituciones por beca"""
+    def generar_estadisticas_instituciones(self, acumulador: AcumuladorEstadisticas) -> Dict:
+        """Genera estadísticas de las instituciones por beca a partir del acumulador"""
         estadisticas = {
             'fecha_generacion': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'total_registros': len(datos_expandidos),
+            'total_registros': acumulador.total_registros,
             'total_becas': len(self.instituciones_por_beca),
             'resumen_por_beca': {},
             'resumen_por_region': {},
@@ -650,31 +818,20 @@ class BecasInstitucionesScraper:
             'programas_mas_comunes': {}
         }
         
-        # Estadísticas por beca
+        # Estadísticas por beca (también las que no generaron registros)
+        sin_registros = {'total_registros': 0, 'instituciones': set(), 'programas': set()}
         for codigo_beca, info_beca in self.instituciones_por_beca.items():
-            registros_beca = [r for r in datos_expandidos if r['codigo_beca'] == codigo_beca]
-            instituciones_unicas = len(set(r['nombre_institucion'] for r in registros_beca))
-            programas_unicos = len(set(r['programa'] for r in registros_beca))
-            
+            datos = acumulador.por_beca.get(codigo_beca, sin_registros)
             estadisticas['resumen_por_beca'][codigo_beca] = {
                 'nombre_beca': info_beca['nombre_beca'],
-                'total_registros': len(registros_beca),
-                'instituciones_unicas': instituciones_unicas,
-                'programas_unicos': programas_unicos,
+                'total_registros': datos['total_registros'],
+                'instituciones_unicas': len(datos['instituciones']),
+                'programas_unicos': len(datos['programas']),
                 'tipo_instituciones': info_beca['tipo_instituciones']
             }
         
         # Estadísticas por región
-        regiones = {}
-        for registro in datos_expandidos:
-            region = registro['region']
-            if region not in regiones:
-                regiones[region] = {'total_registros': 0, 'instituciones': set(), 'becas': set()}
-            regiones[region]['total_registros'] += 1
-            regiones[region]['instituciones'].add(registro['nombre_institucion'])
-            regiones[region]['becas'].add(registro['nombre_beca'])
-        
-        for region, datos in regiones.items():
+        for region, datos in acumulador.por_region.items():
             estadisticas['resumen_por_region'][region] = {
                 'total_registros': datos['total_registros'],
                 'instituciones_unicas': len(datos['instituciones']),
@@ -682,32 +839,14 @@ class BecasInstitucionesScraper:
             }
         
         # Estadísticas por tipo de institución
-        tipos = {}
-        for registro in datos_expandidos:
-            tipo = registro['tipo_institucion']
-            if tipo not in tipos:
-                tipos[tipo] = {'total_registros': 0, 'instituciones': set()}
-            tipos[tipo]['total_registros'] += 1
-            tipos[tipo]['instituciones'].add(registro['nombre_institucion'])
-        
-        for tipo, datos in tipos.items():
+        for tipo, datos in acumulador.por_tipo.items():
             estadisticas['resumen_por_tipo_institucion'][tipo] = {
                 'total_registros': datos['total_registros'],
                 'instituciones_unicas': len(datos['instituciones'])
             }
         
-        # Programas más comunes
-        programas = {}
-        for registro in datos_expandidos:
-            programa = registro['programa']
-            if programa not in programas:
-                programas[programa] = {'frecuencia': 0, 'becas': set(), 'instituciones': set()}
-            programas[programa]['frecuencia'] += 1
-            programas[programa]['becas'].add(registro['nombre_beca'])
-            programas[programa]['instituciones'].add(registro['nombre_institucion'])
-        
         # Top 10 programas más comunes
-        programas_ordenados = sorted(programas.items(), key=lambda x: x[1]['frecuencia'], reverse=True)[:10]
+        programas_ordenados = sorted(acumulador.por_programa.items(), key=lambda x: x[1]['frecuencia'], reverse=True)[:10]
         for programa, datos in programas_ordenados:
             estadisticas['programas_mas_comunes'][programa] = {
                 'frecuencia': datos['frecuencia'],
@@ -717,16 +856,6 @@ class BecasInstitucionesScraper:
         
         return estadisticas
     
-    def guardar_csv_instituciones(self, datos_expandidos: List[Dict], nombre_archivo: str):
-        """Guarda los datos expandidos en formato CSV"""
-        try:
-            df = pd.DataFrame(datos_expandidos)
-            df.to_csv(nombre_archivo, index=False, encoding='utf-8-sig')
-            self.logger.info(f"Archivo CSV guardado: {nombre_archivo}")
-            self.logger.info(f"Total de registros: {len(datos_expandidos)}")
-        except Exception as e:
-            self.logger.error(f"Error al guardar CSV {nombre_archivo}: {str(e)}")
-    
     def guardar_json_instituciones(self, datos: Dict, nombre_archivo: str):
         """Guarda los datos en formato JSON"""
         try:
@@ -736,82 +865,93 @@ class BecasInstitucionesScraper:
         except Exception as e:
             self.logger.error(f"Error al guardar JSON {nombre_archivo}: {str(e)}")
     
-    def generar_reporte_por_beca(self, datos_expandidos: List[Dict]):
-        """Genera reportes individuales por cada beca"""
+    def generar_reporte_por_beca(self, acumulador: AcumuladorEstadisticas, salida_por_beca: SalidaCSVPorBeca):
+        """Registra el resumen de cada beca y el CSV individual que se le generó"""
         for codigo_beca, info_beca in self.instituciones_por_beca.items():
-            registros_beca = [r for r in datos_expandidos if r['codigo_beca'] == codigo_beca]
+            datos = acumulador.por_beca.get(codigo_beca)
             
-            if registros_beca:
-                # CSV por beca
-                nombre_csv = f"instituciones_{codigo_beca}.csv"
-                df_beca = pd.DataFrame(registros_beca)
-                df_beca.to_csv(nombre_csv, index=False, encoding='utf-8-sig')
-                
-                # Estadísticas por beca
-                instituciones_unicas = len(set(r['nombre_institucion'] for r in registros_beca))
-                programas_unicos = len(set(r['programa'] for r in registros_beca))
-                regiones_unicas = len(set(r['region'] for r in registros_beca))
-                
+            if datos:
                 self.logger.info(f"\n=== {info_beca['nombre_beca']} ===")
-                self.logger.info(f"Total registros: {len(registros_beca)}")
-                self.logger.info(f"Instituciones únicas: {instituciones_unicas}")
-                self.logger.info(f"Programas únicos: {programas_unicos}")
-                self.logger.info(f"Regiones con presencia: {regiones_unicas}")
-                self.logger.info(f"Archivo generado: {nombre_csv}")
+                self.logger.info(f"Total registros: {datos['total_registros']}")
+                self.logger.info(f"Instituciones únicas: {len(datos['instituciones'])}")
+                self.logger.info(f"Programas únicos: {len(datos['programas'])}")
+                self.logger.info(f"Regiones con presencia: {len(datos['regiones'])}")
+                self.logger.info(f"Archivo generado: {salida_por_beca.salidas[codigo_beca].ruta}")
     
     def ejecutar_procesamiento_completo(self):
-        """Ejecuta el procesamiento completo de instituciones por beca"""
-        self.logger.info("=== INICIANDO PROCESAMIENTO DE INSTITUCIONES POR BECA ===")
+        """
+        Ejecuta el procesamiento completo de instituciones por beca
         
-        # Expandir datos
-        self.logger.info("Expandiendo datos de instituciones...")
-        datos_expandidos = self.expandir_datos_instituciones()
+        Los registros se generan de a uno y cada uno pasa a la vez por el acumulador de
+        estadísticas, el CSV completo, los CSV por beca y el JSON completo; ninguna
+        salida guarda la lista entera de registros en memoria.
+        """
+        self.logger.info("=== INICIANDO PROCESAMIENTO DE INSTITUCIONES POR BECA ===")
         
-        # Generar estadísticas
-        self.logger.info("Generando estadísticas...")
-        estadisticas = self.generar_estadisticas_instituciones(datos_expandidos)
+        acumulador = AcumuladorEstadisticas()
+        csv_completo = SalidaCSV("becas_instituciones_completo.csv")
+        csv_por_beca = SalidaCSVPorBeca()
+        json_completo = SalidaJSON("becas_instituciones_completo.json")
+        salidas = [csv_completo, csv_por_beca, json_completo]
         
-        # Guardar archivo principal CSV
-        self.logger.info("Guardando archivo CSV principal...")
-        self.guardar_csv_instituciones(datos_expandidos, "becas_instituciones_completo.csv")
+        # Expandir datos y escribir los archivos en la misma pasada
+        self.logger.info("Expandiendo datos de instituciones y escribiendo archivos...")
+        try:
+            for registro in self.expandir_datos_instituciones(acumulador):
+                for salida in salidas:
+                    salida.agregar(registro)
+        except BaseException:
+            # Sin la expansión completa no se escribe el JSON
+            json_completo.descartar()
+            raise
+        finally:
+            csv_completo.cerrar()
+            csv_por_beca.cerrar()
+        self.logger.info(f"Archivo CSV guardado: {csv_completo.ruta}")
+        self.logger.info(f"Total de registros: {csv_completo.total}")
         
-        # Guardar archivo principal JSON
-        datos_completos = {
-            'metadatos': {
-                'descripcion': 'Instituciones educativas por beca - Formato expandido',
-                'fecha_generacion': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'version': '1.0',
-                'total_registros': len(datos_expandidos)
-            },
-            'estadisticas': estadisticas,
-            'datos': datos_expandidos
-        }
+        # Generar estadísticas (acumuladas durante la expansión)
+        self.logger.info("Generando estadísticas...")
+        estadisticas = self.generar_estadisticas_instituciones(acumulador)
         
+        # Cerrar archivo principal JSON con metadatos y estadísticas
         self.logger.info("Guardando archivo JSON principal...")
-        self.guardar_json_instituciones(datos_completos, "becas_instituciones_completo.json")
+        try:
+            json_completo.cerrar({
+                'metadatos': {
+                    'descripcion': 'Instituciones educativas por beca - Formato expandido',
+                    'fecha_generacion': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                    'version': '1.0',
+                    'total_registros': acumulador.total_registros
+                },
+                'estadisticas': estadisticas
+            })
+            self.logger.info(f"Archivo JSON guardado: {json_completo.ruta}")
+        except Exception as e:
+            self.logger.error(f"Error al guardar JSON {json_completo.ruta}: {str(e)}")
         
-        # Generar reportes individuales por beca
+        # Resumen de los reportes individuales por beca
         self.logger.info("Generando reportes individuales por beca...")
-        self.generar_reporte_por_beca(datos_expandidos)
+        self.generar_reporte_por_beca(acumulador, csv_por_beca)
         
         # Guardar solo estadísticas
         self.logger.info("Guardando estadísticas...")
         self.guardar_json_instituciones(estadisticas, "estadisticas_instituciones.json")
         
         self.logger.info("\n=== PROCESAMIENTO COMPLETADO ===")
-        self.logger.info(f"Total de registros procesados: {len(datos_expandidos)}")
+        self.logger.info(f"Total de registros procesados: {acumulador.total_registros}")
         self.logger.info(f"Total de becas procesadas: {len(self.instituciones_por_beca)}")
         
-        return datos_expandidos, estadisticas
+        return estadisticas
 
 
 def main():
     """Función principal"""
     scraper = BecasInstitucionesScraper()
-    datos_expandidos, estadisticas = scraper.ejecutar_procesamiento_completo()
+    estadisticas = scraper.ejecutar_procesamiento_completo()
     
     print("\n=== RESUMEN FINAL ===")
-    print(f"Total de registros generados: {len(datos_expandidos)}")
+    print(f"Total de registros generados: {estadisticas['total_registros']}")
     print(f"Total de becas procesadas: {estadisticas['total_becas']}")
     print("\nArchivos generados:")
     print("- becas_instituciones_completo.csv")
@@ -14,270 +14,312 @@ Campos del dashboard:
 """
 
 import pandas as pd
+import numpy as np
+from pandas.api.types import is_numeric_dtype
+import argparse
 import json
 from datetime import datetime
 import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
 
-def extraer_datos_beca18_expandido():
-    """Extrae datos de Beca 18 con información detallada de universidades"""
-    print("Extrayendo datos de beca18_datos_expandido.csv...")
-    
-    try:
-        df = pd.read_csv('beca18_datos_expandido.csv')
-        
-        # Filtrar por convocatoria 2025
-        df_2025 = df[df['convocatoria'] == 2025].copy()
-        
-        # Crear dataset para dashboard
-        datos_dashboard = []
-        
-        for _, row in df_2025.iterrows():
-            # Extraer estrato socioeconómico de la descripción y modalidad
-            estrato = "No especificado"
-            if row['modalidad'] in ['Ordinaria', 'Huallaga', 'Vraem']:
-                estrato = "Pobre o Pobre Extrema"
-            elif row['modalidad'] in ['EIB', 'Protección', 'CNA y PA', 'FF.AA.']:
-                estrato = "Variable"
-            elif row['modalidad'] == 'Repared':
-                estrato = "Víctimas de violencia"
-            
-            registro = {
-                'NombreBeca': 'Beca 18',
-                'Institucion': row['nombre_universidad'],
-                'AnioBecariosConfirmados': 2025,
-                'Departamento': row['ubicacion'] if pd.notna(row['ubicacion']) and row['ubicacion'] != '' else 'No especificado',
-                'Carrera': 'Todas las carreras elegibles',  # Beca 18 no especifica carreras específicas
-                'Modalidad': row['modalidad'],
-                'Estrato_socioeconomico': estrato,
-                'TipoUniversidad': row['tipo_universidad'],
-                'Estado': row['estado'],
-                'Quintil': row['quintil'],
-                'NotaMinima': row['nota_minima'],
-                'Fuente': row['fuente']
-            }
-            
-            datos_dashboard.append(registro)
-        
-        df_result = pd.DataFrame(datos_dashboard)
-        print(f"  ✓ Extraídos {len(df_result)} registros de Beca 18")
-        return df_result
-        
-    except Exception as e:
-        print(f"  ✗ Error al procesar beca18_datos_expandido.csv: {e}")
-        return pd.DataFrame()
+# Dataset consolidado: el Parquet es el que leen los demás scripts del año;
+# CSV y JSON son exportaciones opcionales
+ARCHIVO_CONSOLIDADO = 'dashboard_becas_2025_consolidado.parquet'
+ARCHIVO_CONSOLIDADO_CSV = 'dashboard_becas_2025_consolidado.csv'
+ARCHIVO_CONSOLIDADO_JSON = 'dashboard_becas_2025_consolidado.json'
+EXPORTACIONES = ('csv', 'json')
 
+# ----- ESQUEMA FUENTE -> DASHBOARD -----
+# Cada fuente declara cómo se obtiene cada columna del dashboard a partir de sus
+# columnas; las reglas se aplican a la columna completa, sin recorrer filas.
 
-def extraer_datos_instituciones_beca18():
-    """Extrae datos de instituciones de Beca 18"""
-    print("Extrayendo datos de instituciones_beca_18.csv...")
-    
-    try:
-        df = pd.read_csv('instituciones_beca_18.csv')
-        
-        datos_dashboard = []
-        
-        for _, row in df.iterrows():
-            registro = {
-                'NombreBeca': row['nombre_beca'],
-                'Institucion': row['nombre_institucion'],
-                'AnioBecariosConfirmados': 2025,
-                'Departamento': row['ubicacion'] if row['ubicacion'] != 'No especificada' else 'Nacional',
-                'Carrera': 'Según modalidad',
-                'Modalidad': row['modalidad_programa'],
-                'Estrato_socioeconomico': 'Variable según modalidad',
-                'TipoInstitucion': row['tipo_institucion'],
-                'Region': row['region'],
-                'CodigoBeca': row['codigo_beca']
-            }
-            
-            datos_dashboard.append(registro)
-        
-        df_result = pd.DataFrame(datos_dashboard)
-        print(f"  ✓ Extraídos {len(df_result)} registros de instituciones Beca 18")
-        return df_result
-        
-    except Exception as e:
-        print(f"  ✗ Error al procesar instituciones_beca_18.csv: {e}")
-        return pd.DataFrame()
+class Regla:
+    """Cómo se obtiene una columna del dashboard a partir del DataFrame de una fuente"""
 
+    def aplicar(self, df):
+        raise NotImplementedError
 
-def extraer_datos_beca_tec():
-    """Extrae datos de Beca Tec"""
-    print("Extrayendo datos de Beca Tec...")
-    
-    try:
-        # Leer instituciones_beca_tec.csv
-        df = pd.read_csv('instituciones_beca_tec.csv')
-        
-        datos_dashboard = []
-        
-        for _, row in df.iterrows():
-            # Extraer región del campo ubicacion
-            departamento = row['region'] if pd.notna(row['region']) else 'No especificado'
-            
-            registro = {
-                'NombreBeca': 'Beca Tec',
-                'Institucion': row['nombre_institucion'],
-                'AnioBecariosConfirmados': 2025,
-                'Departamento': departamento,
-                'Carrera': row['programa'],
-                'Modalidad': row['modalidad_programa'],
-                'Estrato_socioeconomico': 'Estudiantes de institutos técnicos',
-                'TipoInstitucion': row['tipo_institucion'],
-                'Ubicacion': row['ubicacion'],
-                'CodigoBeca': row['codigo_beca']
-            }
-            
-            datos_dashboard.append(registro)
-        
-        df_result = pd.DataFrame(datos_dashboard)
-        print(f"  ✓ Extraídos {len(df_result)} registros de Beca Tec")
-        return df_result
-        
-    except Exception as e:
-        print(f"  ✗ Error al procesar Beca Tec: {e}")
-        return pd.DataFrame()
 
+class Constante(Regla):
+    """El mismo valor en todas las filas"""
 
-def extraer_datos_beca_peru():
-    """Extrae datos de Beca Perú"""
-    print("Extrayendo datos de Beca Perú...")
-    
-    try:
-        df = pd.read_csv('instituciones_beca_peru.csv')
-        
-        datos_dashboard = []
-        
-        for _, row in df.iterrows():
-            departamento = row['region'] if pd.notna(row['region']) and row['region'] != 'Nacional' else 'Lima'
-            
-            registro = {
-                'NombreBeca': 'Beca Perú',
-                'Institucion': row['nombre_institucion'],
-                'AnioBecariosConfirmados': 2025,
-                'Departamento': departamento,
-                'Carrera': row['programa'],
-                'Modalidad': row['modalidad_programa'],
-                'Estrato_socioeconomico': 'Variable según universidad',
-                'TipoInstitucion': row['tipo_institucion'],
-                'Ubicacion': row['ubicacion'],
-                'CodigoBeca': row['codigo_beca']
-            }
-            
-            datos_dashboard.append(registro)
-        
-        df_result = pd.DataFrame(datos_dashboard)
-        print(f"  ✓ Extraídos {len(df_result)} registros de Beca Perú")
-        return df_result
-        
-    except Exception as e:
-        print(f"  ✗ Error al procesar Beca Perú: {e}")
-        return pd.DataFrame()
+    def __init__(self, valor):
+        self.valor = valor
 
+    def aplicar(self, df):
+        return self.valor
 
-def extraer_datos_becas_internacionales():
-    """Extrae datos de becas internacionales (Chevening, Fulbright)"""
-    print("Extrayendo datos de becas internacionales...")
-    
-    datos_dashboard = []
-    
-    # Chevening
-    try:
-        df_chev = pd.read_csv('instituciones_chevening.csv')
-        for _, row in df_chev.iterrows():
-            registro = {
-                'NombreBeca': 'Becas Chevening',
-                'Institucion': row['nombre_institucion'],
-                'AnioBecariosConfirmados': 2025,
-                'Departamento': 'Reino Unido',
-                'Carrera': row['programa'],
-                'Modalidad': 'Internacional - Maestría',
-                'Estrato_socioeconomico': 'Profesionales con liderazgo',
-                'TipoInstitucion': row['tipo_institucion'],
-                'Ubicacion': row['ubicacion'],
-                'CodigoBeca': row['codigo_beca']
-            }
-            datos_dashboard.append(registro)
-        print(f"  ✓ Extraídos {len(df_chev)} registros de Chevening")
-    except Exception as e:
-        print(f"  ✗ Error al procesar Chevening: {e}")
-    
-    # Fulbright
-    try:
-        df_fulb = pd.read_csv('instituciones_fulbright.csv')
-        for _, row in df_fulb.iterrows():
-            registro = {
-                'NombreBeca': 'Becas Fulbright',
-                'Institucion': row['nombre_institucion'],
-                'AnioBecariosConfirmados': 2025,
-                'Departamento': 'Estados Unidos',
-                'Carrera': row['programa'],
-                'Modalidad': 'Internacional - Posgrado',
-                'Estrato_socioeconomico': 'Profesionales destacados',
-                'TipoInstitucion': row['tipo_institucion'],
-                'Ubicacion': row['ubicacion'],
-                'CodigoBeca': row['codigo_beca']
-            }
-            datos_dashboard.append(registro)
-        print(f"  ✓ Extraídos {len(df_fulb)} registros de Fulbright")
-    except Exception as e:
-        print(f"  ✗ Error al procesar Fulbright: {e}")
-    
-    return pd.DataFrame(datos_dashboard) if datos_dashboard else pd.DataFrame()
+
+class Columna(Regla):
+    """
+    Copia una columna de la fuente
+
+    `reemplazos` cambia valores puntuales; los valores en `vacios` (y los NaN) toman
+    `defecto`, que puede ser otra regla (p. ej. otra columna de la fuente).
+    """
+
+    def __init__(self, origen, defecto=None, vacios=(), reemplazos=None):
+        self.origen = origen
+        self.defecto = defecto
+        self.vacios = list(vacios)
+        self.reemplazos = reemplazos or {}
+
+    def aplicar(self, df):
+        serie = df[self.origen]
+        if self.reemplazos:
+            serie = serie.replace(self.reemplazos)
+        if self.vacios:
+            serie = serie.mask(serie.isin(self.vacios))
+        if self.defecto is None:
+            return serie
+        defecto = self.defecto.aplicar(df) if isinstance(self.defecto, Regla) else self.defecto
+        return serie.fillna(defecto)
+
+
+class Mapeo(Regla):
+    """Traduce los valores de una columna con una tabla; los demás toman `defecto`"""
+
+    def __init__(self, origen, tabla, defecto):
+        self.origen = origen
+        self.tabla = tabla
+        self.defecto = defecto
+
+    def aplicar(self, df):
+        return df[self.origen].map(self.tabla).fillna(self.defecto)
+
+
+class Contiene(Regla):
+    """Valor según la primera subcadena (en orden) que contiene una columna"""
+
+    def __init__(self, origen, opciones, defecto):
+        self.origen = origen
+        self.opciones = opciones
+        self.defecto = defecto
+
+    def aplicar(self, df):
+        texto = df[self.origen].astype(str)
+        condiciones = [texto.str.contains(s, regex=False) for s in self.opciones]
+        return pd.Series(np.select(condiciones, list(self.opciones.values()), self.defecto),
+                         index=df.index, dtype=object)
+
+
+class Fuente(NamedTuple):
+    """Un archivo de origen: qué filas se toman y cómo se llenan las columnas del dashboard"""
+    nombre: str
+    archivo: str
+    columnas: Dict[str, Regla]
+    # Columnas que se leen del archivo y su tipo (read_csv no infiere nada más)
+    tipos: Dict[str, object]
+    # (columna, valor): solo las filas con ese valor
+    filtro: Optional[Tuple[str, object]] = None
+
+
+# Estrato de Beca 18 según la modalidad
+ESTRATO_POR_MODALIDAD_BECA18 = {
+    **dict.fromkeys(['Ordinaria', 'Huallaga', 'Vraem'], 'Pobre o Pobre Extrema'),
+    **dict.fromkeys(['EIB', 'Protección', 'CNA y PA', 'FF.AA.'], 'Variable'),
+    'Repared': 'Víctimas de violencia',
+}
+
+
+# Columnas de los archivos instituciones_*.csv que usa el dashboard
+TIPOS_INSTITUCIONES = dict.fromkeys(['codigo_beca', 'nombre_beca', 'nombre_institucion',
+                                     'tipo_institucion', 'ubicacion', 'region', 'programa',
+                                     'modalidad_programa'], str)
+
+
+def columnas_instituciones(nombre_beca, departamento, modalidad, estrato):
+    """Esquema común de los archivos instituciones_*.csv de becas con programas"""
+    return {
+        'NombreBeca': Constante(nombre_beca),
+        'Institucion': Columna('nombre_institucion'),
+        'AnioBecariosConfirmados': Constante(2025),
+        'Departamento': departamento,
+        'Carrera': Columna('programa'),
+        'Modalidad': modalidad,
+        'Estrato_socioeconomico': Constante(estrato),
+        'TipoInstitucion': Columna('tipo_institucion'),
+        'Ubicacion': Columna('ubicacion'),
+        'CodigoBeca': Columna('codigo_beca'),
+    }
+
+
+# Fuentes del dashboard, en el orden en que se consolidan
+FUENTES = [
+    # Beca 18 con información detallada de universidades (solo convocatoria 2025)
+    Fuente('Beca 18', 'beca18_datos_expandido.csv', {
+        'NombreBeca': Constante('Beca 18'),
+        'Institucion': Columna('nombre_universidad'),
+        'AnioBecariosConfirmados': Constante(2025),
+        'Departamento': Columna('ubicacion', defecto='No especificado', vacios=['']),
+        'Carrera': Constante('Todas las carreras elegibles'),  # Beca 18 no especifica carreras específicas
+        'Modalidad': Columna('modalidad'),
+        'Estrato_socioeconomico': Mapeo('modalidad', ESTRATO_POR_MODALIDAD_BECA18, 'No especificado'),
+        'TipoUniversidad': Columna('tipo_universidad'),
+        'Estado': Columna('estado'),
+        'Quintil': Columna('quintil'),
+        'NotaMinima': Columna('nota_minima'),
+        'Fuente': Columna('fuente'),
+    }, {
+        **dict.fromkeys(['nombre_universidad', 'tipo_universidad', 'estado', 'ubicacion',
+                         'fuente', 'modalidad', 'nota_minima'], str),
+        'quintil': 'float64',
+        'convocatoria': 'int64',
+    }, filtro=('convocatoria', 2025)),
+    Fuente('instituciones Beca 18', 'instituciones_beca_18.csv', {
+        'NombreBeca': Columna('nombre_beca'),
+        'Institucion': Columna('nombre_institucion'),
+        'AnioBecariosConfirmados': Constante(2025),
+        'Departamento': Columna('ubicacion', reemplazos={'No especificada': 'Nacional'}),
+        'Carrera': Constante('Según modalidad'),
+        'Modalidad': Columna('modalidad_programa'),
+        'Estrato_socioeconomico': Constante('Variable según modalidad'),
+        'TipoInstitucion': Columna('tipo_institucion'),
+        'Region': Columna('region'),
+        'CodigoBeca': Columna('codigo_beca'),
+    }, TIPOS_INSTITUCIONES),
+    Fuente('Beca Tec', 'instituciones_beca_tec.csv', columnas_instituciones(
+        'Beca Tec', Columna('region', defecto='No especificado'),
+        Columna('modalidad_programa'), 'Estudiantes de institutos técnicos'),
+        TIPOS_INSTITUCIONES),
+    Fuente('Beca Perú', 'instituciones_beca_peru.csv', columnas_instituciones(
+        'Beca Perú', Columna('region', defecto='Lima', vacios=['Nacional']),
+        Columna('modalidad_programa'), 'Variable según universidad'),
+        TIPOS_INSTITUCIONES),
+    Fuente('Chevening', 'instituciones_chevening.csv', columnas_instituciones(
+        'Becas Chevening', Constante('Reino Unido'),
+        Constante('Internacional - Maestría'), 'Profesionales con liderazgo'),
+        TIPOS_INSTITUCIONES),
+    Fuente('Fulbright', 'instituciones_fulbright.csv', columnas_instituciones(
+        'Becas Fulbright', Constante('Estados Unidos'),
+        Constante('Internacional - Posgrado'), 'Profesionales destacados'),
+        TIPOS_INSTITUCIONES),
+    # Becas integrales activas para 2025
+    Fuente('becas integrales', 'becas_integrales_completo.csv', {
+        'NombreBeca': Columna('nombre'),
+        'Institucion': Columna('institucion'),
+        'AnioBecariosConfirmados': Constante(2025),
+        # Departamento según país destino
+        'Departamento': Columna('pais_destino', defecto='No especificado',
+                                reemplazos={'Perú': 'Nacional'}),
+        'Carrera': Columna('tipo_estudio', defecto='Variable'),
+        'Modalidad': Columna('modalidad', defecto=Columna('categoria')),
+        'Estrato_socioeconomico': Contiene('codigo_beca', {
+            'beca_18': 'Pobre o Pobre Extrema',
+            'vocacion_maestro': 'Variable',
+        }, defecto='No especificado'),
+        'Categoria': Columna('categoria'),
+        'Cobertura': Columna('cobertura'),
+        'CodigoBeca': Columna('codigo_beca'),
+        'Estado': Columna('estado'),
+        'URL_Oficial': Columna('url_oficial', defecto=''),
+    }, dict.fromkeys(['codigo_beca', 'nombre', 'institucion', 'categoria', 'tipo_estudio',
+                      'modalidad', 'cobertura', 'url_oficial', 'estado', 'pais_destino'], str),
+       filtro=('estado', 'Activa')),
+]
 
 
-def extraer_datos_becas_integrales():
-    """Extrae datos del archivo becas_integrales_completo.csv"""
-    print("Extrayendo datos de becas integrales...")
+def aplicar_esquema(df, fuente):
+    """Columnas del dashboard de una fuente, calculadas columna por columna"""
+    if fuente.filtro:
+        columna, valor = fuente.filtro
+        df = df[df[columna] == valor]
+    columnas = {nombre: regla.aplicar(df) for nombre, regla in fuente.columnas.items()}
+    return pd.DataFrame(columnas, index=df.index).reset_index(drop=True)
+
+
+def extraer_fuente(fuente):
+    """Lee las columnas declaradas de una fuente y la lleva al esquema del dashboard"""
+    df = pd.read_csv(fuente.archivo, usecols=list(fuente.tipos), dtype=fuente.tipos)
+    return aplicar_esquema(df, fuente)
+
+
+def extraer_fuentes(fuentes):
+    """
+    Extrae todas las fuentes a la vez, una por hilo, e informa el resultado de cada una
+    en el orden de `fuentes`; las que fallan o quedan vacías se omiten
+    """
+    print(f"Extrayendo datos de {len(fuentes)} fuentes...")
+    with ThreadPoolExecutor(max_workers=len(fuentes)) as ejecutor:
+        futuros = [ejecutor.submit(extraer_fuente, fuente) for fuente in fuentes]
     
-    try:
-        df = pd.read_csv('becas_integrales_completo.csv')
-        
-        # Filtrar solo becas activas para 2025
-        df_activas = df[df['estado'] == 'Activa'].copy()
-        
-        datos_dashboard = []
-        
-        for _, row in df_activas.iterrows():
-            # Determinar departamento según país destino
-            if pd.notna(row['pais_destino']) and row['pais_destino'] == 'Perú':
-                departamento = 'Nacional'
-            elif pd.notna(row['pais_destino']):
-                departamento = row['pais_destino']
-            else:
-                departamento = 'No especificado'
-            
-            # Determinar estrato socioeconómico
-            estrato = 'No especificado'
-            if 'beca_18' in row['codigo_beca']:
-                estrato = 'Pobre o Pobre Extrema'
-            elif 'vocacion_maestro' in row['codigo_beca']:
-                estrato = 'Variable'
-            
-            registro = {
-                'NombreBeca': row['nombre'],
-                'Institucion': row['institucion'],
-                'AnioBecariosConfirmados': 2025,
-                'Departamento': departamento,
-                'Carrera': row['tipo_estudio'] if pd.notna(row['tipo_estudio']) else 'Variable',
-                'Modalidad': row['modalidad'] if pd.notna(row['modalidad']) else row['categoria'],
-                'Estrato_socioeconomico': estrato,
-                'Categoria': row['categoria'],
-                'Cobertura': row['cobertura'],
-                'CodigoBeca': row['codigo_beca'],
-                'Estado': row['estado'],
-                'URL_Oficial': row['url_oficial'] if pd.notna(row['url_oficial']) else ''
-            }
-            
-            datos_dashboard.append(registro)
-        
-        df_result = pd.DataFrame(datos_dashboard)
-        print(f"  ✓ Extraídos {len(df_result)} registros de becas integrales")
-        return df_result
-        
-    except Exception as e:
-        print(f"  ✗ Error al procesar becas_integrales_completo.csv: {e}")
-        return pd.DataFrame()
+    datasets = []
+    for fuente, futuro in zip(fuentes, futuros):
+        try:
+            df_result = futuro.result()
+        except Exception as e:
+            print(f"  ✗ Error al procesar {fuente.archivo}: {e}")
+            continue
+        print(f"  ✓ Extraídos {len(df_result)} registros de {fuente.nombre}")
+        if not df_result.empty:
+            datasets.append(df_result)
+    return datasets
+
+
+def alinear_categorias(datasets):
+    """
+    Lleva los datasets a las mismas columnas, con las de texto como categóricas con las
+    mismas categorías (ordenadas), para que pd.concat no las convierta a object
+
+    Las categorías ordenadas alfabéticamente hacen que ordenar por estas columnas dé el
+    mismo orden que con texto.
+    """
+    columnas = list(dict.fromkeys(c for df in datasets for c in df.columns))
+    texto = [c for c in columnas
+             if any(c in df.columns and not is_numeric_dtype(df[c]) for df in datasets)]
+    categorias = {}
+    for c in texto:
+        valores = np.concatenate([df[c].dropna().to_numpy(dtype=object)
+                                  for df in datasets if c in df.columns])
+        categorias[c] = pd.Index(pd.unique(valores)).sort_values()
+    alineados = []
+    for df in datasets:
+        df = df.reindex(columns=columnas)
+        for c, cats in categorias.items():
+            df[c] = pd.Categorical(df[c], categories=cats)
+        alineados.append(df)
+    return alineados
+
+
+# ----- CLASIFICACIÓN DE MIGRACIÓN -----
+# Tabla canónica de departamentos (en minúsculas) con su código entero: primero los
+# valores sin ubicación, luego Lima y luego las demás regiones y ciudades del Perú.
+# Lo que no está en la tabla se considera internacional.
+SIN_ESPECIFICAR = ['nacional', 'no especificado', 'no especificada']
+REGIONES_PERU = ['lima', 'arequipa', 'cusco', 'puno', 'ayacucho', 'lambayeque',
+                 'tacna', 'huacho', 'tarapoto', 'huancayo', 'trujillo', 'pasco',
+                 'huaraz', 'iquitos', 'chimbote', 'sullana', 'piura', 'cajamarca',
+                 'ucayali', 'tumbes', 'huancavelica', 'junín', 'loreto', 'madre de dios']
+TABLA_DEPARTAMENTOS = pd.Index(SIN_ESPECIFICAR + REGIONES_PERU)
+CODIGO_LIMA = TABLA_DEPARTAMENTOS.get_loc('lima')
+
+
+def codigos_departamento(departamentos):
+    """
+    Código de TABLA_DEPARTAMENTOS de cada valor (-1 si no está); cada valor distinto se
+    normaliza una sola vez
+    """
+    codigos, unicos = pd.factorize(departamentos, use_na_sentinel=False)
+    codigo_por_unico = TABLA_DEPARTAMENTOS.get_indexer([str(d).lower() for d in unicos])
+    return codigo_por_unico[codigos]
+
+
+def clasificar_migracion(departamentos):
+    """Clasificación de migración de cada departamento, en una sola pasada"""
+    codigos = codigos_departamento(departamentos)
+    return np.select(
+        [
+            # Si es nacional o no especificado, se considera sin migración específica
+            (codigos >= 0) & (codigos < len(SIN_ESPECIFICAR)),
+            # Si no es una región del Perú, es internacional
+            codigos < 0,
+            codigos == CODIGO_LIMA,
+        ],
+        ['Nacional - Sin especificar', 'Internacional', 'Lima - Sin migración'],
+        # Para becas en provincias, asumimos migración desde Lima u otras regiones
+        'Posible migración',
+    )
 
 
 def generar_campo_migracion(df):
@@ -288,69 +330,26 @@ def generar_campo_migracion(df):
     print("Generando campo de migración...")
     
     if 'Departamento' in df.columns:
-        def clasificar_migracion(row):
-            dept = str(row['Departamento']).lower()
-            
-            # Si es nacional o no especificado, se considera sin migración específica
-            if dept in ['nacional', 'no especificado', 'no especificada']:
-                return 'Nacional - Sin especificar'
-            
-            # Si es internacional
-            if dept not in ['lima', 'arequipa', 'cusco', 'puno', 'ayacucho', 'lambayeque', 
-                           'tacna', 'huacho', 'tarapoto', 'huancayo', 'trujillo', 'pasco',
-                           'huaraz', 'iquitos', 'chimbote', 'sullana', 'piura', 'cajamarca',
-                           'ucayali', 'tumbes', 'huancavelica', 'junín', 'loreto', 'madre de dios']:
-                return 'Internacional'
-            
-            # Para becas en provincias, asumimos migración desde Lima u otras regiones
-            if dept != 'lima':
-                return 'Posible migración'
-            else:
-                return 'Lima - Sin migración'
-        
-        df['Migracion'] = df.apply(clasificar_migracion, axis=1)
+        # Categórica como las demás columnas de texto (en el Parquet, con diccionario)
+        df['Migracion'] = pd.Categorical(clasificar_migracion(df['Departamento']))
         print(f"  ✓ Campo de migración generado")
     
     return df
 
 
-def consolidar_datos():
+def consolidar_datos(exportar: Sequence[str] = EXPORTACIONES):
     """Consolida todos los datos extraídos en un único dataset"""
     print("\n" + "="*60)
     print("CONSOLIDACIÓN DE DATOS PARA DASHBOARD 2025")
     print("="*60 + "\n")
     
-    datasets = []
-    
-    # Extraer de cada fuente
-    df_beca18_expandido = extraer_datos_beca18_expandido()
-    if not df_beca18_expandido.empty:
-        datasets.append(df_beca18_expandido)
-    
-    df_beca18_inst = extraer_datos_instituciones_beca18()
-    if not df_beca18_inst.empty:
-        datasets.append(df_beca18_inst)
-    
-    df_beca_tec = extraer_datos_beca_tec()
-    if not df_beca_tec.empty:
-        datasets.append(df_beca_tec)
-    
-    df_beca_peru = extraer_datos_beca_peru()
-    if not df_beca_peru.empty:
-        datasets.append(df_beca_peru)
-    
-    df_internacionales = extraer_datos_becas_internacionales()
-    if not df_internacionales.empty:
-        datasets.append(df_internacionales)
-    
-    df_integrales = extraer_datos_becas_integrales()
-    if not df_integrales.empty:
-        datasets.append(df_integrales)
+    # Extraer de todas las fuentes a la vez
+    datasets = extraer_fuentes(FUENTES)
     
     # Consolidar todos los datasets
     if datasets:
         print("\nConsolidando datasets...")
-        df_consolidado = pd.concat(datasets, ignore_index=True, sort=False)
+        df_consolidado = pd.concat(alinear_categorias(datasets), ignore_index=True, sort=False)
         
         # Generar campo de migración
         df_consolidado = generar_campo_migracion(df_consolidado)
@@ -359,14 +358,7 @@ def consolidar_datos():
         df_consolidado = df_consolidado.sort_values(['NombreBeca', 'Departamento'])
         
         # Guardar archivo consolidado
-        archivo_salida = 'dashboard_becas_2025_consolidado.csv'
-        df_consolidado.to_csv(archivo_salida, index=False, encoding='utf-8-sig')
-        print(f"\n✓ Datos consolidados guardados en: {archivo_salida}")
-        
-        # Generar también versión JSON
-        archivo_json = 'dashboard_becas_2025_consolidado.json'
-        df_consolidado.to_json(archivo_json, orient='records', indent=2, force_ascii=False)
-        print(f"✓ Datos consolidados guardados en: {archivo_json}")
+        guardar_consolidado(df_consolidado, exportar)
         
         # Generar reporte de estadísticas
         generar_reporte_estadisticas(df_consolidado)
@@ -377,6 +369,72 @@ def consolidar_datos():
         return None
 
 
+def guardar_consolidado(df, exportar: Sequence[str] = EXPORTACIONES):
+    """
+    Guarda el dataset consolidado en Parquet y, además, en los formatos de `exportar`.
+    Las columnas de texto son categóricas, así que en el Parquet quedan con
+    codificación de diccionario. El Parquet se escribe al final para que sea el
+    archivo más reciente (ver archivo_consolidado).
+    """
+    if 'csv' in exportar:
+        df.to_csv(ARCHIVO_CONSOLIDADO_CSV, index=False, encoding='utf-8-sig')
+        print(f"\n✓ Datos consolidados guardados en: {ARCHIVO_CONSOLIDADO_CSV}")
+    
+    if 'json' in exportar:
+        df.to_json(ARCHIVO_CONSOLIDADO_JSON, orient='records', indent=2, force_ascii=False)
+        print(f"✓ Datos consolidados guardados en: {ARCHIVO_CONSOLIDADO_JSON}")
+    
+    try:
+        df.to_parquet(ARCHIVO_CONSOLIDADO, index=False)
+        print(f"✓ Datos consolidados guardados en: {ARCHIVO_CONSOLIDADO}")
+    except ImportError:
+        # Sin pyarrow, el CSV pasa a ser el archivo que leen los demás scripts
+        print("⚠ No se pudo escribir el Parquet: instala pyarrow (pip install pyarrow)")
+        if 'csv' not in exportar:
+            df.to_csv(ARCHIVO_CONSOLIDADO_CSV, index=False, encoding='utf-8-sig')
+            print(f"✓ Datos consolidados guardados en: {ARCHIVO_CONSOLIDADO_CSV}")
+
+
+def archivo_consolidado() -> Optional[str]:
+    """
+    Archivo del consolidado que se debe leer: el más reciente entre el Parquet y el
+    CSV, o None si no existe ninguno. Así un Parquet viejo no tapa un CSV regenerado
+    en una máquina sin pyarrow.
+    """
+    existentes = [archivo for archivo in (ARCHIVO_CONSOLIDADO, ARCHIVO_CONSOLIDADO_CSV)
+                  if os.path.exists(archivo)]
+    if not existentes:
+        return None
+    # max devuelve el primero en caso de empate, así que a igual fecha gana el Parquet
+    return max(existentes, key=os.path.getmtime)
+
+
+def cargar_consolidado(columnas: Optional[List[str]] = None, categoricas: bool = False) -> pd.DataFrame:
+    """
+    Lee el dataset consolidado, solo con `columnas` (todas si es None).
+    
+    Usa el más reciente entre el Parquet y el CSV, y el CSV si no se puede leer el
+    Parquet por falta de pyarrow. Salvo que se pida `categoricas`, las columnas de
+    texto se devuelven como texto normal, para que value_counts sobre un
+    subconjunto no liste categorías con 0 registros.
+    """
+    df = None
+    if archivo_consolidado() == ARCHIVO_CONSOLIDADO:
+        try:
+            df = pd.read_parquet(ARCHIVO_CONSOLIDADO, columns=columnas)
+        except ImportError:
+            if not os.path.exists(ARCHIVO_CONSOLIDADO_CSV):
+                raise
+            print(f"⚠ No se pudo leer el Parquet (falta pyarrow); se usa {ARCHIVO_CONSOLIDADO_CSV}")
+    if df is None:
+        df = pd.read_csv(ARCHIVO_CONSOLIDADO_CSV, usecols=columnas)
+    
+    if not categoricas:
+        for columna in df.select_dtypes('category').columns:
+            df[columna] = df[columna].astype(df[columna].cat.categories.dtype)
+    return df
+
+
 def generar_reporte_estadisticas(df):
     """Genera un reporte con estadísticas del dataset consolidado"""
     print("\n" + "="*60)
@@ -429,19 +487,19 @@ def generar_reporte_estadisticas(df):
 
 def main():
     """Función principal"""
+    parser = argparse.ArgumentParser(description="Extracción de datos para el dashboard de becas 2025")
+    parser.add_argument('--exportar', nargs='*', choices=EXPORTACIONES, default=list(EXPORTACIONES),
+                        help="Formatos que se exportan además del Parquet "
+                             "(por defecto, csv y json; sin valores, solo Parquet)")
+    args = parser.parse_args()
+    
     print("╔══════════════════════════════════════════════════════════╗")
     print("║  EXTRACCIÓN DE DATOS PARA DASHBOARD DE BECAS 2025       ║")
     print("╚══════════════════════════════════════════════════════════╝")
     print()
     
     # Verificar archivos disponibles
-    archivos_requeridos = [
-        'beca18_datos_expandido.csv',
-        'instituciones_beca_18.csv',
-        'instituciones_beca_tec.csv',
-        'instituciones_beca_peru.csv',
-        'becas_integrales_completo.csv'
-    ]
+    archivos_requeridos = [fuente.archivo for fuente in FUENTES]
     
     print("Verificando archivos disponibles...")
     archivos_faltantes = []
@@ -459,15 +517,17 @@ def main():
         print("\n✓ Todos los archivos requeridos están disponibles\n")
     
     # Consolidar datos
-    df_consolidado = consolidar_datos()
+    df_consolidado = consolidar_datos(args.exportar)
     
     if df_consolidado is not None:
         print("\n" + "="*60)
         print("✓ PROCESO COMPLETADO EXITOSAMENTE")
         print("="*60)
         print(f"\nArchivos generados:")
-        print("  • dashboard_becas_2025_consolidado.csv")
-        print("  • dashboard_becas_2025_consolidado.json")
+        print(f"  • {ARCHIVO_CONSOLIDADO}")
+        for formato, archivo in (('csv', ARCHIVO_CONSOLIDADO_CSV), ('json', ARCHIVO_CONSOLIDADO_JSON)):
+            if formato in args.exportar:
+                print(f"  • {archivo}")
         print("  • estadisticas_dashboard_2025.json")
         print("\nLos datos están listos para ser usados en el dashboard.")
     else:
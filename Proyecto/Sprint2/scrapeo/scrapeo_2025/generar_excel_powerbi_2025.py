@@ -4,16 +4,19 @@ para Power BI - Datos de Becas 2025
 """
 
 import pandas as pd
+import argparse
 import json
 from datetime import datetime
 import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, NamedTuple, Optional
 
-def crear_hoja_principal():
+from extraer_datos_dashboard_2025 import (ARCHIVO_CONSOLIDADO, ARCHIVO_CONSOLIDADO_CSV,
+                                          archivo_consolidado, cargar_consolidado)
+
+def crear_hoja_principal(ctx):
     """Crea la hoja principal con los campos del dataset solicitado"""
-    print("Generando Hoja Principal: Becas 2025...")
-    
-    # Cargar datos consolidados
-    df = pd.read_csv('dashboard_becas_2025_consolidado.csv')
+    df = ctx.consolidado
     
     # Seleccionar y renombrar campos según especificación
     df_principal = pd.DataFrame({
@@ -27,15 +30,12 @@ def crear_hoja_principal():
         'Becas_segun_migracion': df['Migracion']
     })
     
-    print(f"  ✓ {len(df_principal)} registros procesados")
     return df_principal
 
 
-def crear_hoja_instituciones_2025():
+def crear_hoja_instituciones_2025(ctx):
     """Crea hoja con información detallada de instituciones"""
-    print("\nGenerando Hoja: Instituciones 2025...")
-    
-    df = pd.read_csv('dashboard_becas_2025_consolidado.csv')
+    df = ctx.consolidado
     
     # Agrupar por institución
     instituciones = df.groupby('Institucion').agg({
@@ -52,15 +52,12 @@ def crear_hoja_instituciones_2025():
         tipo_inst = df.groupby('Institucion')['TipoInstitucion'].first().reset_index()
         instituciones = instituciones.merge(tipo_inst, on='Institucion', how='left')
     
-    print(f"  ✓ {len(instituciones)} instituciones únicas")
     return instituciones
 
 
-def crear_hoja_departamentos_2025():
+def crear_hoja_departamentos_2025(ctx):
     """Crea hoja con análisis por departamento"""
-    print("\nGenerando Hoja: Departamentos 2025...")
-    
-    df = pd.read_csv('dashboard_becas_2025_consolidado.csv')
+    df = ctx.consolidado
     
     departamentos = df.groupby('Departamento').agg({
         'NombreBeca': 'count',
@@ -75,15 +72,12 @@ def crear_hoja_departamentos_2025():
     total = departamentos['TotalBecas'].sum()
     departamentos['Porcentaje'] = (departamentos['TotalBecas'] / total * 100).round(2)
     
-    print(f"  ✓ {len(departamentos)} departamentos con cobertura")
     return departamentos
 
 
-def crear_hoja_modalidades_2025():
+def crear_hoja_modalidades_2025(ctx):
     """Crea hoja con análisis por modalidad"""
-    print("\nGenerando Hoja: Modalidades 2025...")
-    
-    df = pd.read_csv('dashboard_becas_2025_consolidado.csv')
+    df = ctx.consolidado
     
     modalidades = df.groupby('Modalidad').agg({
         'NombreBeca': 'count',
@@ -98,15 +92,12 @@ def crear_hoja_modalidades_2025():
     total = modalidades['TotalBecas'].sum()
     modalidades['Porcentaje'] = (modalidades['TotalBecas'] / total * 100).round(2)
     
-    print(f"  ✓ {len(modalidades)} modalidades diferentes")
     return modalidades
 
 
-def crear_hoja_estratos_2025():
+def crear_hoja_estratos_2025(ctx):
     """Crea hoja con análisis por estrato socioeconómico"""
-    print("\nGenerando Hoja: Estratos Socioeconómicos 2025...")
-    
-    df = pd.read_csv('dashboard_becas_2025_consolidado.csv')
+    df = ctx.consolidado
     
     estratos = df.groupby('Estrato_socioeconomico').agg({
         'NombreBeca': 'count',
@@ -121,15 +112,12 @@ def crear_hoja_estratos_2025():
     total = estratos['TotalBecas'].sum()
     estratos['Porcentaje'] = (estratos['TotalBecas'] / total * 100).round(2)
     
-    print(f"  ✓ {len(estratos)} estratos socioeconómicos identificados")
     return estratos
 
 
-def crear_hoja_migracion_2025():
+def crear_hoja_migracion_2025(ctx):
     """Crea hoja con análisis de migración"""
-    print("\nGenerando Hoja: Análisis Migración 2025...")
-    
-    df = pd.read_csv('dashboard_becas_2025_consolidado.csv')
+    df = ctx.consolidado
     
     migracion = df.groupby('Migracion').agg({
         'NombreBeca': 'count',
@@ -150,15 +138,12 @@ def crear_hoja_migracion_2025():
         else 'No especificado'
     )
     
-    print(f"  ✓ {len(migracion)} tipos de migración")
     return migracion
 
 
-def crear_hoja_becas_detalle_2025():
+def crear_hoja_becas_detalle_2025(ctx):
     """Crea hoja con detalle de cada programa de becas"""
-    print("\nGenerando Hoja: Detalle Programas Becas 2025...")
-    
-    df = pd.read_csv('dashboard_becas_2025_consolidado.csv')
+    df = ctx.consolidado
     
     becas = df.groupby('NombreBeca').agg({
         'Institucion': 'nunique',
@@ -175,15 +160,12 @@ def crear_hoja_becas_detalle_2025():
     total = becas['TotalRegistros'].sum()
     becas['Porcentaje'] = (becas['TotalRegistros'] / total * 100).round(2)
     
-    print(f"  ✓ {len(becas)} programas de becas")
     return becas
 
 
-def crear_hoja_carreras_2025():
+def crear_hoja_carreras_2025(ctx):
     """Crea hoja con análisis por carrera"""
-    print("\nGenerando Hoja: Carreras 2025...")
-    
-    df = pd.read_csv('dashboard_becas_2025_consolidado.csv')
+    df = ctx.consolidado
     
     # Filtrar carreras específicas (no genéricas)
     df_carreras = df[~df['Carrera'].str.contains('Todas las carreras|Según modalidad|Variable', case=False, na=False)]
@@ -197,8 +179,6 @@ def crear_hoja_carreras_2025():
         
         carreras.columns = ['Carrera', 'ProgramasBecas', 'Instituciones', 'TotalBecas']
         carreras = carreras.sort_values('TotalBecas', ascending=False)
-        
-        print(f"  ✓ {len(carreras)} carreras específicas")
     else:
         carreras = pd.DataFrame(columns=['Carrera', 'ProgramasBecas', 'Instituciones', 'TotalBecas'])
         print("  ⚠ No hay carreras específicas, usando todas las carreras")
@@ -215,59 +195,43 @@ def crear_hoja_carreras_2025():
     return carreras
 
 
-def crear_hoja_beca18_detalle_2025():
+def crear_hoja_beca18_detalle_2025(ctx):
     """Crea hoja específica para Beca 18 con todas sus modalidades"""
-    print("\nGenerando Hoja: Beca 18 Detalle 2025...")
+    df = ctx.beca18
+    df_2025 = df[df['convocatoria'] == 2025]
+    
+    # Análisis por modalidad
+    beca18_modalidad = df_2025.groupby('modalidad').agg({
+        'nombre_universidad': 'nunique',
+        'ubicacion': lambda x: x.dropna().nunique(),
+        'tipo_universidad': lambda x: ', '.join(x.unique())
+    }).reset_index()
     
-    try:
-        df = pd.read_csv('beca18_datos_expandido.csv')
-        df_2025 = df[df['convocatoria'] == 2025].copy()
-        
-        # Análisis por modalidad
-        beca18_modalidad = df_2025.groupby('modalidad').agg({
-            'nombre_universidad': 'nunique',
-            'ubicacion': lambda x: x.dropna().nunique(),
-            'tipo_universidad': lambda x: ', '.join(x.unique())
-        }).reset_index()
-        
-        beca18_modalidad.columns = ['Modalidad', 'UniversidadesUnicas', 'UbicacionesUnicas', 'TipoUniversidad']
-        beca18_modalidad['TotalRegistros'] = df_2025.groupby('modalidad').size().values
-        
-        print(f"  ✓ {len(beca18_modalidad)} modalidades de Beca 18")
-        return beca18_modalidad
-    except Exception as e:
-        print(f"  ⚠ Error al procesar Beca 18: {e}")
-        return pd.DataFrame()
+    beca18_modalidad.columns = ['Modalidad', 'UniversidadesUnicas', 'UbicacionesUnicas', 'TipoUniversidad']
+    beca18_modalidad['TotalRegistros'] = df_2025.groupby('modalidad').size().values
+    
+    return beca18_modalidad
 
 
-def crear_hoja_beca_tec_detalle_2025():
+def crear_hoja_beca_tec_detalle_2025(ctx):
     """Crea hoja específica para Beca Tec"""
-    print("\nGenerando Hoja: Beca Tec Detalle 2025...")
+    df = ctx.beca_tec
     
-    try:
-        df = pd.read_csv('instituciones_beca_tec.csv')
-        
-        beca_tec = df.groupby(['nombre_institucion', 'region']).agg({
-            'programa': lambda x: ', '.join(x.unique()[:3]) + ('...' if len(x.unique()) > 3 else ''),
-            'tipo_institucion': 'first',
-            'modalidad_programa': 'first'
-        }).reset_index()
-        
-        beca_tec.columns = ['Institucion', 'Region', 'ProgramasOfrecidos', 'TipoInstitucion', 'Modalidad']
-        beca_tec['TotalProgramas'] = df.groupby(['nombre_institucion', 'region']).size().values
-        
-        print(f"  ✓ {len(beca_tec)} instituciones de Beca Tec")
-        return beca_tec
-    except Exception as e:
-        print(f"  ⚠ Error al procesar Beca Tec: {e}")
-        return pd.DataFrame()
+    beca_tec = df.groupby(['nombre_institucion', 'region']).agg({
+        'programa': lambda x: ', '.join(x.unique()[:3]) + ('...' if len(x.unique()) > 3 else ''),
+        'tipo_institucion': 'first',
+        'modalidad_programa': 'first'
+    }).reset_index()
+    
+    beca_tec.columns = ['Institucion', 'Region', 'ProgramasOfrecidos', 'TipoInstitucion', 'Modalidad']
+    beca_tec['TotalProgramas'] = df.groupby(['nombre_institucion', 'region']).size().values
+    
+    return beca_tec
 
 
-def crear_hoja_resumen_ejecutivo_2025():
+def crear_hoja_resumen_ejecutivo_2025(ctx):
     """Crea hoja con resumen ejecutivo y KPIs"""
-    print("\nGenerando Hoja: Resumen Ejecutivo 2025...")
-    
-    df = pd.read_csv('dashboard_becas_2025_consolidado.csv')
+    df = ctx.consolidado
     
     # Crear resumen con KPIs
     resumen = pd.DataFrame({
@@ -307,15 +271,12 @@ def crear_hoja_resumen_ejecutivo_2025():
         ]
     })
     
-    print(f"  ✓ {len(resumen)} indicadores clave")
     return resumen
 
 
-def crear_hoja_matriz_beca_departamento_2025():
+def crear_hoja_matriz_beca_departamento_2025(ctx):
     """Crea matriz cruzada de Becas vs Departamentos"""
-    print("\nGenerando Hoja: Matriz Beca-Departamento 2025...")
-    
-    df = pd.read_csv('dashboard_becas_2025_consolidado.csv')
+    df = ctx.consolidado
     
     # Crear tabla pivote
     matriz = pd.crosstab(df['NombreBeca'], df['Departamento'])
@@ -327,11 +288,118 @@ def crear_hoja_matriz_beca_departamento_2025():
     # Agregar fila de totales
     matriz.loc['Total'] = matriz.sum()
     
-    print(f"  ✓ Matriz de {len(matriz)-1} becas × {len(matriz.columns)-1} departamentos")
     return matriz
 
 
-def generar_excel_completo():
+# ----- LIBRO -----
+# Cada hoja se calcula a partir de un contexto con las fuentes ya leídas; la tabla HOJAS
+# fija el orden del libro, la fuente que necesita cada hoja y el mensaje de resumen.
+
+class ContextoLibro(NamedTuple):
+    """
+    Fuentes del libro, leídas una sola vez y compartidas por todas las hojas (solo
+    lectura: las hojas derivan tablas nuevas y no modifican estos DataFrames)
+    """
+    consolidado: pd.DataFrame
+    beca18: Optional[pd.DataFrame]
+    beca_tec: Optional[pd.DataFrame]
+
+
+class Hoja(NamedTuple):
+    nombre: str
+    crear: Callable[[ContextoLibro], pd.DataFrame]
+    descripcion: str
+    resumen: Callable[[pd.DataFrame], str]
+    fuente: str = 'consolidado'
+    indice: bool = False
+
+
+HOJAS = [
+    Hoja('Becas 2025', crear_hoja_principal, 'Dataset principal',
+         lambda df: f"{len(df)} registros procesados"),
+    Hoja('Resumen 2025', crear_hoja_resumen_ejecutivo_2025, 'KPIs y resumen ejecutivo',
+         lambda df: f"{len(df)} indicadores clave"),
+    Hoja('Instituciones 2025', crear_hoja_instituciones_2025, 'Análisis de instituciones',
+         lambda df: f"{len(df)} instituciones únicas"),
+    Hoja('Departamentos 2025', crear_hoja_departamentos_2025, 'Análisis por departamento',
+         lambda df: f"{len(df)} departamentos con cobertura"),
+    Hoja('Modalidades 2025', crear_hoja_modalidades_2025, 'Análisis por modalidad',
+         lambda df: f"{len(df)} modalidades diferentes"),
+    Hoja('Estratos 2025', crear_hoja_estratos_2025, 'Análisis socioeconómico',
+         lambda df: f"{len(df)} estratos socioeconómicos identificados"),
+    Hoja('Migracion 2025', crear_hoja_migracion_2025, 'Análisis de migración',
+         lambda df: f"{len(df)} tipos de migración"),
+    Hoja('Programas Becas 2025', crear_hoja_becas_detalle_2025, 'Detalle por programa',
+         lambda df: f"{len(df)} programas de becas"),
+    Hoja('Carreras 2025', crear_hoja_carreras_2025, 'Análisis por carrera',
+         lambda df: f"{len(df)} carreras"),
+    Hoja('Beca18 Detalle 2025', crear_hoja_beca18_detalle_2025, 'Detalle específico Beca 18',
+         lambda df: f"{len(df)} modalidades de Beca 18", fuente='beca18'),
+    Hoja('BecaTec Detalle 2025', crear_hoja_beca_tec_detalle_2025, 'Detalle específico Beca Tec',
+         lambda df: f"{len(df)} instituciones de Beca Tec", fuente='beca_tec'),
+    Hoja('Matriz Beca-Depto 2025', crear_hoja_matriz_beca_departamento_2025, 'Tabla cruzada',
+         lambda df: f"Matriz de {len(df)-1} becas × {len(df.columns)-1} departamentos",
+         indice=True),
+]
+
+# Columnas que se leen de cada fuente
+COLUMNAS_CONSOLIDADO = ['NombreBeca', 'Institucion', 'AnioBecariosConfirmados', 'Departamento',
+                        'Carrera', 'Modalidad', 'Estrato_socioeconomico', 'Migracion',
+                        'TipoInstitucion']
+COLUMNAS_BECA18 = ['convocatoria', 'modalidad', 'nombre_universidad', 'ubicacion', 'tipo_universidad']
+COLUMNAS_BECA_TEC = ['nombre_institucion', 'region', 'programa', 'tipo_institucion', 'modalidad_programa']
+
+
+def leer_detalle(archivo, columnas):
+    """Lee un CSV de detalle; si no se puede, su hoja se omite"""
+    try:
+        return pd.read_csv(archivo, usecols=columnas)
+    except Exception as e:
+        print(f"  ⚠ No se pudo leer {archivo}: {e}")
+        return None
+
+
+def cargar_contexto():
+    """Lee cada fuente del libro una sola vez, solo con las columnas que usan las hojas"""
+    print("Cargando fuentes...")
+    ctx = ContextoLibro(
+        consolidado=cargar_consolidado(COLUMNAS_CONSOLIDADO),
+        beca18=leer_detalle('beca18_datos_expandido.csv', COLUMNAS_BECA18),
+        beca_tec=leer_detalle('instituciones_beca_tec.csv', COLUMNAS_BECA_TEC),
+    )
+    print(f"  ✓ {len(ctx.consolidado)} registros consolidados")
+    return ctx
+
+
+def crear_hojas(ctx, hilos=1):
+    """
+    Calcula las hojas de HOJAS (con `hilos` > 1, varias a la vez) y devuelve
+    (hoja, DataFrame) en el orden del libro. Las hojas de detalle cuya fuente falta o
+    que fallan se omiten, igual que las que quedan vacías.
+    """
+    with ThreadPoolExecutor(max_workers=hilos) as ejecutor:
+        futuros = {hoja.nombre: ejecutor.submit(hoja.crear, ctx) for hoja in HOJAS
+                   if getattr(ctx, hoja.fuente) is not None}
+    
+    calculadas = []
+    for hoja in HOJAS:
+        if hoja.nombre not in futuros:
+            print(f"  ⚠ {hoja.nombre}: sin datos de {hoja.fuente}, se omite")
+            continue
+        try:
+            df = futuros[hoja.nombre].result()
+        except Exception as e:
+            if hoja.fuente == 'consolidado':
+                raise
+            print(f"  ⚠ Error al procesar {hoja.nombre}: {e}")
+            continue
+        print(f"  ✓ {hoja.nombre}: {hoja.resumen(df)}")
+        if not df.empty:
+            calculadas.append((hoja, df))
+    return calculadas
+
+
+def generar_excel_completo(hilos=1):
     """Genera el archivo Excel con todas las hojas"""
     print("╔══════════════════════════════════════════════════════════════╗")
     print("║     GENERACIÓN DE EXCEL PARA POWER BI - BECAS 2025          ║")
@@ -340,76 +408,22 @@ def generar_excel_completo():
     
     archivo_salida = 'Dashboard_Becas_PowerBI_2025.xlsx'
     
+    ctx = cargar_contexto()
+    print("\nGenerando hojas...")
+    hojas = crear_hojas(ctx, hilos)
+    
     # Crear archivo Excel con múltiples hojas
     with pd.ExcelWriter(archivo_salida, engine='openpyxl') as writer:
-        
-        # 1. Hoja Principal
-        df_principal = crear_hoja_principal()
-        df_principal.to_excel(writer, sheet_name='Becas 2025', index=False)
-        
-        # 2. Resumen Ejecutivo
-        df_resumen = crear_hoja_resumen_ejecutivo_2025()
-        df_resumen.to_excel(writer, sheet_name='Resumen 2025', index=False)
-        
-        # 3. Instituciones
-        df_instituciones = crear_hoja_instituciones_2025()
-        df_instituciones.to_excel(writer, sheet_name='Instituciones 2025', index=False)
-        
-        # 4. Departamentos
-        df_departamentos = crear_hoja_departamentos_2025()
-        df_departamentos.to_excel(writer, sheet_name='Departamentos 2025', index=False)
-        
-        # 5. Modalidades
-        df_modalidades = crear_hoja_modalidades_2025()
-        df_modalidades.to_excel(writer, sheet_name='Modalidades 2025', index=False)
-        
-        # 6. Estratos Socioeconómicos
-        df_estratos = crear_hoja_estratos_2025()
-        df_estratos.to_excel(writer, sheet_name='Estratos 2025', index=False)
-        
-        # 7. Migración
-        df_migracion = crear_hoja_migracion_2025()
-        df_migracion.to_excel(writer, sheet_name='Migracion 2025', index=False)
-        
-        # 8. Detalle de Becas
-        df_becas = crear_hoja_becas_detalle_2025()
-        df_becas.to_excel(writer, sheet_name='Programas Becas 2025', index=False)
-        
-        # 9. Carreras
-        df_carreras = crear_hoja_carreras_2025()
-        df_carreras.to_excel(writer, sheet_name='Carreras 2025', index=False)
-        
-        # 10. Beca 18 Detalle
-        df_beca18 = crear_hoja_beca18_detalle_2025()
-        if not df_beca18.empty:
-            df_beca18.to_excel(writer, sheet_name='Beca18 Detalle 2025', index=False)
-        
-        # 11. Beca Tec Detalle
-        df_beca_tec = crear_hoja_beca_tec_detalle_2025()
-        if not df_beca_tec.empty:
-            df_beca_tec.to_excel(writer, sheet_name='BecaTec Detalle 2025', index=False)
-        
-        # 12. Matriz Beca-Departamento
-        df_matriz = crear_hoja_matriz_beca_departamento_2025()
-        df_matriz.to_excel(writer, sheet_name='Matriz Beca-Depto 2025')
+        for hoja, df in hojas:
+            df.to_excel(writer, sheet_name=hoja.nombre, index=hoja.indice)
     
     print("\n" + "="*70)
     print("✓ ARCHIVO EXCEL GENERADO EXITOSAMENTE")
     print("="*70)
     print(f"\nArchivo: {archivo_salida}")
     print("\nHojas creadas:")
-    print("  1. Becas 2025 - Dataset principal")
-    print("  2. Resumen 2025 - KPIs y resumen ejecutivo")
-    print("  3. Instituciones 2025 - Análisis de instituciones")
-    print("  4. Departamentos 2025 - Análisis por departamento")
-    print("  5. Modalidades 2025 - Análisis por modalidad")
-    print("  6. Estratos 2025 - Análisis socioeconómico")
-    print("  7. Migracion 2025 - Análisis de migración")
-    print("  8. Programas Becas 2025 - Detalle por programa")
-    print("  9. Carreras 2025 - Análisis por carrera")
-    print(" 10. Beca18 Detalle 2025 - Detalle específico Beca 18")
-    print(" 11. BecaTec Detalle 2025 - Detalle específico Beca Tec")
-    print(" 12. Matriz Beca-Depto 2025 - Tabla cruzada")
+    for numero, (hoja, _) in enumerate(hojas, start=1):
+        print(f"{numero:>3}. {hoja.nombre} - {hoja.descripcion}")
     
     print("\n¡Listo para importar en Power BI!")
     
@@ -419,12 +433,14 @@ def generar_excel_completo():
 def verificar_dependencias():
     """Verifica que existan los archivos necesarios"""
     archivos_requeridos = [
-        'dashboard_becas_2025_consolidado.csv',
         'beca18_datos_expandido.csv',
         'instituciones_beca_tec.csv'
     ]
     
     faltantes = []
+    # El consolidado vale en Parquet o en CSV (cargar_consolidado lee el que haya)
+    if archivo_consolidado() is None:
+        faltantes.append(f"{ARCHIVO_CONSOLIDADO} (o {ARCHIVO_CONSOLIDADO_CSV})")
     for archivo in archivos_requeridos:
         if not os.path.exists(archivo):
             faltantes.append(archivo)
@@ -440,13 +456,18 @@ def verificar_dependencias():
 
 def main():
     """Función principal"""
+    parser = argparse.ArgumentParser(description="Genera el Excel para Power BI de las becas 2025")
+    parser.add_argument('--hilos', type=int, default=1,
+                        help="Hojas que se calculan a la vez (por defecto, 1)")
+    args = parser.parse_args()
+    
     print("\n")
     
     # Verificar dependencias
     verificar_dependencias()
     
     # Generar Excel
-    archivo = generar_excel_completo()
+    archivo = generar_excel_completo(args.hilos)
     
     print("\n" + "="*70)
     print("PROCESO COMPLETADO")
@@ -11,7 +11,7 @@ TARGET_DIR = os.getenv(
     r"C:\Users\Angel\UNIVERSIDAD PRIVADA DE TACNA\SCRAPING - Documentos\Becas",
 )
 # Tipos de archivo a copiar (separados por ';')
-FILE_GLOBS = [g.strip() for g in os.getenv("SYNC_FILE_GLOBS", "*.csv;*.json").split(";") if g.strip()]
+FILE_GLOBS = [g.strip() for g in os.getenv("SYNC_FILE_GLOBS", "*.csv;*.json;*.parquet").split(";") if g.strip()]
 
 REPO_DIR = Path(__file__).resolve().parent
 TARGET_PATH = Path(TARGET_DIR)